@@ -1,30 +1,83 @@
 // client/src/components/BookingForm.js
 import React, { useState, useContext } from 'react';
 import { useParams } from 'react-router-dom';
-import { createBooking } from '../services/BookingService';
+import { holdSeats, confirmHold, releaseHold } from '../services/BookingService';
 import AuthContext from '../contexts/AuthContext';
 import { toast } from 'react-toastify';
 
-const BookingForm = ({ event, onBookingSuccess }) => {
+// Holds the seats first, then books them on confirmation. The hold lives in
+// the parent so the form stays up when holding takes the last seats.
+const BookingForm = ({ event, hold, onHoldChange, onBookingSuccess }) => {
   const { id: eventId } = useParams();
   const [seats, setSeats] = useState(1);
   const { token } = useContext(AuthContext);
 
-  const handleSubmit = async (e) => {
+  const handleHold = async (e) => {
     e.preventDefault();
     try {
-      const result = await createBooking(eventId, seats, token);
+      const result = await holdSeats(eventId, seats, token);
+      onHoldChange(result.hold);
+      onBookingSuccess(result.available_seats);
+    } catch (error) {
+      toast.error(error.response?.data?.error || 'Could not hold seats');
+    }
+  };
+
+  const handleConfirm = async () => {
+    try {
+      const result = await confirmHold(hold.id, token);
+      onHoldChange(null);
       toast.success('Booking successful!');
       onBookingSuccess(result.available_seats);
     } catch (error) {
+      if (error.response?.status === 410 || error.response?.status === 404) {
+        onHoldChange(null);
+      }
       toast.error(error.response?.data?.error || 'Booking failed');
     }
   };
 
+  const handleRelease = async () => {
+    try {
+      const result = await releaseHold(hold.id, token);
+      onBookingSuccess(result.available_seats);
+    } catch (error) {
+      // Already expired or released: nothing left to give back
+    }
+    onHoldChange(null);
+  };
+
+  if (hold) {
+    // expires_at is UTC without an offset
+    const expiresAt = new Date(`${hold.expires_at}Z`).toLocaleTimeString();
+    return (
+      <div className="bg-white p-4 rounded-lg shadow-md mt-4">
+        <h3 className="text-lg font-semibold mb-2">Confirm Your Booking</h3>
+        <p className="text-sm text-gray-600 mb-3">
+          {hold.seat_count} seat{hold.seat_count > 1 ? 's' : ''} held for you until {expiresAt}.
+        </p>
+        <div className="space-x-2">
+          <button
+            onClick={handleConfirm}
+            className="bg-blue-500 hover:bg-blue-600 text-white py-2 px-4 rounded"
+          >
+            Confirm Booking
+          </button>
+          <button
+            onClick={handleRelease}
+            className="bg-gray-500 hover:bg-gray-600 text-white py-2 px-4 rounded"
+          >
+            Release Seats
+          </button>
+        </div>
+      </div>
+    );
+  }
+
   return (
     <div className="bg-white p-4 rounded-lg shadow-md mt-4">
       <h3 className="text-lg font-semibold mb-2">Book Tickets</h3>
-      <form onSubmit={handleSubmit} className="space-y-3">
+      <form onSubmit={handleHold} className="space-y-3">
         <div>
           <label className="block mb-1">Number of Seats</label>
           <input
@@ -51,4 +104,4 @@ const BookingForm = ({ event, onBookingSuccess }) => {
   );
 };
 
-export default BookingForm;
\ No newline at end of file
+export default BookingForm;
@@ -0,0 +1,80 @@
+// client/src/components/WaitlistForm.js
+import React, { useState, useContext } from 'react';
+import { joinWaitlist, leaveWaitlist } from '../services/BookingService';
+import AuthContext from '../contexts/AuthContext';
+import { toast } from 'react-toastify';
+
+// Shown instead of BookingForm when an event is sold out. Waiting users are
+// booked automatically when seats come back; see "My bookings".
+const WaitlistForm = ({ event }) => {
+  const [seats, setSeats] = useState(1);
+  const [position, setPosition] = useState(null);
+  const { token } = useContext(AuthContext);
+
+  const handleJoin = async (e) => {
+    e.preventDefault();
+    try {
+      const result = await joinWaitlist(event.id, seats, token);
+      if (result.status === 'booked') {
+        toast.success('Seats were just freed: booking successful!');
+      } else {
+        setPosition(result.position);
+        toast.success(`You are number ${result.position} on the waitlist`);
+      }
+    } catch (error) {
+      toast.error(error.response?.data?.error || 'Could not join the waitlist');
+    }
+  };
+
+  const handleLeave = async () => {
+    try {
+      await leaveWaitlist(event.id, token);
+      setPosition(null);
+      toast.info('You left the waitlist');
+    } catch (error) {
+      toast.error(error.response?.data?.error || 'Could not leave the waitlist');
+    }
+  };
+
+  return (
+    <div className="bg-white p-4 rounded-lg shadow-md mt-4">
+      <h3 className="text-lg font-semibold mb-2">Sold Out</h3>
+      {position ? (
+        <div className="space-y-3">
+          <p className="text-sm text-gray-600">
+            You are number {position} on the waitlist. We will book your seats as soon as they are freed.
+          </p>
+          <button
+            onClick={handleLeave}
+            className="bg-gray-500 hover:bg-gray-600 text-white py-2 px-4 rounded"
+          >
+            Leave Waitlist
+          </button>
+        </div>
+      ) : (
+        <form onSubmit={handleJoin} className="space-y-3">
+          <div>
+            <label className="block mb-1">Number of Seats</label>
+            <input
+              type="number"
+              min="1"
+              max={event.max_seats}
+              value={seats}
+              onChange={(e) => setSeats(Math.max(parseInt(e.target.value) || 1, 1))}
+              className="w-full p-2 border rounded"
+              required
+            />
+          </div>
+          <button
+            type="submit"
+            className="bg-blue-500 hover:bg-blue-600 text-white py-2 px-4 rounded"
+          >
+            Join Waitlist
+          </button>
+        </form>
+      )}
+    </div>
+  );
+};
+
+export default WaitlistForm;
@@ -1,9 +1,10 @@
 // client/src/pages/EventDetails.js
 import React, { useState, useEffect, useContext } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { fetchEventById, deleteEvent } from '../services/EventService';
+import { fetchEventById, deleteEvent, subscribeToEventAvailability } from '../services/EventService';
 import AuthContext from '../contexts/AuthContext';
 import BookingForm from '../components/BookingForm';
+import WaitlistForm from '../components/WaitlistForm';
 import EventCard from '../components/EventCard';
 
 const EventDetails = () => {
@@ -11,6 +12,8 @@ const EventDetails = () => {
   const navigate = useNavigate();
   const [event, setEvent] = useState(null);
   const [loading, setLoading] = useState(true);
+  // Seats held by this user and not yet confirmed (see BookingForm)
+  const [hold, setHold] = useState(null);
   const { user, token } = useContext(AuthContext);
 
   useEffect(() => {
@@ -27,6 +30,17 @@ const EventDetails = () => {
     fetchEvent();
   }, [id]);
 
+  // Keep the seat count current while the page is open
+  useEffect(() => {
+    return subscribeToEventAvailability(id, ({ available_seats, max_seats }) => {
+      setEvent(prev => prev && {
+        ...prev,
+        available_seats,
+        max_seats
+      });
+    }, () => setEvent(null));
+  }, [id]);
+
   const handleBookingSuccess = (availableSeats) => {
     setEvent(prev => ({
       ...prev,
@@ -96,8 +110,16 @@ const EventDetails = () => {
         </div>
 
         {/* Booking Form */}
-        {user && !user.is_organizer && event.available_seats > 0 && (
-          <BookingForm event={event} onBookingSuccess={handleBookingSuccess} />
+        {user && !user.is_organizer && (event.available_seats > 0 || hold) && (
+          <BookingForm
+            event={event}
+            hold={hold}
+            onHoldChange={setHold}
+            onBookingSuccess={handleBookingSuccess}
+          />
+        )}
+        {user && !user.is_organizer && event.available_seats === 0 && !hold && (
+          <WaitlistForm event={event} />
         )}
       </div>
     </div>
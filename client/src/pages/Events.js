@@ -2,13 +2,15 @@
 import React, { useState, useEffect, useContext } from 'react';
 import { useNavigate } from 'react-router-dom';
 import AuthContext from '../contexts/AuthContext';
-import { fetchEvents } from '../services/EventService';
+import { fetchEventsPage } from '../services/EventService';
 import EventCard from '../components/EventCard';
 
 const Events = () => {
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { user } = useContext(AuthContext);
   const navigate = useNavigate();
 
@@ -16,8 +18,9 @@ const Events = () => {
   useEffect(() => {
     const getEvents = async () => {
       try {
-        const data = await fetchEvents();
-        setEvents(data);
+        const page = await fetchEventsPage();
+        setEvents(page.events);
+        setNextCursor(page.nextCursor);
       } catch (err) {
         setError('Failed to load events');
         console.error(err);
@@ -29,6 +32,21 @@ const Events = () => {
     getEvents();
   }, []);
 
+  // Load the next page of events
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchEventsPage({ after: nextCursor });
+      setEvents([...events, ...page.events]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError('Failed to load events');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   // Handler for when an event is deleted
   const handleEventDeleted = (deletedEventId) => {
     setEvents(events.filter(event => event.id !== deletedEventId));
@@ -87,6 +105,18 @@ const Events = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="text-center mt-8">
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className="bg-indigo-600 hover:bg-indigo-700 text-white py-2 px-6 rounded disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
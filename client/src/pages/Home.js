@@ -1,10 +1,20 @@
-import React, { useContext } from "react";
+import React, { useContext, useEffect, useState } from "react";
 import AuthContext from "../contexts/AuthContext";
 import { useNavigate } from "react-router-dom";
+import { fetchHome } from "../services/EventService";
 
 const Home = () => {
-  const { user, logout } = useContext(AuthContext);
+  const { user, token, logout } = useContext(AuthContext);
   const navigate = useNavigate();
+  const [summary, setSummary] = useState(null);
+
+  // Event and booking counts for the dashboard cards, in a single request
+  useEffect(() => {
+    if (!user) return;
+    fetchHome(token)
+      .then(setSummary)
+      .catch(error => console.error('Error fetching home data:', error));
+  }, [user, token]);
 
   //console.log("User object:", JSON.stringify(user, null, 2));
 
@@ -74,6 +84,12 @@ const Home = () => {
                 <p className="text-gray-600">
                   {user.is_organizer ? "Manage your hosted events" : "Find exciting events near you"}
                 </p>
+                {summary && summary.categories.length > 0 && (
+                  <p className="text-sm text-indigo-600 mt-2">
+                    {summary.categories.reduce((total, facet) => total + facet.count, 0)} upcoming in{" "}
+                    {summary.categories.slice(0, 3).map(facet => facet.category).join(", ")}
+                  </p>
+                )}
               </div>
 
               <div 
@@ -82,6 +98,11 @@ const Home = () => {
               >
                 <h3 className="text-xl font-semibold text-green-700 mb-2">My Bookings</h3>
                 <p className="text-gray-600">View your upcoming events</p>
+                {summary && summary.bookings && (
+                  <p className="text-sm text-green-600 mt-2">
+                    {summary.bookings.length} booking{summary.bookings.length === 1 ? "" : "s"}
+                  </p>
+                )}
               </div>
 
               {/* Only show Create Event card for organizers */}
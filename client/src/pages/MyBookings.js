@@ -9,6 +9,7 @@ const MyBookings = () => {
     const navigate = useNavigate();
     const [bookings, setBookings] = useState([]);
     const [loading, setLoading] = useState(true);
+    const [includePast, setIncludePast] = useState(false);
 
     useEffect(() => {
         if (!user) {
@@ -18,7 +19,7 @@ const MyBookings = () => {
 
         const fetchBookings = async () => {
             try {
-                const bookingsData = await fetchMyBookings(token);
+                const bookingsData = await fetchMyBookings(token, includePast);
                 setBookings(bookingsData);
             } catch (error) {
                 toast.error('Failed to load bookings');
@@ -27,7 +28,7 @@ const MyBookings = () => {
             }
         };
         fetchBookings();
-    }, [user, token, navigate]);
+    }, [user, token, navigate, includePast]);
 
     const handleCancel = async (bookingId) => {
         try {
@@ -43,7 +44,18 @@ const MyBookings = () => {
 
     return (
         <div className="max-w-4xl mx-auto p-4">
-            <h1 className="text-2xl font-bold mb-6">My Bookings</h1>
+            <div className="flex justify-between items-center mb-6">
+                <h1 className="text-2xl font-bold">My Bookings</h1>
+                <label className="text-sm text-gray-600">
+                    <input
+                        type="checkbox"
+                        className="mr-2"
+                        checked={includePast}
+                        onChange={(e) => setIncludePast(e.target.checked)}
+                    />
+                    Show past events
+                </label>
+            </div>
             {bookings.length === 0 ? (
                 <p>You have no bookings yet.</p>
             ) : (
@@ -61,12 +73,14 @@ const MyBookings = () => {
                                         Booked on: {new Date(booking.booking_date).toLocaleString()}
                                     </p>
                                 </div>
-                                <button
-                                    onClick={() => handleCancel(booking.id)}
-                                    className="bg-red-500 text-white px-3 py-1 rounded hover:bg-red-600"
-                                >
-                                    Cancel
-                                </button>
+                                {new Date(booking.event_date) > new Date() && (
+                                    <button
+                                        onClick={() => handleCancel(booking.id)}
+                                        className="bg-red-500 text-white px-3 py-1 rounded hover:bg-red-600"
+                                    >
+                                        Cancel
+                                    </button>
+                                )}
                             </div>
                         </div>
                     ))}
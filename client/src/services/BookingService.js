@@ -3,26 +3,40 @@ import axios from 'axios';
 
 const API_URL = 'http://localhost:5000/api';
 
-export const createBooking = async (eventId, seats, token) => {
-  try {
-    const response = await axios.post(`${API_URL}/bookings`, {
-      event_id: eventId,
-      seat_count: seats
-    }, {
-      headers: { 
-        Authorization: `Bearer ${token}`,
-        'Content-Type': 'application/json'
-      }
-    });
-    return response.data;
-  } catch (error) {
-    throw error;
-  }
+// Booking is two steps: holding takes the seats for HOLD_TTL_SECONDS (10
+// minutes by default), confirming turns the hold into a booking. Unconfirmed
+// holds expire and their seats go back on sale.
+export const holdSeats = async (eventId, seats, token) => {
+  const response = await axios.post(`${API_URL}/events/${eventId}/holds`, {
+    seat_count: seats
+  }, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+      'Content-Type': 'application/json'
+    }
+  });
+  return response.data;
 };
 
-export const fetchMyBookings = async (token) => {
+export const confirmHold = async (holdId, token) => {
+  const response = await axios.post(`${API_URL}/holds/${holdId}/confirm`, {}, {
+    headers: { Authorization: `Bearer ${token}` }
+  });
+  return response.data;
+};
+
+export const releaseHold = async (holdId, token) => {
+  const response = await axios.delete(`${API_URL}/holds/${holdId}`, {
+    headers: { Authorization: `Bearer ${token}` }
+  });
+  return response.data;
+};
+
+// includePast also returns the bookings of archived (past) events
+export const fetchMyBookings = async (token, includePast = false) => {
   try {
     const response = await axios.get(`${API_URL}/bookings/my`, {
+      params: includePast ? { include_past: true } : {},
       headers: { Authorization: `Bearer ${token}` }
     });
     return response.data;
@@ -56,4 +70,24 @@ export const cancelBooking = async (bookingId, token) => {
         throw { message: error.message };
       }
     }
-  };
\ No newline at end of file
+  };
+
+// Sold-out events: queue for seats instead of polling the event
+export const joinWaitlist = async (eventId, seats, token) => {
+  const response = await axios.post(`${API_URL}/events/${eventId}/waitlist`, {
+    seat_count: seats
+  }, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+      'Content-Type': 'application/json'
+    }
+  });
+  return response.data;
+};
+
+export const leaveWaitlist = async (eventId, token) => {
+  const response = await axios.delete(`${API_URL}/events/${eventId}/waitlist`, {
+    headers: { Authorization: `Bearer ${token}` }
+  });
+  return response.data;
+};
@@ -3,10 +3,33 @@ import axios from 'axios';
 
 const API_URL = 'http://localhost:5000/api';
 
-export const fetchEvents = async () => {
+// Returns one keyset page plus the cursor to pass as `after` for the next one
+export const fetchEventsPage = async (params = {}) => {
   try {
-    const response = await axios.get(`${API_URL}/events`);
-    return response.data;
+    const response = await axios.get(`${API_URL}/events`, { params });
+    return {
+      events: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null
+    };
+  } catch (error) {
+    throw error;
+  }
+};
+
+// Landing data in one request: the first page of upcoming events, category
+// counts and, with a token, the caller's bookings (null without one)
+export const fetchHome = async (token, params = {}) => {
+  try {
+    const response = await axios.get(`${API_URL}/home`, {
+      params,
+      headers: token ? { Authorization: `Bearer ${token}` } : {}
+    });
+    return {
+      events: response.data.events,
+      nextCursor: response.data.next_cursor,
+      categories: response.data.categories,
+      bookings: response.data.bookings
+    };
   } catch (error) {
     throw error;
   }
@@ -55,4 +78,18 @@ export const deleteEvent = async (id, token) => {
   } catch (error) {
     throw error;
   }
-};
\ No newline at end of file
+};
+
+// Live seat availability over Server-Sent Events; EventSource reconnects on
+// its own. Returns a function that closes the stream.
+export const subscribeToEventAvailability = (id, onUpdate, onDeleted) => {
+  const source = new EventSource(`${API_URL}/events/${id}/live`);
+  source.addEventListener('seats', (message) => {
+    onUpdate(JSON.parse(message.data));
+  });
+  source.addEventListener('deleted', () => {
+    source.close();
+    if (onDeleted) onDeleted();
+  });
+  return () => source.close();
+};
@@ -1,8 +1,11 @@
 from flask import Flask
 from dotenv import load_dotenv
 import os
-from extensions import db, migrate, jwt
+from extensions import db, migrate, jwt, catalog_cache, password_hasher, metrics, replica_router, hold_reaper, outbox_worker, rate_limiter, live_hub
+from sqlite_profile import sqlite_engine_options, profile_pragmas, install_sqlite_profile
+from ratelimit import parse_limits
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import logging
 
 load_dotenv()
@@ -15,27 +18,129 @@ def create_app():
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],  # Add OPTIONS
             "allow_headers": ["Content-Type", "Authorization"],
         "supports_credentials": True,
-        "expose_headers": ["Authorization"]
+        "expose_headers": ["Authorization", "X-Next-Cursor"]
         }
 
     })
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URI")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # SQLite tuning: DB_PROFILE=production enables WAL and the pragmas in sqlite_profile.py
+    app.config["DB_PROFILE"] = os.getenv("DB_PROFILE", "default")
+    for key in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "SQLITE_BUSY_TIMEOUT", "SQLITE_MMAP_SIZE", "SQLITE_CACHE_SIZE"):
+        if os.getenv(key):
+            app.config[key] = int(os.getenv(key))
+    # Read replicas for read-only views, e.g. "sqlite:///replica1.db,sqlite:///replica2.db"
+    if os.getenv("DATABASE_REPLICA_URIS"):
+        app.config["SQLALCHEMY_BINDS"] = replica_router.replica_binds(os.getenv("DATABASE_REPLICA_URIS"))
+    app.config["READ_YOUR_WRITES_SECONDS"] = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    engine_options = sqlite_engine_options(app.config)
+    if engine_options:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
     app.config["JWT_SECRET_KEY"] = os.getenv("SECRET_KEY")
+    app.config["CATALOG_CACHE_SIZE"] = int(os.getenv("CATALOG_CACHE_SIZE", 1024))
+    app.config["CATALOG_CACHE_TTL"] = float(os.getenv("CATALOG_CACHE_TTL", 30))
+    # Password hashing pool; HASH_POOL_SIZE=0 hashes inline on the request thread
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    if os.getenv("HASH_POOL_SIZE"):
+        app.config["HASH_POOL_SIZE"] = int(os.getenv("HASH_POOL_SIZE"))
+    if os.getenv("HASH_QUEUE_LIMIT"):
+        app.config["HASH_QUEUE_LIMIT"] = int(os.getenv("HASH_QUEUE_LIMIT"))
+    # Seat holds: lifetime of a hold and how often expired ones are swept (0 = never)
+    app.config["HOLD_TTL_SECONDS"] = int(os.getenv("HOLD_TTL_SECONDS", 600))
+    app.config["HOLD_REAPER_INTERVAL"] = float(os.getenv("HOLD_REAPER_INTERVAL", 30))
+    # Sharded events (`flask seats shard`): how stale their cached availability may get
+    app.config["SEAT_SHARD_SYNC_INTERVAL"] = float(os.getenv("SEAT_SHARD_SYNC_INTERVAL", 1.0))
+    # Outbox delivery: worker threads per web process (0 = run `flask outbox work`
+    # separately) and where notifications are POSTed (logged when unset)
+    app.config["OUTBOX_WORKER_THREADS"] = int(os.getenv("OUTBOX_WORKER_THREADS", 1))
+    app.config["OUTBOX_MAX_ATTEMPTS"] = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+    app.config["OUTBOX_WEBHOOK_URL"] = os.getenv("OUTBOX_WEBHOOK_URL")
+    # Token-bucket rate limits, e.g. RATE_LIMITS="auth.login=5/minute,bookings=20/second burst 40"
+    # (endpoint or blueprint name; "off" lifts a route's default). Buckets live in
+    # process memory unless RATELIMIT_STORAGE_URI points at Redis.
+    app.config["RATELIMIT_ENABLED"] = os.getenv("RATELIMIT_ENABLED", "1") != "0"
+    app.config["RATE_LIMITS"] = parse_limits(os.getenv("RATE_LIMITS"))
+    app.config["RATELIMIT_STORAGE_URI"] = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    # Reverse proxies in front of the app. Each one appends to X-Forwarded-For;
+    # with N trusted hops the Nth address from the right becomes REMOTE_ADDR
+    # (the rate limit key). 0 ignores forwarding headers, which clients could forge.
+    app.config["PROXY_FIX_HOPS"] = int(os.getenv("PROXY_FIX_HOPS", 0))
+    if app.config["PROXY_FIX_HOPS"]:
+        hops = app.config["PROXY_FIX_HOPS"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    # Live availability streams (GET /api/events/<id>/live): updates are batched over
+    # LIVE_COALESCE_SECONDS; each connection buffers at most LIVE_BUFFER_MESSAGES
+    app.config["LIVE_COALESCE_SECONDS"] = float(os.getenv("LIVE_COALESCE_SECONDS", 0.25))
+    app.config["LIVE_HEARTBEAT_SECONDS"] = float(os.getenv("LIVE_HEARTBEAT_SECONDS", 15))
+    app.config["LIVE_MAX_SUBSCRIBERS"] = int(os.getenv("LIVE_MAX_SUBSCRIBERS", 10000))
+    app.config["LIVE_BUFFER_MESSAGES"] = int(os.getenv("LIVE_BUFFER_MESSAGES", 8))
+    # Streams not drained for LIVE_IDLE_TIMEOUT are evicted; all streams end after
+    # LIVE_MAX_CONNECTION_SECONDS and reconnect. Watched events are re-read every
+    # LIVE_POLL_INTERVAL to pick up writes from other processes (0 = never).
+    app.config["LIVE_IDLE_TIMEOUT"] = float(os.getenv("LIVE_IDLE_TIMEOUT", 60))
+    app.config["LIVE_MAX_CONNECTION_SECONDS"] = float(os.getenv("LIVE_MAX_CONNECTION_SECONDS", 600))
+    app.config["LIVE_POLL_INTERVAL"] = float(os.getenv("LIVE_POLL_INTERVAL", 2))
+    # Prometheus /metrics: off unless METRICS_ENABLED=1; with METRICS_TOKEN set,
+    # scrapes must send "Authorization: Bearer <token>"
+    app.config["METRICS_ENABLED"] = os.getenv("METRICS_ENABLED", "0") == "1"
+    app.config["METRICS_TOKEN"] = os.getenv("METRICS_TOKEN")
+    # Requests slower than this are logged with the SQL they issued
+    app.config["SLOW_REQUEST_MS"] = float(os.getenv("SLOW_REQUEST_MS", 1000))
+    # Per-request SQL statement limit, enforced only when set (CI / test runs)
+    if os.getenv("QUERY_BUDGET"):
+        app.config["QUERY_BUDGET"] = int(os.getenv("QUERY_BUDGET"))
 
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_sqlite_profile(engine, profile_pragmas(app.config))
     migrate.init_app(app, db)
     jwt.init_app(app)
+    catalog_cache.init_app(app)
+    password_hasher.init_app(app)
+    metrics.init_app(app)
+    replica_router.init_app(app)
+    hold_reaper.init_app(app)
+    outbox_worker.init_app(app)
+    rate_limiter.init_app(app)
+    live_hub.init_app(app)
+    metrics.register_collector(catalog_cache.collect)
+    metrics.register_collector(replica_router.collect)
+    metrics.register_collector(hold_reaper.collect)
+    metrics.register_collector(outbox_worker.collect)
+    metrics.register_collector(rate_limiter.collect)
+    metrics.register_collector(live_hub.collect)
 
     # Import and register blueprints within app context
     with app.app_context():
         from routes.auth import auth_bp
         from routes.events import event_bp
         from routes.bookings import booking_bp
+        from routes.organizers import organizer_bp
+        from routes.holds import hold_bp
+        from routes.home import home_bp
         app.register_blueprint(auth_bp, url_prefix="/api/auth")
         app.register_blueprint(event_bp, url_prefix="/api/events")
         app.register_blueprint(booking_bp, url_prefix="/api/bookings")
+        app.register_blueprint(organizer_bp, url_prefix="/api/organizers")
+        app.register_blueprint(hold_bp, url_prefix="/api/holds")
+        app.register_blueprint(home_bp, url_prefix="/api/home")
+
+        from search import search_cli
+        from stats import stats_cli
+        from routing import replicas_cli
+        from holds import holds_cli
+        from outbox import outbox_cli
+        from reservations import seats_cli
+        from archive import archive_cli
+        app.cli.add_command(search_cli)
+        app.cli.add_command(stats_cli)
+        app.cli.add_command(replicas_cli)
+        app.cli.add_command(holds_cli)
+        app.cli.add_command(outbox_cli)
+        app.cli.add_command(seats_cli)
+        app.cli.add_command(archive_cli)
     return app
 
 app = create_app()
@@ -0,0 +1,107 @@
+# server/archive.py
+from datetime import datetime, timedelta
+import time
+import click
+from flask.cli import AppGroup
+from sqlalchemy import delete, func, insert, literal, select
+from extensions import db, catalog_cache, live_hub
+from models import (
+    ArchivedBooking, ArchivedEvent, Booking, Event, EventDailyStats, EventStats, SeatHold, WaitlistEntry
+)
+from reservations import clear_event_shards, run_with_retry
+from catalog import bump_catalog_version
+
+ARCHIVE_BATCH_SIZE = 1000
+
+ARCHIVED_EVENT_FIELDS = (
+    "id", "title", "description", "date", "location", "max_seats", "available_seats",
+    "organizer_id", "created_at", "category", "image", "price", "version", "updated_at",
+)
+ARCHIVED_BOOKING_FIELDS = ("id", "user_id", "event_id", "seat_count", "booking_date")
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    # Moves up to batch_size events dated before cutoff, oldest first, and
+    # their bookings into the archive tables in one transaction; holds,
+    # waitlist entries, seat shards and per-event rollups of those events
+    # are dropped. Organizer totals are left alone, they cover history.
+    # Returns (event ids moved, bookings moved).
+    def move():
+        rows = db.session.execute(
+            select(Event.id, Event.seat_shards)
+            .where(Event.date < cutoff)
+            .order_by(Event.date, Event.id)
+            .limit(batch_size)
+        ).all()
+        event_ids = [event_id for event_id, _ in rows]
+        if not event_ids:
+            return [], 0
+
+        archived_at = literal(datetime.utcnow(), db.DateTime)
+        db.session.execute(insert(ArchivedEvent).from_select(
+            ARCHIVED_EVENT_FIELDS + ("archived_at",),
+            select(*(getattr(Event, field) for field in ARCHIVED_EVENT_FIELDS), archived_at)
+            .where(Event.id.in_(event_ids))
+        ))
+        bookings = db.session.execute(insert(ArchivedBooking).from_select(
+            ARCHIVED_BOOKING_FIELDS,
+            select(*(getattr(Booking, field) for field in ARCHIVED_BOOKING_FIELDS)).where(Booking.event_id.in_(event_ids))
+        )).rowcount
+
+        for event_id, seat_shards in rows:
+            if seat_shards:
+                clear_event_shards(event_id)
+        for model in (Booking, SeatHold, WaitlistEntry, EventDailyStats, EventStats):
+            db.session.execute(
+                delete(model).where(model.event_id.in_(event_ids)).execution_options(synchronize_session=False)
+            )
+        db.session.execute(delete(Event).where(Event.id.in_(event_ids)).execution_options(synchronize_session=False))
+        bump_catalog_version()
+        return event_ids, bookings
+
+    event_ids, bookings = run_with_retry(move, immediate=True)
+    if event_ids:
+        catalog_cache.invalidate_events(event_ids)
+        for event_id in event_ids:
+            live_hub.publish(event_id)
+    return event_ids, bookings
+
+def archive_past_events(cutoff, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None, pause=0.0):
+    # Batches until nothing is left before cutoff; a pause between batches
+    # leaves the write lock to live traffic. Returns (events, bookings) moved.
+    events = bookings = batches = 0
+    while max_batches is None or batches < max_batches:
+        event_ids, moved = archive_batch(cutoff, batch_size)
+        events += len(event_ids)
+        bookings += moved
+        batches += 1
+        if len(event_ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return events, bookings
+
+def archive_counts():
+    # {table: rows} for the hot and archive tables
+    return {
+        model.__tablename__: db.session.scalar(select(func.count()).select_from(model))
+        for model in (Event, Booking, ArchivedEvent, ArchivedBooking)
+    }
+
+archive_cli = AppGroup("archive", help="Past event archival commands.")
+
+@archive_cli.command("run")
+@click.option("--older-than-days", default=1.0, show_default=True, help="Archive events dated this long ago.")
+@click.option("--batch-size", default=ARCHIVE_BATCH_SIZE, show_default=True, help="Events per transaction.")
+@click.option("--max-batches", default=None, type=int, help="Stop after this many batches.")
+@click.option("--pause", default=0.0, show_default=True, help="Seconds to sleep between batches.")
+def run_archive_command(older_than_days, batch_size, max_batches, pause):
+    """Move past events and their bookings into the archive tables."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    started = time.perf_counter()
+    events, bookings = archive_past_events(cutoff, batch_size, max_batches, pause)
+    click.echo(f"Archived {events} events and {bookings} bookings in {time.perf_counter() - started:.1f}s")
+
+@archive_cli.command("stats")
+def archive_stats_command():
+    """Show row counts of the hot and archive tables."""
+    click.echo(" ".join(f"{table}={count}" for table, count in archive_counts().items()))
@@ -0,0 +1,166 @@
+# server/asgi.py
+# Production serving mode:
+#   uvicorn asgi:app --workers 4        (or: python asgi.py, WEB_CONCURRENCY workers)
+# Every request is served by the Flask app itself, so auth, rate limits,
+# metrics, replica routing, CORS and error shapes are those of the
+# blueprints. Only live availability streams run natively on asyncio: an
+# open stream costs a coroutine rather than a worker thread.
+import asyncio
+import os
+import re
+import threading
+import time
+from werkzeug.wrappers import Response
+from sqlalchemy import select
+
+try:
+    from asgiref.sync import sync_to_async
+    from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+except ImportError:
+    raise RuntimeError("ASGI mode needs: pip install asgiref uvicorn")
+
+from app import app as flask_app
+from extensions import db, live_hub
+from live import LiveHubFull, encode_message
+from models import Event
+
+# Same policy as the Flask-CORS setup in app.py
+CORS_ORIGIN = "http://localhost:3000"
+
+class _ThreadedWsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs every WSGI call on one shared thread (thread_sensitive);
+    # Flask is thread-safe, so let calls use the loop's thread pool instead
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__["run_wsgi_app"].func, thread_sensitive=False)
+
+class _ThreadedWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await _ThreadedWsgiInstance(self.wsgi_application)(scope, receive, send)
+
+wsgi_app = _ThreadedWsgiToAsgi(flask_app)
+
+def _raw_headers(headers):
+    return [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()]
+
+def _origin(scope):
+    for key, value in scope["headers"]:
+        if key == b"origin":
+            return value.decode("latin-1")
+    return None
+
+async def _send_json(send, body, status, headers=None):
+    response = Response(flask_app.json.dumps(body), status=status, mimetype="application/json", headers=headers)
+    await send({"type": "http.response.start", "status": status, "headers": _raw_headers(response.headers)})
+    await send({"type": "http.response.body", "body": response.get_data()})
+
+class _LoopWaker:
+    # Wakes subscribers' asyncio.Events from the live hub's thread with one
+    # call_soon_threadsafe per fan-out instead of one per subscriber
+    def __init__(self, loop):
+        self.loop = loop
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def waker(self, ready):
+        def wake():
+            with self._lock:
+                self._pending.append(ready)
+                first = len(self._pending) == 1
+            if first:
+                self.loop.call_soon_threadsafe(self._run)
+        return wake
+
+    def _run(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for ready in pending:
+            ready.set()
+
+_loop_wakers = {}
+
+def _live_row(event_id):
+    # The stream's opening message, read like the Flask view reads it
+    with flask_app.app_context():
+        return db.session.execute(
+            select(Event.version, Event.available_seats, Event.max_seats).where(Event.id == event_id)
+        ).one_or_none()
+
+async def _wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+async def stream_live(scope, receive, send, event_id):
+    # GET /api/events/<id>/live on the event loop. Same hub and messages as
+    # the Flask view in routes/events.py.
+    row = await sync_to_async(_live_row, thread_sensitive=False)(event_id)
+    if row is None:
+        await _send_json(send, {"error": "Not found"}, 404)
+        return
+    loop = asyncio.get_running_loop()
+    waker = _loop_wakers.get(loop) or _loop_wakers.setdefault(loop, _LoopWaker(loop))
+    ready = asyncio.Event()
+    try:
+        subscription = live_hub.subscribe(event_id, row.version, waker.waker(ready))
+    except LiveHubFull:
+        await _send_json(send, {"error": "Too many live connections, please retry later"}, 503,
+                         headers={"Retry-After": "30"})
+        return
+
+    response = Response(status=200, mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    if _origin(scope) == CORS_ORIGIN:
+        response.headers["Access-Control-Allow-Origin"] = CORS_ORIGIN
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        response.headers["Vary"] = "Origin"
+    disconnected = asyncio.ensure_future(_wait_disconnect(receive))
+    try:
+        await send({"type": "http.response.start", "status": 200, "headers": _raw_headers(response.headers)})
+        first_message = encode_message(event_id, row.version, row.available_seats, row.max_seats)
+        await send({"type": "http.response.body", "body": b"retry: 3000\n\n" + first_message, "more_body": True})
+        while not subscription.closed:
+            woken = asyncio.ensure_future(ready.wait())
+            await asyncio.wait({woken, disconnected}, timeout=live_hub.heartbeat_seconds,
+                               return_when=asyncio.FIRST_COMPLETED)
+            woken.cancel()
+            if disconnected.done():
+                return
+            ready.clear()
+            messages = subscription.drain()
+            if live_hub.expired(subscription, time.monotonic()):
+                break
+            body = b"".join(messages) if messages else b": keepalive\n\n"
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        disconnected.cancel()
+        live_hub.unsubscribe(subscription)
+
+LIVE_ROUTE = re.compile(r"^/api/events/(?P<event_id>\d+)/live$")
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] == "http" and scope["method"] == "GET":
+        match = LIVE_ROUTE.match(scope["path"])
+        if match:
+            await stream_live(scope, receive, send, int(match.group("event_id")))
+            return
+
+    await wsgi_app(scope, receive, send)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "asgi:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", 8000)),
+        workers=int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2)),
+        log_level="warning",
+    )
@@ -0,0 +1,7 @@
+# server/authz.py
+from tokens import current_identity
+
+def current_user_is_organizer():
+    # is_organizer is signed into the access token at login/registration, so
+    # the claim is trusted as-is; only tokens without it load the user row
+    return bool(getattr(current_identity(), "is_organizer", False))
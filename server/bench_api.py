@@ -0,0 +1,257 @@
+# server/bench_api.py
+# API benchmark over a synthetic data set (see seed_events.py), through the
+# Flask test client (the whole app in-process, no sockets) and through the
+# threaded HTTP server:
+#   python bench_api.py --users 20000 --events 5000 --bookings 100000
+#   python bench_api.py --database /data/seeded.db --scenarios browse,book --seconds 30
+# Scenarios: browse (lists and details, weighted to hot events), book (hot
+# events, so seat contention is part of it), cancel (seeded bookings of
+# future events) and login (seeded users). Prints one JSON object per driver
+# and scenario with requests/sec and latency percentiles.
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from itertools import accumulate
+from bench_serving import WSGI_SERVER, free_port, http_load, summarize, wait_for
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS = ("browse", "book", "cancel", "login")
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def client_load(app, next_request, concurrency, seconds):
+    # Same contract as http_load, through one test client per thread
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        rng = random.Random()
+        client = app.test_client()
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            method, path, body, headers = next_request(rng)
+            started = time.perf_counter()
+            try:
+                response = client.open(path, method=method, data=body, headers=headers or {})
+                response.close()
+                if response.status_code >= 500:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - started)
+            except Exception:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors[0], seconds)
+
+def token_headers(users):
+    # user rows (id, email, name, is_organizer) -> {id: request headers},
+    # with the claims login would issue
+    from flask_jwt_extended import create_access_token
+    return {
+        user_id: dict(JSON_HEADERS, Authorization="Bearer " + create_access_token(
+            identity=str(user_id), additional_claims={"email": email, "name": name, "is_organizer": is_organizer}))
+        for user_id, email, name, is_organizer in users
+    }
+
+class Scenarios:
+    # Request generators built from the data in the database. Called inside
+    # an app context; the generators themselves only touch plain lists.
+    def __init__(self, skew, hot_events, token_users, cancel_pool):
+        self.skew = skew
+        self.hot_events = hot_events
+        self.token_users = token_users
+        self.cancel_pool = cancel_pool
+
+    def _hot_events(self):
+        # Upcoming events, most booked first, with Zipf weights by rank
+        from sqlalchemy import select
+        from extensions import db
+        from models import Event, EventStats
+        event_ids = db.session.scalars(
+            select(Event.id).outerjoin(EventStats, EventStats.event_id == Event.id)
+            .where(Event.date > datetime.utcnow())
+            .order_by(EventStats.bookings_count.desc().nulls_last(), Event.id)
+            .limit(self.hot_events)
+        ).all()
+        if not event_ids:
+            raise SystemExit("no upcoming events to benchmark, seed some first")
+        weights = list(accumulate(1.0 / rank ** self.skew for rank in range(1, len(event_ids) + 1)))
+        return event_ids, weights
+
+    def browse(self):
+        from sqlalchemy import select
+        from extensions import db
+        from models import Event
+        event_ids, weights = self._hot_events()
+        categories = db.session.scalars(select(Event.category).distinct()).all()
+
+        def next_request(rng):
+            roll = rng.random()
+            if roll < 0.5:
+                return "GET", f"/api/events/{rng.choices(event_ids, cum_weights=weights)[0]}", None, None
+            if roll < 0.8:
+                return "GET", f"/api/events?limit=50&category={rng.choice(categories)}", None, None
+            return "GET", "/api/events?limit=50", None, None
+        return next_request
+
+    def book(self):
+        from sqlalchemy import select
+        from extensions import db
+        from models import User
+        event_ids, weights = self._hot_events()
+        users = db.session.execute(
+            select(User.id, User.email, User.name, User.is_organizer).order_by(User.id.desc()).limit(self.token_users)
+        ).all()
+        headers = list(token_headers(users).values())
+
+        def next_request(rng):
+            body = json.dumps({"event_id": rng.choices(event_ids, cum_weights=weights)[0], "seat_count": 1})
+            return "POST", "/api/bookings", body, rng.choice(headers)
+        return next_request
+
+    def cancel(self):
+        # Each booking is cancelled once; once the pool runs dry the
+        # requests are 404s, so size --cancel-pool to the run
+        from sqlalchemy import func, select
+        from extensions import db
+        from models import Booking, Event, User
+        rows = db.session.execute(
+            select(Booking.id, User.id, User.email, User.name, User.is_organizer)
+            .join(Event, Event.id == Booking.event_id).join(User, User.id == Booking.user_id)
+            .where(Event.date > datetime.utcnow())
+            .order_by(func.random()).limit(self.cancel_pool)
+        ).all()
+        headers = token_headers({tuple(row[1:]) for row in rows})
+        pool = iter([(row.id, headers[row[1]]) for row in rows])
+        lock = threading.Lock()
+
+        def next_request(rng):
+            with lock:
+                booking_id, auth = next(pool, (0, next(iter(headers.values()), JSON_HEADERS)))
+            return "DELETE", f"/api/bookings/{booking_id}", None, auth
+        return next_request
+
+    def login(self, password):
+        from sqlalchemy import select
+        from extensions import db
+        from models import User
+        emails = db.session.scalars(
+            select(User.email).where(User.email.like("%@seed.test")).order_by(User.id.desc()).limit(self.token_users)
+        ).all()
+        if not emails:
+            raise SystemExit("no seeded users to log in as, seed with seed_events.py --users")
+
+        def next_request(rng):
+            return "POST", "/api/auth/login", json.dumps({"email": rng.choice(emails), "password": password}), JSON_HEADERS
+        return next_request
+
+def dataset_counts():
+    from sqlalchemy import func, select
+    from extensions import db
+    from models import Booking, Event, User
+    return {name: db.session.scalar(select(func.count()).select_from(model))
+            for name, model in (("users", User), ("events", Event), ("bookings", Booking))}
+
+def main():
+    parser = argparse.ArgumentParser(description="API benchmark: browse, book, cancel and login")
+    parser.add_argument("--database", help="Seeded SQLite file to use as is (default: seed a temporary one)")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--drivers", default="client,http")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds of browse traffic before each driver")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for picking hot events")
+    parser.add_argument("--hot-events", type=int, default=1000)
+    parser.add_argument("--token-users", type=int, default=1000, help="Distinct users booking and logging in")
+    parser.add_argument("--cancel-pool", type=int, default=50000)
+    parser.add_argument("--label", default="", help="Copied into every result, to tell runs apart")
+    args = parser.parse_args()
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.database:
+        db_path = os.path.abspath(args.database)
+    else:
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+    env = dict(
+        os.environ, DATABASE_URI=f"sqlite:///{db_path}", RATELIMIT_ENABLED="0",
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    os.environ.update(env)
+    from app import app
+    from extensions import db
+    from seed_events import SYNTHETIC_PASSWORD, seed_synthetic
+
+    try:
+        with app.app_context():
+            if not args.database:
+                db.create_all()
+                seed_synthetic(args.users, args.events, args.bookings, random_seed=args.random_seed)
+            dataset = dataset_counts()
+        plan = Scenarios(args.skew, args.hot_events, args.token_users, args.cancel_pool)
+
+        def build(name):
+            with app.app_context():
+                if name == "login":
+                    return plan.login(SYNTHETIC_PASSWORD)
+                return getattr(plan, name)()
+
+        for driver in args.drivers.split(","):
+            server = None
+            if driver == "http":
+                port = free_port()
+                server = subprocess.Popen(
+                    [sys.executable, "-c", WSGI_SERVER.format(port=port)], cwd=HERE,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+                )
+                wait_for(port)
+                load = lambda next_request, seconds: http_load("127.0.0.1", port, next_request, args.concurrency, seconds)
+            elif driver == "client":
+                load = lambda next_request, seconds: client_load(app, next_request, args.concurrency, seconds)
+            else:
+                parser.error(f"unknown driver {driver}")
+            try:
+                if args.warmup:
+                    load(build("browse"), args.warmup)
+                for name in scenarios:
+                    # Built per run: cancel needs bookings the last run left
+                    result = load(build(name), args.seconds)
+                    print(json.dumps({
+                        "label": args.label, "driver": driver, "scenario": name,
+                        "concurrency": args.concurrency, "seconds": args.seconds, **result, "dataset": dataset
+                    }), flush=True)
+            finally:
+                if server:
+                    server.terminate()
+                    server.wait()
+    finally:
+        if not args.database:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# server/bench_archive.py
+# Hot query latency before and after archiving past events:
+#   python bench_archive.py --events 1000000 --bookings 10000000
+#   python bench_archive.py --database copy-of-seeded.db      (archived in place!)
+# Times the statements behind GET /api/events, /api/home and
+# /api/bookings/my straight against the database (no page cache), runs
+# `flask archive run`'s batches, then times them again. Prints one JSON
+# object per query with median and p95 milliseconds before and after, and
+# one for the archival run itself.
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+from bench_serving import percentile
+
+def timed(stmt_factory, iterations):
+    from extensions import db
+    samples = []
+    for _ in range(iterations):
+        stmt = stmt_factory()
+        started = time.perf_counter()
+        db.session.execute(stmt).all()
+        samples.append(time.perf_counter() - started)
+        db.session.rollback()
+    samples.sort()
+    return round(percentile(samples, 0.50) * 1000, 3), round(percentile(samples, 0.95) * 1000, 3)
+
+def hot_queries(user_ids, categories):
+    from queries import (
+        parse_event_filters, events_query, catalog_version_query, category_facets_query,
+        bookings_version_query, my_bookings_query
+    )
+    from serializers import EVENT_COLUMNS, MY_BOOKING_COLUMNS
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    rng = random.Random(1)
+
+    def page(**args):
+        return lambda: events_query(parse_event_filters(args), columns=EVENT_COLUMNS)
+
+    return {
+        "catalog_version": catalog_version_query,
+        "events_first_page": page(),
+        "events_upcoming_page": page(date_from=today.isoformat()),
+        "events_category_page": lambda: events_query(
+            parse_event_filters({"category": rng.choice(categories)}), columns=EVENT_COLUMNS),
+        "events_available_page": page(available="true", date_from=today.isoformat()),
+        "home_category_facets": lambda: category_facets_query(today),
+        "bookings_version": lambda: bookings_version_query(rng.choice(user_ids)),
+        "my_bookings": lambda: my_bookings_query(rng.choice(user_ids), MY_BOOKING_COLUMNS),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot query latency before/after archival")
+    parser.add_argument("--database", help="Seeded SQLite file, archived in place (default: seed a temporary one)")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--bookings", type=int, default=1000000)
+    parser.add_argument("--past-fraction", type=float, default=0.3)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.database:
+        db_path = os.path.abspath(args.database)
+    else:
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+    os.environ.update(
+        DATABASE_URI=f"sqlite:///{db_path}", DB_PROFILE=os.getenv("DB_PROFILE", "production"),
+        HASH_POOL_SIZE="0", OUTBOX_WORKER_THREADS="0", HOLD_REAPER_INTERVAL="0",
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    from sqlalchemy import select, text
+    from app import app
+    from extensions import db
+    from models import Booking, Event
+    from archive import archive_counts, archive_past_events
+    from seed_events import seed_synthetic
+
+    try:
+        with app.app_context():
+            db.create_all()
+            if not args.database:
+                seed_synthetic(args.users, args.events, args.bookings, random_seed=1,
+                               past_fraction=args.past_fraction)
+            # Users with bookings, so my_bookings has rows to read
+            user_ids = db.session.scalars(select(Booking.user_id).distinct().limit(5000)).all()
+            categories = db.session.scalars(select(Event.category).distinct()).all()
+
+            # Fresh planner statistics on both sides of the comparison
+            db.session.execute(text("ANALYZE"))
+            db.session.commit()
+            before_counts = archive_counts()
+            # Rebuilt per pass so both pick the same users and categories
+            queries = hot_queries(user_ids, categories)
+            before = {name: timed(factory, args.iterations) for name, factory in queries.items()}
+            started = time.perf_counter()
+            events, bookings = archive_past_events(datetime.utcnow(), args.batch_size)
+            elapsed = time.perf_counter() - started
+            db.session.execute(text("ANALYZE"))
+            db.session.commit()
+            # Fold the archival writes back into the database file, or every
+            # later read would also search the WAL
+            db.session.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+            print(json.dumps({
+                "archive": {"events": events, "bookings": bookings, "seconds": round(elapsed, 1),
+                            "rows_per_second": round((events + bookings) / elapsed) if elapsed else None},
+                "before": before_counts, "after": archive_counts(),
+            }), flush=True)
+            queries = hot_queries(user_ids, categories)
+            after = {name: timed(factory, args.iterations) for name, factory in queries.items()}
+
+        for name in queries:
+            (before_p50, before_p95), (after_p50, after_p95) = before[name], after[name]
+            print(json.dumps({
+                "query": name, "before_p50_ms": before_p50, "after_p50_ms": after_p50,
+                "before_p95_ms": before_p95, "after_p95_ms": after_p95,
+                "speedup_p50": round(before_p50 / after_p50, 2) if after_p50 else None,
+            }), flush=True)
+    finally:
+        if not args.database:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
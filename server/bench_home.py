@@ -0,0 +1,149 @@
+# server/bench_home.py
+# Page-load cost of the landing pages, separate requests vs GET /api/home:
+#   python bench_home.py --concurrency 8 --seconds 10
+#   python bench_home.py --database seeded.db --servers asgi --rtt-ms 40
+# "fanout" is what the pages sent before: the events listing, then the
+# preflight and GET of /api/bookings/my. "home" is one preflight and one
+# GET /api/home carrying both plus category facets. Requests of a page go
+# one after the other on a keep-alive connection; --rtt-ms adds a network
+# round trip to each, as a browser on a real link would pay. Prints one
+# JSON object per server and page shape with page loads/sec and latency.
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from bench_serving import HERE, WSGI_SERVER, free_port, summarize, wait_for
+from bench_api import token_headers
+
+PREFLIGHT_HEADERS = {
+    "Origin": "http://localhost:3000",
+    "Access-Control-Request-Method": "GET",
+    "Access-Control-Request-Headers": "authorization",
+}
+
+PAGES = {
+    "fanout": [("GET", "/api/events", False), ("OPTIONS", "/api/bookings/my", False),
+               ("GET", "/api/bookings/my", True)],
+    "home": [("OPTIONS", "/api/home", False), ("GET", "/api/home", True)],
+}
+
+def page_load(port, requests, headers, concurrency, seconds, rtt):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        rng = random.Random()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            auth = rng.choice(headers)
+            started = time.perf_counter()
+            try:
+                for method, path, authorized in requests:
+                    time.sleep(rtt)
+                    if authorized:
+                        request_headers = auth
+                    else:
+                        request_headers = PREFLIGHT_HEADERS if method == "OPTIONS" else {}
+                    connection.request(method, path, headers=request_headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        raise http.client.HTTPException(f"{method} {path}: {response.status}")
+                local.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors[0], seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Landing page load: separate requests vs /api/home")
+    parser.add_argument("--database", help="Seeded SQLite file to use as is (default: seed a temporary one)")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--bookings", type=int, default=50000)
+    parser.add_argument("--servers", default="wsgi,asgi")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=0, help="Simulated network round trip per request")
+    parser.add_argument("--token-users", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.database:
+        db_path = os.path.abspath(args.database)
+    else:
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+    env = dict(
+        os.environ, DATABASE_URI=f"sqlite:///{db_path}", RATELIMIT_ENABLED="0", HASH_POOL_SIZE="0",
+        OUTBOX_WORKER_THREADS="0", HOLD_REAPER_INTERVAL="0",
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    os.environ.update(env)
+    from sqlalchemy import select
+    from app import app
+    from extensions import db
+    from models import User
+    from seed_events import seed_synthetic
+
+    try:
+        with app.app_context():
+            if not args.database:
+                db.create_all()
+                seed_synthetic(args.users, args.events, args.bookings, random_seed=1)
+            users = db.session.execute(
+                select(User.id, User.email, User.name, User.is_organizer)
+                .where(User.is_organizer.is_(False)).limit(args.token_users)
+            ).all()
+            headers = list(token_headers(users).values())
+
+        for name in args.servers.split(","):
+            port = free_port()
+            if name == "wsgi":
+                command = [sys.executable, "-c", WSGI_SERVER.format(port=port)]
+            elif name == "asgi":
+                command = [sys.executable, "asgi.py"]
+            else:
+                parser.error(f"unknown server {name}")
+            server = subprocess.Popen(command, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                      env=dict(env, PORT=str(port), WEB_CONCURRENCY="1"))
+            try:
+                wait_for(port)
+                for page, requests in PAGES.items():
+                    # Warm the catalog caches so both shapes start equal
+                    page_load(port, requests, headers, 1, 1, 0)
+                    # "requests" counts whole page loads here
+                    result = page_load(port, requests, headers, args.concurrency, args.seconds, args.rtt_ms / 1000)
+                    print(json.dumps({
+                        "server": name, "page": page, "requests_per_page": len(requests),
+                        "concurrency": args.concurrency, "rtt_ms": args.rtt_ms, **result
+                    }), flush=True)
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        if not args.database:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
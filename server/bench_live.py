@@ -0,0 +1,235 @@
+# server/bench_live.py
+# Live availability streams under load:
+#   python bench_live.py --subscribers 5000 --events 20 --bookings 500
+#   python bench_live.py --http-subscribers 2000      (real SSE connections to asgi.py)
+# In-process: thousands of hub subscribers spread over a few events while
+# bookings go through the Flask test client; a share of them never drain,
+# to exercise the buffer cap and idle eviction. Over HTTP: a uvicorn worker
+# serves real EventSource-style connections. Prints one JSON object per
+# run with delivery latency (booking committed -> subscriber woken),
+# messages per subscriber, coalescing and memory per subscriber.
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from bench_serving import free_port, percentile, wait_for
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def seed(events):
+    from sqlalchemy import insert
+    from extensions import db
+    from flask_jwt_extended import create_access_token
+    from models import Event, User
+    db.create_all()
+    organizer = User(email="organizer@bench", name="Organizer", is_organizer=True, password_hash="-")
+    customer = User(email="customer@bench", name="Customer", password_hash="-")
+    db.session.add_all([organizer, customer])
+    db.session.flush()
+    event_ids = db.session.scalars(insert(Event).returning(Event.id), [{
+        "title": f"Live event {i}", "description": "Benchmark event", "location": "Lyon",
+        "date": datetime.utcnow() + timedelta(days=30), "category": "concert", "price": 20,
+        "max_seats": 1000000, "available_seats": 1000000, "organizer_id": organizer.id
+    } for i in range(events)]).all()
+    db.session.commit()
+    token = create_access_token(identity=str(customer.id), additional_claims={
+        "email": customer.email, "name": customer.name, "is_organizer": False})
+    return event_ids, {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+
+def latency_summary(samples):
+    samples = sorted(samples)
+    return {
+        "deliveries": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2) if samples else None,
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2) if samples else None,
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2) if samples else None,
+    }
+
+def run_in_process(app, args, event_ids, headers):
+    from extensions import live_hub
+    client = app.test_client()
+    # Bookings are spread over the events; each wake is timed against the
+    # commit of the latest booking on that event
+    committed = {}
+    latencies = []
+    received = {}
+
+    def waker(index, event_id):
+        def wake():
+            latencies.append(time.perf_counter() - committed.get(event_id, time.perf_counter()))
+            received[index] = received.get(index, 0) + 1
+        return wake
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subscriptions = []
+    with app.app_context():
+        for index in range(args.subscribers):
+            event_id = event_ids[index % len(event_ids)]
+            subscriptions.append(live_hub.subscribe(event_id, 1, waker(index, event_id)))
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / args.subscribers
+    tracemalloc.stop()
+
+    # Every subscriber drains except the slow share, which only ever fills
+    # its buffer until idle eviction removes it
+    slow = set(random.Random(1).sample(range(args.subscribers), int(args.subscribers * args.slow_fraction)))
+    stop = threading.Event()
+
+    def drain():
+        while not stop.wait(0.05):
+            for index, subscription in enumerate(subscriptions):
+                if index not in slow:
+                    subscription.drain()
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+    started = time.perf_counter()
+    rng = random.Random(2)
+    for _ in range(args.bookings):
+        event_id = rng.choice(event_ids)
+        response = client.post("/api/bookings", json={"event_id": event_id, "seat_count": 1}, headers=headers)
+        if response.status_code != 201:
+            raise SystemExit(f"booking failed: {response.status_code} {response.get_data(as_text=True)}")
+        committed[event_id] = time.perf_counter()
+        time.sleep(args.booking_interval)
+    elapsed = time.perf_counter() - started
+    # Let the last window flush, then outlast the idle timeout
+    time.sleep(live_hub.coalesce_seconds * 2)
+    buffered_max = max(len(subscription.messages) for subscription in subscriptions)
+    time.sleep(live_hub.idle_timeout + live_hub.coalesce_seconds * 4)
+    stop.set()
+    drainer.join()
+
+    draining = args.subscribers - len(slow)
+    messages = sum(count for index, count in received.items() if index not in slow)
+    return {
+        "mode": "in_process", "subscribers": args.subscribers, "events": len(event_ids),
+        "bookings": args.bookings, "seconds": round(elapsed, 2),
+        **latency_summary(latencies),
+        "messages_per_subscriber": round(messages / draining, 2) if draining else None,
+        "bookings_per_message": round(args.bookings / len(event_ids) / (messages / draining), 2) if messages else None,
+        "bytes_per_subscriber": round(per_subscriber),
+        "slow_subscribers": len(slow), "max_buffered_messages": buffered_max,
+        "buffer_cap": live_hub.buffer_size, "dropped": live_hub.dropped_total,
+        "evicted": live_hub.evicted_total, "still_subscribed": live_hub.subscribers,
+    }
+
+async def run_http(args, env, event_ids, headers):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "asgi.py"], cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env=dict(env, PORT=str(port), WEB_CONCURRENCY="1")
+    )
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, wait_for, port)
+        committed = {}
+        latencies = []
+        counts = []
+        connected = asyncio.Event()
+        opened = [0]
+
+        async def subscriber(event_id):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET /api/events/{event_id}/live HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+            await writer.drain()
+            received = 0
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    if line.startswith(b"event: seats"):
+                        received += 1
+                        if received == 1:
+                            opened[0] += 1
+                            if opened[0] == args.http_subscribers:
+                                connected.set()
+                        elif event_id in committed:
+                            latencies.append(time.perf_counter() - committed[event_id])
+            except (asyncio.CancelledError, ConnectionError):
+                pass
+            finally:
+                counts.append(received - 1)
+                writer.close()
+
+        tasks = [asyncio.ensure_future(subscriber(event_ids[i % len(event_ids)])) for i in range(args.http_subscribers)]
+        await asyncio.wait_for(connected.wait(), timeout=120)
+
+        def book(event_id):
+            import http.client
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            connection.request("POST", "/api/bookings", body=json.dumps({"event_id": event_id, "seat_count": 1}),
+                               headers=headers)
+            status = connection.getresponse().status
+            connection.close()
+            return status
+
+        rng = random.Random(2)
+        started = time.perf_counter()
+        for _ in range(args.bookings):
+            event_id = rng.choice(event_ids)
+            status = await asyncio.get_running_loop().run_in_executor(None, book, event_id)
+            if status != 201:
+                raise SystemExit(f"booking failed: {status}")
+            committed[event_id] = time.perf_counter()
+            await asyncio.sleep(args.booking_interval)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(1)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return {
+            "mode": "http_asgi", "subscribers": args.http_subscribers, "events": len(event_ids),
+            "bookings": args.bookings, "seconds": round(elapsed, 2), **latency_summary(latencies),
+            "messages_per_subscriber": round(sum(counts) / len(counts), 2) if counts else None,
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Live availability stream load test")
+    parser.add_argument("--subscribers", type=int, default=5000, help="In-process hub subscribers (0 to skip)")
+    parser.add_argument("--http-subscribers", type=int, default=0, help="SSE connections to asgi.py (0 to skip)")
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--bookings", type=int, default=300)
+    parser.add_argument("--booking-interval", type=float, default=0.005, help="Seconds between bookings")
+    parser.add_argument("--slow-fraction", type=float, default=0.05, help="Share of subscribers that never drain")
+    parser.add_argument("--coalesce", type=float, default=0.25)
+    parser.add_argument("--idle-timeout", type=float, default=3)
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    env = dict(
+        os.environ, DATABASE_URI=f"sqlite:///{db_path}", HASH_POOL_SIZE="0", RATELIMIT_ENABLED="0",
+        OUTBOX_WORKER_THREADS="0", HOLD_REAPER_INTERVAL="0", DB_PROFILE="production",
+        LIVE_COALESCE_SECONDS=str(args.coalesce), LIVE_IDLE_TIMEOUT=str(args.idle_timeout),
+        LIVE_MAX_SUBSCRIBERS=str(max(args.subscribers, args.http_subscribers) + 100),
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    os.environ.update(env)
+    from app import app
+
+    try:
+        with app.app_context():
+            event_ids, headers = seed(args.events)
+        if args.subscribers:
+            print(json.dumps(run_in_process(app, args, event_ids, headers)), flush=True)
+        if args.http_subscribers:
+            print(json.dumps(asyncio.run(run_http(args, env, event_ids, headers))), flush=True)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# server/bench_login.py
+# Mixed login/browse traffic against the WSGI dev server, hashing inline on
+# the request threads vs on the bounded process pool (hashing.py):
+#   python bench_login.py --login-concurrency 16 --browse-concurrency 8 --seconds 10
+#   python bench_login.py --configs pool --pool-size 4 --queue-limit 8
+# Logins and browsing (GET /api/events, /api/events/<id>) run at the same
+# time on separate connections. Prints one JSON object per configuration
+# and traffic class with requests/sec, latency percentiles and status counts;
+# logins shed by admission control show up as 503s.
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from bench_serving import HERE, WSGI_SERVER, browse_requests, free_port, seed, summarize, wait_for
+
+LOGIN_BODY = json.dumps({"email": "organizer@bench", "password": "bench"})
+
+def login_request(rng):
+    return "POST", "/api/auth/login", LOGIN_BODY, {"Content-Type": "application/json"}
+
+def mixed_load(port, classes, seconds):
+    # classes: {name: (next_request, concurrency)}. Every class runs for the
+    # same wall-clock window; 503s count as rejected, not as latency samples.
+    latencies = {name: [] for name in classes}
+    statuses = {name: Counter() for name in classes}
+    errors = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(name, next_request):
+        rng = random.Random()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, codes, failed = [], Counter(), 0
+        while time.perf_counter() < deadline:
+            method, path, body, headers = next_request(rng)
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+                response.read()
+                codes[response.status] += 1
+                if response.status < 500:
+                    local.append(time.perf_counter() - started)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+        connection.close()
+        with lock:
+            latencies[name].extend(local)
+            statuses[name].update(codes)
+            errors[name] += failed
+
+    threads = [
+        threading.Thread(target=worker, args=(name, next_request))
+        for name, (next_request, concurrency) in classes.items() for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        name: {**summarize(latencies[name], errors[name], seconds),
+               "statuses": {str(code): count for code, count in sorted(statuses[name].items())}}
+        for name in classes
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed login/browse benchmark: inline vs pooled hashing")
+    parser.add_argument("--configs", default="inline,pool")
+    parser.add_argument("--login-concurrency", type=int, default=16)
+    parser.add_argument("--browse-concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--queue-limit", type=int, default=None, help="HASH_QUEUE_LIMIT (default: 4 per worker)")
+    parser.add_argument("--hash-method", default="scrypt:32768:8:1")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    env = dict(
+        os.environ, DATABASE_URI=f"sqlite:///{db_path}", HASH_POOL_SIZE="0", PASSWORD_HASH_METHOD=args.hash_method,
+        RATELIMIT_ENABLED="0", OUTBOX_WORKER_THREADS="0", HOLD_REAPER_INTERVAL="0",
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    os.environ.update(env)
+    # The organizer's password is hashed with --hash-method, so logins never rehash
+    seed(args.events)
+
+    configs = {
+        "inline": {"HASH_POOL_SIZE": "0"},
+        "pool": {"HASH_POOL_SIZE": str(args.pool_size),
+                 **({"HASH_QUEUE_LIMIT": str(args.queue_limit)} if args.queue_limit else {})},
+    }
+    classes = {
+        "login": (login_request, args.login_concurrency),
+        "browse": (browse_requests(args.events), args.browse_concurrency),
+    }
+    try:
+        for name in args.configs.split(","):
+            if name not in configs:
+                parser.error(f"unknown config {name}")
+            port = free_port()
+            server = subprocess.Popen(
+                [sys.executable, "-c", WSGI_SERVER.format(port=port)], cwd=HERE,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=dict(env, PORT=str(port), **configs[name])
+            )
+            try:
+                wait_for(port)
+                # Warm-up: catalog caches, and the pool's worker processes
+                mixed_load(port, {"login": (login_request, 1), "browse": (classes["browse"][0], 1)}, 2)
+                results = mixed_load(port, classes, args.seconds)
+            finally:
+                server.terminate()
+                server.wait()
+            for traffic, result in results.items():
+                print(json.dumps({
+                    "config": name, "traffic": traffic, "concurrency": classes[traffic][1],
+                    "pool_size": int(configs[name]["HASH_POOL_SIZE"]), **result
+                }), flush=True)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# server/bench_ratelimit.py
+# Per-request cost of the rate limiter, measured in-process:
+#   python bench_ratelimit.py --iterations 200000
+# Prints one JSON object per path with nanoseconds per check.
+import argparse
+import json
+import os
+import tempfile
+import time
+
+def per_call_ns(fn, iterations):
+    fn()
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - started) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate limiter micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--redis", action="store_true", help="Also time the Redis backend (fakeredis)")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_URI"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-for-production")
+    os.environ["RATELIMIT_ENABLED"] = "1"
+    from app import app
+    from extensions import rate_limiter
+    from flask_jwt_extended import create_access_token
+    from ratelimit import MemoryBackend
+
+    # Rates high enough that every check takes the "allowed" branch
+    fast = 1e9
+    backend = MemoryBackend()
+    results = {
+        # Interpreter call overhead on this machine, for comparing runs
+        "baseline_empty_call": per_call_ns(lambda: None, args.iterations),
+        "memory_backend_acquire": per_call_ns(lambda: backend.acquire(("bench", "127.0.0.1"), fast, fast), args.iterations),
+    }
+
+    with app.app_context():
+        token = create_access_token(identity="1")
+    rate_limiter.limits = {"bookings.create_booking": (fast, fast)}
+    rate_limiter._resolved = {}
+    checks = {
+        "hook_unlimited_route": ("/api/events", "GET", {}),
+        "hook_limited_route_by_ip": ("/api/bookings", "POST", {}),
+        "hook_limited_route_by_token": ("/api/bookings", "POST", {"Authorization": f"Bearer {token}"}),
+    }
+    for name, (path, method, headers) in checks.items():
+        with app.test_request_context(path, method=method, headers=headers):
+            results[name] = per_call_ns(rate_limiter._before_request, args.iterations)
+
+    if args.redis:
+        import fakeredis
+        from ratelimit import RedisBackend
+        shared = RedisBackend(fakeredis.FakeRedis())
+        results["redis_backend_acquire_fakeredis"] = per_call_ns(
+            lambda: shared.acquire(("bench", "127.0.0.1"), fast, fast), max(1, args.iterations // 100))
+
+    for name, ns in results.items():
+        print(json.dumps({"path": name, "ns_per_check": round(ns, 1)}), flush=True)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# server/bench_reservations.py
+# Flash-sale stress test of POST /api/bookings (reservations.py):
+#   python bench_reservations.py --requests 3000 --threads 64 --seats 500
+#   python bench_reservations.py --events 4 --cancel-ratio 0.2 --profile default
+# Every thread is released at once and books the same few events until the
+# request budget is spent; some bookings are cancelled again right away.
+# Afterwards the database is checked: no event may have more seats booked
+# than it has, and booked + free must equal max_seats. Prints one JSON
+# object with bookings/sec, latency and status counts; exits 1 on oversell.
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from bench_serving import summarize
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent booking stress test")
+    parser.add_argument("--requests", type=int, default=3000, help="Booking requests in total")
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--events", type=int, default=1, help="Events the burst is spread over")
+    parser.add_argument("--seats", type=int, default=500, help="max_seats of each event")
+    parser.add_argument("--max-seat-count", type=int, default=3, help="Seats per booking, 1 to this")
+    parser.add_argument("--cancel-ratio", type=float, default=0.1)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--profile", default="production", help="DB_PROFILE")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ.update(
+        DATABASE_URI=f"sqlite:///{db_path}", DB_PROFILE=args.profile, RATELIMIT_ENABLED="0",
+        HASH_POOL_SIZE="0", OUTBOX_WORKER_THREADS="0", HOLD_REAPER_INTERVAL="0",
+        DB_POOL_SIZE=os.getenv("DB_POOL_SIZE", str(args.threads)),
+        # Queueing behind the write lock is the point here, not worth a log line each
+        SLOW_REQUEST_MS=os.getenv("SLOW_REQUEST_MS", "60000"),
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    from sqlalchemy import func, insert, select
+    from app import app
+    from extensions import db
+    from models import Booking, Event, User
+    from bench_api import token_headers
+
+    try:
+        with app.app_context():
+            db.create_all()
+            db.session.execute(insert(User), [
+                {"email": f"user{i}@bench", "name": f"User {i}", "password_hash": "-", "is_organizer": i == 0}
+                for i in range(args.users)
+            ])
+            organizer_id = db.session.scalar(select(User.id).where(User.is_organizer.is_(True)))
+            db.session.execute(insert(Event), [{
+                "title": f"Flash sale {i}", "description": "Stress test", "location": "Paris",
+                "date": datetime.utcnow() + timedelta(days=30), "category": "concert", "price": 25,
+                "max_seats": args.seats, "available_seats": args.seats, "organizer_id": organizer_id
+            } for i in range(args.events)])
+            db.session.commit()
+            event_ids = db.session.scalars(select(Event.id)).all()
+            users = db.session.execute(
+                select(User.id, User.email, User.name, User.is_organizer).where(User.is_organizer.is_(False))
+            ).all()
+            headers = list(token_headers(users).values())
+
+        budget = itertools.count()
+        statuses = Counter()
+        latencies = []
+        lock = threading.Lock()
+        start = threading.Barrier(args.threads + 1)
+
+        def worker():
+            client = app.test_client()
+            rng = random.Random()
+            local, codes = [], Counter()
+            start.wait()
+            while next(budget) < args.requests:
+                auth = rng.choice(headers)
+                body = {"event_id": rng.choice(event_ids), "seat_count": rng.randint(1, args.max_seat_count)}
+                started = time.perf_counter()
+                response = client.post("/api/bookings", json=body, headers=auth)
+                local.append(time.perf_counter() - started)
+                codes[response.status_code] += 1
+                if response.status_code == 201 and rng.random() < args.cancel_ratio:
+                    booking_id = response.get_json()["booking"]["id"]
+                    codes["cancel_" + str(client.delete(f"/api/bookings/{booking_id}", headers=auth).status_code)] += 1
+            with lock:
+                latencies.extend(local)
+                statuses.update(codes)
+
+        threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            booked = dict(db.session.execute(
+                select(Booking.event_id, func.coalesce(func.sum(Booking.seat_count), 0)).group_by(Booking.event_id)
+            ).all())
+            bookings = db.session.scalar(select(func.count(Booking.id)))
+            events = db.session.execute(select(Event.id, Event.max_seats, Event.available_seats)).all()
+
+        oversold = [
+            {"event_id": event_id, "max_seats": max_seats, "booked": booked.get(event_id, 0), "available": available}
+            for event_id, max_seats, available in events
+            if available < 0 or booked.get(event_id, 0) + available != max_seats
+        ]
+        expected_bookings = statuses[201] - statuses["cancel_200"]
+        result = summarize(latencies, statuses[500], elapsed)
+        print(json.dumps({
+            "profile": args.profile, "threads": args.threads, "events": args.events, "seats": args.seats,
+            "seconds": round(elapsed, 2),
+            "bookings_per_second": round(statuses[201] / elapsed, 1),
+            **result,
+            "statuses": {str(code): count for code, count in sorted(statuses.items(), key=str)},
+            "seats_booked": sum(booked.values()),
+            "bookings": bookings,
+            "sold_out": all(available == 0 for _, _, available in events),
+            "oversold_events": oversold,
+            "lost_bookings": expected_bookings - bookings,
+        }), flush=True)
+        if oversold or expected_bookings != bookings or statuses[500]:
+            sys.exit(1)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
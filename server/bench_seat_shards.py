@@ -0,0 +1,95 @@
+# server/bench_seat_shards.py
+# Booking contention on one hot event, single counter row vs sharded:
+#   python bench_seat_shards.py --threads 16 --seconds 10 --shards 0,8,32
+#   python bench_seat_shards.py --database-uri postgresql://localhost/bench
+# Every thread books one seat per transaction through reserve_seats, as
+# create_booking does. Prints one JSON object per shard count (0 = the
+# single events row) with bookings/sec, failed transactions and latency.
+# SQLite takes one write lock for the whole database, so row sharding can
+# only show up on a server database with row locks.
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from bench_serving import summarize
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot event booking contention benchmark")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--shards", default="0,8,32", help="Shard counts to compare; 0 is the single row")
+    parser.add_argument("--capacity", type=int, default=10000000)
+    parser.add_argument("--database-uri", help="Default: a temporary SQLite file")
+    args = parser.parse_args()
+
+    db_path = None
+    if args.database_uri:
+        os.environ["DATABASE_URI"] = args.database_uri
+    else:
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        os.environ["DATABASE_URI"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-for-production")
+    os.environ["HASH_POOL_SIZE"] = "0"
+    from sqlalchemy import insert
+    from app import app
+    from extensions import db
+    from models import Event, User
+    from reservations import reserve_seats, run_with_retry, set_seat_shards
+
+    try:
+        with app.app_context():
+            db.create_all()
+            organizer = db.session.scalar(
+                insert(User).values(email=f"organizer-{time.time_ns()}@bench", name="Organizer",
+                                    password_hash="-", is_organizer=True).returning(User.id)
+            )
+            event_id = db.session.scalar(insert(Event).values(
+                title="Headliner", description="Hot event", location="Lyon",
+                date=datetime.utcnow() + timedelta(days=30), category="concert", price=50,
+                max_seats=args.capacity, available_seats=args.capacity, organizer_id=organizer
+            ).returning(Event.id))
+            db.session.commit()
+            dialect = db.engine.dialect.name
+
+        for shards in (int(count) for count in args.shards.split(",")):
+            with app.app_context():
+                set_seat_shards(event_id, shards)
+            latencies = []
+            errors = [0]
+            lock = threading.Lock()
+            deadline = time.perf_counter() + args.seconds
+
+            def worker():
+                local, failed = [], 0
+                with app.app_context():
+                    while time.perf_counter() < deadline:
+                        started = time.perf_counter()
+                        try:
+                            run_with_retry(lambda: reserve_seats(event_id, 1), immediate=True)
+                            local.append(time.perf_counter() - started)
+                        except Exception:
+                            failed += 1
+                with lock:
+                    latencies.extend(local)
+                    errors[0] += failed
+
+            threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            result = summarize(latencies, errors[0], args.seconds)
+            print(json.dumps({"shards": shards, "threads": args.threads,
+                              "database": dialect, **result}), flush=True)
+    finally:
+        if db_path:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# server/bench_serialization.py
+# Listing serialization, ORM objects + to_dict() + jsonify vs column rows +
+# the pre-built encoder in serializers.py:
+#   python bench_serialization.py --sizes 1000,10000,100000 --iterations 5
+# "fetch_and_encode" times the query and the encoding together, the way a
+# listing view pays for them; "encode_only" times the encoding of rows that
+# are already loaded. Prints one JSON object per size with median
+# milliseconds per path and the encoder backend (orjson or json).
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+def median_ms(fn, iterations):
+    fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1000, 2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Listing serialization micro-benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ.update(
+        DATABASE_URI=f"sqlite:///{db_path}", HASH_POOL_SIZE="0", OUTBOX_WORKER_THREADS="0",
+        HOLD_REAPER_INTERVAL="0", SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    from flask import jsonify
+    from sqlalchemy import insert, select
+    from app import app
+    from extensions import db
+    from models import Event, User
+    from serializers import EVENT_COLUMNS, encode_events, orjson
+
+    try:
+        with app.app_context():
+            db.create_all()
+            db.session.execute(insert(User), [{"email": "organizer@bench", "name": "Organizer",
+                                               "password_hash": "-", "is_organizer": True}])
+            now = datetime.utcnow()
+            categories = ["concert", "conference", "sport", "theatre", "workshop"]
+            db.session.execute(insert(Event), [{
+                "title": f"Bench event {i}", "description": "Benchmark event " * 10, "location": "Lyon",
+                "date": now + timedelta(minutes=i), "created_at": now, "category": categories[i % len(categories)],
+                "price": 10 + i % 50, "max_seats": 500, "available_seats": 250, "organizer_id": 1, "image": None,
+            } for i in range(max(sizes))])
+            db.session.commit()
+
+            for size in sizes:
+                def orm_objects():
+                    objects = Event.query.order_by(Event.date, Event.id).limit(size).all()
+                    db.session.expunge_all()
+                    return objects
+
+                def column_rows():
+                    return db.session.execute(select(*EVENT_COLUMNS).order_by(Event.date, Event.id).limit(size)).all()
+
+                def to_dict_jsonify(objects):
+                    with app.test_request_context():
+                        return jsonify([event.to_dict() for event in objects]).get_data()
+
+                objects, rows = orm_objects(), column_rows()
+                # Both paths must produce the same document
+                assert json.loads(to_dict_jsonify(objects)) == json.loads(encode_events(rows))
+                old_fetch = median_ms(lambda: to_dict_jsonify(orm_objects()), args.iterations)
+                new_fetch = median_ms(lambda: encode_events(column_rows()), args.iterations)
+                old_encode = median_ms(lambda: to_dict_jsonify(objects), args.iterations)
+                new_encode = median_ms(lambda: encode_events(rows), args.iterations)
+                print(json.dumps({
+                    "rows": size, "backend": "orjson" if orjson is not None else "json",
+                    "fetch_and_encode": {"to_dict_jsonify_ms": old_fetch, "encoder_ms": new_fetch,
+                                         "speedup": round(old_fetch / new_fetch, 2)},
+                    "encode_only": {"to_dict_jsonify_ms": old_encode, "encoder_ms": new_encode,
+                                    "speedup": round(old_encode / new_encode, 2)},
+                    "body_bytes": len(encode_events(rows)),
+                }), flush=True)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# server/bench_serving.py
+# Concurrent browse load against the WSGI dev server (app.py) and the ASGI
+# entry point (asgi.py), both serving the same freshly seeded database:
+#   python bench_serving.py --concurrency 32 --seconds 10 --asgi-workers 2
+# Prints one JSON object per serving mode with requests/sec and latency percentiles.
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+WSGI_SERVER = (
+    "from app import app; "
+    "app.run(host='127.0.0.1', port={port}, threaded=True, use_reloader=False)"
+)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(latencies, errors, seconds):
+    # Latencies in seconds; reported in milliseconds
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / seconds, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+    }
+
+def http_load(host, port, next_request, concurrency, seconds):
+    # next_request(rng) -> (method, path, body, headers). One persistent
+    # connection per thread, reopened whenever the server closes it.
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        rng = random.Random()
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            method, path, body, headers = next_request(rng)
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers or {})
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 500:
+                    failed += 1
+                else:
+                    local.append(time.perf_counter() - started)
+                if response.getheader("Connection", "").lower() == "close" or response.version == 10:
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors[0], seconds)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+def seed(events):
+    from app import app
+    from extensions import db
+    from models import Event, User
+    from sqlalchemy import insert
+
+    with app.app_context():
+        db.create_all()
+        organizer = User(email="organizer@bench", name="Organizer", is_organizer=True)
+        organizer.set_password("bench")
+        db.session.add(organizer)
+        db.session.flush()
+        now = datetime.utcnow()
+        categories = ["concert", "conference", "sport", "theatre", "workshop"]
+        db.session.execute(insert(Event), [{
+            "title": f"Bench event {i}", "description": "Benchmark event " * 10, "location": "Lyon",
+            "date": now + timedelta(hours=i), "category": categories[i % len(categories)],
+            "price": 10 + i % 50, "max_seats": 500, "available_seats": 500, "organizer_id": organizer.id
+        } for i in range(events)])
+        db.session.commit()
+
+def browse_requests(events):
+    categories = ["concert", "conference", "sport", "theatre", "workshop"]
+
+    def next_request(rng):
+        roll = rng.random()
+        if roll < 0.5:
+            return "GET", f"/api/events/{rng.randint(1, events)}", None, None
+        if roll < 0.8:
+            return "GET", f"/api/events?limit=50&category={rng.choice(categories)}", None, None
+        return "GET", "/api/events?limit=50", None, None
+    return next_request
+
+def main():
+    parser = argparse.ArgumentParser(description="WSGI vs ASGI browse benchmark")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--asgi-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--modes", default="wsgi,asgi")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    env = dict(
+        os.environ, DATABASE_URI=f"sqlite:///{db_path}", HASH_POOL_SIZE="0",
+        PASSWORD_HASH_METHOD="pbkdf2:sha256:1000", RATELIMIT_ENABLED="0",
+        SECRET_KEY=os.getenv("SECRET_KEY", "bench-secret-key-not-for-production"),
+    )
+    os.environ.update(env)
+    seed(args.events)
+
+    try:
+        for mode in args.modes.split(","):
+            port = free_port()
+            if mode == "wsgi":
+                command = [sys.executable, "-c", WSGI_SERVER.format(port=port)]
+            else:
+                command = [sys.executable, "asgi.py"]
+            server = subprocess.Popen(
+                command, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                env=dict(env, PORT=str(port), WEB_CONCURRENCY=str(args.asgi_workers))
+            )
+            try:
+                wait_for(port)
+                # Warm-up fills both modes' caches the same way
+                http_load("127.0.0.1", port, browse_requests(args.events), args.concurrency, 2)
+                result = http_load("127.0.0.1", port, browse_requests(args.events), args.concurrency, args.seconds)
+            finally:
+                server.terminate()
+                server.wait()
+            print(json.dumps({"mode": mode, "concurrency": args.concurrency,
+                              "workers": args.asgi_workers if mode == "asgi" else 1, **result}), flush=True)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
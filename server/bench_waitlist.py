@@ -0,0 +1,173 @@
+# server/bench_waitlist.py
+# A sold-out event under cancellation churn, served two ways:
+#   python bench_waitlist.py --waiters 100 --cancellations 200 --churn-interval 0.01
+# "polling": waiting users GET /api/events/<id> every --poll-interval and
+# book when a seat shows up (the behaviour before the waitlist existed).
+# "waitlist": waiting users join the waitlist once and are promoted inside
+# the cancelling transaction.
+# Prints one JSON object per mode: requests issued by waiting users and the
+# latency from a cancellation starting to a waiting user holding the seat.
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from bench_serving import percentile
+
+def configure(db_path):
+    os.environ["DATABASE_URI"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("DB_PROFILE", "production")
+    os.environ.setdefault("SECRET_KEY", "bench-secret-key-not-for-production")
+    os.environ["HASH_POOL_SIZE"] = "0"
+    os.environ["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    os.environ["HOLD_REAPER_INTERVAL"] = "0"
+    os.environ["RATELIMIT_ENABLED"] = "0"
+
+def login(client, email, is_organizer=False):
+    client.post("/api/auth/register", json={"email": email, "password": "bench", "name": email,
+                                            "is_organizer": is_organizer})
+    response = client.post("/api/auth/login", json={"email": email, "password": "bench"})
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+def sold_out_event(client, organizer, holder, seats, mode):
+    response = client.post("/api/events", json={
+        "title": f"Sold out ({mode})", "description": "Waitlist benchmark", "location": "Nantes",
+        "date": (datetime.utcnow() + timedelta(days=30)).isoformat(), "category": "concert",
+        "price": 20, "max_seats": seats
+    }, headers=organizer)
+    body = response.get_json()
+    event_id = body.get("id") or body["event"]["id"]
+    booking_ids = [
+        client.post("/api/bookings", json={"event_id": event_id, "seat_count": 1}, headers=holder)
+        .get_json()["booking"]["id"]
+        for _ in range(seats)
+    ]
+    return event_id, booking_ids
+
+def latency_summary(latencies):
+    latencies = sorted(latencies)
+    return {
+        "promotion_p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "promotion_p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "promotion_p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+    }
+
+def churn(client, holder, booking_ids, interval, started_at):
+    # Cancels one booking every `interval` seconds, recording when each began
+    for booking_id in booking_ids:
+        started_at.append(time.perf_counter())
+        client.delete(f"/api/bookings/{booking_id}", headers=holder)
+        time.sleep(interval)
+
+def run_polling(app, waiters, holder, event_id, booking_ids, args):
+    requests_made = [0]
+    served_at = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def wait_for_seat(headers):
+        client = app.test_client()
+        made = 0
+        while not stop.is_set():
+            made += 1
+            event = client.get(f"/api/events/{event_id}").get_json()
+            if event["available_seats"] > 0:
+                made += 1
+                response = client.post("/api/bookings", json={"event_id": event_id, "seat_count": 1},
+                                       headers=headers)
+                if response.status_code == 201:
+                    with lock:
+                        served_at.append(time.perf_counter())
+                    break
+            stop.wait(args.poll_interval)
+        with lock:
+            requests_made[0] += made
+
+    threads = [threading.Thread(target=wait_for_seat, args=(headers,)) for headers in waiters]
+    for thread in threads:
+        thread.start()
+    cancelled_at = []
+    started = time.perf_counter()
+    churn(app.test_client(), holder, booking_ids, args.churn_interval, cancelled_at)
+    # Give pollers one more interval to notice the last seats
+    time.sleep(args.poll_interval * 2)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    # Seats are interchangeable: the i-th booking filled the i-th freed seat
+    latencies = [served - cancelled for cancelled, served in zip(cancelled_at, sorted(served_at))]
+    return requests_made[0], len(served_at), elapsed, latencies
+
+def run_waitlist(app, waiters, holder, event_id, booking_ids, args):
+    client = app.test_client()
+    for headers in waiters:
+        client.post(f"/api/events/{event_id}/waitlist", json={"seat_count": 1}, headers=headers)
+
+    latencies = []
+    started = time.perf_counter()
+    for booking_id in booking_ids:
+        began = time.perf_counter()
+        client.delete(f"/api/bookings/{booking_id}", headers=holder)
+        # The promotion committed with the cancellation
+        if len(latencies) < len(waiters):
+            latencies.append(time.perf_counter() - began)
+        time.sleep(args.churn_interval)
+    elapsed = time.perf_counter() - started
+
+    from extensions import db
+    from models import Booking, User
+    from sqlalchemy import func, select
+    with app.app_context():
+        promoted = db.session.scalar(
+            select(func.count()).select_from(Booking).join(User, User.id == Booking.user_id)
+            .where(Booking.event_id == event_id, User.email.like("waiter-%"))
+        )
+    return len(waiters), promoted, elapsed, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Polling vs waitlist under cancellation churn")
+    parser.add_argument("--waiters", type=int, default=100)
+    parser.add_argument("--cancellations", type=int, default=200)
+    parser.add_argument("--churn-interval", type=float, default=0.01, help="Seconds between cancellations")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between polls")
+    parser.add_argument("--modes", default="polling,waitlist")
+    args = parser.parse_args()
+
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    configure(db_path)
+    from app import app
+    from extensions import db
+    with app.app_context():
+        db.create_all()
+
+    try:
+        client = app.test_client()
+        organizer = login(client, "organizer@bench", is_organizer=True)
+        holder = login(client, "holder@bench")
+        waiters = [login(client, f"waiter-{i}@bench") for i in range(args.waiters)]
+        for mode in args.modes.split(","):
+            event_id, booking_ids = sold_out_event(client, organizer, holder, args.cancellations, mode)
+            runner = run_polling if mode == "polling" else run_waitlist
+            waiter_requests, promoted, elapsed, latencies = runner(app, waiters, holder, event_id, booking_ids, args)
+            print(json.dumps({
+                "mode": mode,
+                "waiters": args.waiters,
+                "cancellations": args.cancellations,
+                "seats_filled_by_waiters": promoted,
+                "waiter_requests": waiter_requests,
+                "seconds": round(elapsed, 2),
+                **latency_summary(latencies),
+            }), flush=True)
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+if __name__ == "__main__":
+    main()
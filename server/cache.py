@@ -0,0 +1,107 @@
+# server/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+class TTLCache:
+    # Thread-safe LRU with a per-entry time-to-live
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+class CatalogCache:
+    # Serialized event dicts plus pre-encoded JSON pages for GET /api/events.
+    # Entries are dropped on every write path; the TTL bounds staleness for
+    # writes made by other worker processes.
+    def __init__(self):
+        self.events = TTLCache()
+        self.pages = TTLCache()
+
+    def init_app(self, app):
+        maxsize = int(app.config.get("CATALOG_CACHE_SIZE", 1024))
+        ttl = float(app.config.get("CATALOG_CACHE_TTL", 30))
+        self.events = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.pages = TTLCache(maxsize=maxsize, ttl=ttl)
+        app.extensions["catalog_cache"] = self
+
+    def get_event(self, event_id):
+        return self.events.get(event_id)
+
+    def set_event(self, event_id, data):
+        self.events.set(event_id, data)
+
+    def get_page(self, key):
+        return self.pages.get(key)
+
+    def set_page(self, key, page):
+        self.pages.set(key, page)
+
+    def invalidate_event(self, event_id):
+        # Any list page may contain the event, so all pages go
+        self.events.delete(event_id)
+        self.pages.clear()
+
+    def invalidate_events(self, event_ids):
+        for event_id in event_ids:
+            self.events.delete(event_id)
+        self.pages.clear()
+
+    def stats(self):
+        return {"events": self.events.stats(), "pages": self.pages.stats()}
+
+    def collect(self):
+        # Metrics collector, see Metrics.register_collector
+        stats = self.stats()
+        for counter in ("hits", "misses", "evictions"):
+            yield (f"catalog_cache_{counter}_total", "counter", f"Catalog cache {counter}.",
+                   [({"cache": name}, values[counter]) for name, values in stats.items()])
+        yield ("catalog_cache_entries", "gauge", "Entries currently held by the catalog cache.",
+               [({"cache": name}, values["size"]) for name, values in stats.items()])
@@ -0,0 +1,25 @@
+# server/catalog.py
+from datetime import datetime
+from extensions import db
+from models import CatalogVersion
+
+CATALOG_VERSION_ID = 1
+
+def _dialect_insert(model):
+    if db.session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model)
+
+def bump_catalog_version():
+    # Runs in the transaction that deletes or archives events, the only
+    # catalog changes max(id) / max(updated_at) cannot see. Bookings never
+    # come here, so they do not queue on this row. Upserted, so a database
+    # migrated without the row gets it on the first removal.
+    now = datetime.utcnow()
+    stmt = _dialect_insert(CatalogVersion).values(id=CATALOG_VERSION_ID, version=1, updated_at=now)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[CatalogVersion.id],
+        set_={"version": CatalogVersion.version + 1, "updated_at": now}
+    ))
@@ -0,0 +1,37 @@
+# server/conditional.py
+from datetime import timezone
+from flask import request, current_app
+
+def _http_date(value):
+    # HTTP dates carry whole seconds only
+    return value.replace(tzinfo=timezone.utc, microsecond=0) if value else None
+
+def make_etag(*parts):
+    # Strong ETag built from version markers, e.g. make_etag("event", 7, 12)
+    return "-".join(
+        part.strftime("%Y%m%d%H%M%S%f") if hasattr(part, "strftime") else str(part)
+        for part in parts
+    )
+
+def apply_validators(response, etag, last_modified=None, private=False):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = _http_date(last_modified)
+    # Let browsers keep the body but revalidate it on every navigation
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    return response
+
+def validators_match(if_none_match, if_modified_since, etag, last_modified=None):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if if_none_match:
+        return if_none_match.contains(etag)
+    if if_modified_since and last_modified:
+        return _http_date(last_modified) <= if_modified_since
+    return False
+
+def not_modified(etag, last_modified=None, private=False):
+    # Returns a 304 when the client's validators still match, otherwise None
+    if not validators_match(request.if_none_match, request.if_modified_since, etag, last_modified):
+        return None
+    response = current_app.response_class(status=304)
+    return apply_validators(response, etag, last_modified, private)
@@ -0,0 +1,51 @@
+# server/export.py
+import zlib
+from flask import Response, request, stream_with_context
+from extensions import db
+from serializers import encode_ndjson, encode_csv
+
+# Rows fetched per round trip; peak memory is one batch regardless of table size
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def stream_export(stmt, fmt, filename):
+    # yield_per switches to a server-side cursor where the driver has one
+    # (psycopg2), and fetches in batches everywhere else
+    compress = (
+        request.args.get("gzip", "true").lower() != "false"
+        and "gzip" in request.accept_encodings
+    )
+
+    def generate():
+        compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip framing
+        result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        keys = list(result.keys())
+        first = True
+
+        for rows in result.partitions():
+            if fmt == "csv":
+                chunk = encode_csv(keys, rows, header=first)
+            else:
+                chunk = encode_ndjson(keys, rows)
+            first = False
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+        if fmt == "csv" and first:
+            chunk = encode_csv(keys, [], header=True)
+            yield compressor.compress(chunk) if compressor else chunk
+        if compressor:
+            yield compressor.flush()
+
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Vary"] = "Accept-Encoding"
+    return response
@@ -1,8 +1,24 @@
 # server/extensions.py
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
+from cache import CatalogCache
+from hashing import PasswordHasher
+from live import LiveHub
+from metrics import Metrics
+from outbox_worker import OutboxWorker
+from ratelimit import RateLimiter
+from reaper import HoldReaper
+from routing import ReplicaRouter, RoutingSession
+from tokens import RevokingJWTManager
 
-db = SQLAlchemy()
-migrate = Migrate()
-jwt = JWTManager()
\ No newline at end of file
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+migrate = Migrate(render_as_batch=True)
+jwt = RevokingJWTManager()
+catalog_cache = CatalogCache()
+password_hasher = PasswordHasher()
+metrics = Metrics()
+replica_router = ReplicaRouter()
+hold_reaper = HoldReaper()
+outbox_worker = OutboxWorker()
+rate_limiter = RateLimiter()
+live_hub = LiveHub()
\ No newline at end of file
@@ -0,0 +1,83 @@
+# server/hashing.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_HASH_METHOD = "scrypt:32768:8:1"
+
+class HashingBusy(Exception):
+    # Raised instead of queueing when every hashing slot is taken
+    pass
+
+class PasswordHasher:
+    # Runs password hashing and verification on a dedicated process pool so a
+    # login storm cannot pin the request threads on CPU. At most
+    # queue_limit operations are admitted at once; beyond that callers get
+    # HashingBusy immediately and the route answers 503.
+    def __init__(self):
+        self.method = DEFAULT_HASH_METHOD
+        self.pool_size = 0
+        self.timeout = 10.0
+        self._slots = threading.BoundedSemaphore(8)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", DEFAULT_HASH_METHOD)
+        # 0 hashes inline on the request thread (tests, one-off scripts)
+        self.pool_size = int(app.config.get("HASH_POOL_SIZE", max(1, (os.cpu_count() or 2) // 2)))
+        queue_limit = int(app.config.get("HASH_QUEUE_LIMIT", max(1, self.pool_size) * 4))
+        self.timeout = float(app.config.get("HASH_TIMEOUT", 10.0))
+        self._slots = threading.BoundedSemaphore(queue_limit)
+        app.extensions["password_hasher"] = self
+
+    def _executor(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn: forking a threaded server process is unsafe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.pool_size,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._pool
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        if self.pool_size <= 0:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the work is finished or cancelled, not until
+        # the caller gives up, so abandoned hashes still count against the limit
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Drops it if still queued; one already running keeps its slot
+            future.cancel()
+            raise HashingBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        # Stored hashes start with their method and parameters, e.g. "scrypt:32768:8:1$..."
+        return password_hash.split("$", 1)[0] != self.method
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
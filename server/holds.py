@@ -0,0 +1,146 @@
+# server/holds.py
+from collections import Counter
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import delete, select
+from extensions import db, catalog_cache
+from models import Booking, SeatHold
+from reservations import current_available_seats, reserve_seats, release_seats, run_with_retry
+from stats import record_bookings
+from waitlist import promote_waitlist
+from outbox import enqueue_outbox
+
+DEFAULT_HOLD_TTL = 600  # seconds
+REAP_BATCH_SIZE = 500
+
+class HoldNotFound(Exception):
+    pass
+
+class HoldExpired(Exception):
+    pass
+
+class HoldForbidden(Exception):
+    pass
+
+def create_hold(user_id, event_id, seat_count, ttl=None):
+    # Seats come off Event.available_seats with the same conditional UPDATE
+    # as a booking, so the catalog count already excludes held seats
+    ttl = ttl or current_app.config.get("HOLD_TTL_SECONDS", DEFAULT_HOLD_TTL)
+
+    def hold():
+        available_seats = reserve_seats(event_id, seat_count)
+        seat_hold = SeatHold(
+            user_id=user_id,
+            event_id=event_id,
+            seat_count=seat_count,
+            expires_at=datetime.utcnow() + timedelta(seconds=ttl)
+        )
+        db.session.add(seat_hold)
+        db.session.flush()
+        return seat_hold, available_seats
+
+    return run_with_retry(hold, immediate=True)
+
+def _explain_missing(hold_id, user_id):
+    # The conditional DELETE matched nothing; work out why for the caller
+    seat_hold = db.session.get(SeatHold, hold_id)
+    if seat_hold is None:
+        raise HoldNotFound()
+    if seat_hold.user_id != user_id:
+        raise HoldForbidden()
+    raise HoldExpired()
+
+def confirm_hold(hold_id, user_id):
+    # Turns a live hold into a booking. The seats were taken when the hold
+    # was created, so this only swaps the hold row for a booking row.
+    def confirm():
+        held = db.session.execute(
+            delete(SeatHold)
+            .where(SeatHold.id == hold_id, SeatHold.user_id == user_id,
+                   SeatHold.expires_at > datetime.utcnow())
+            .returning(SeatHold.event_id, SeatHold.seat_count)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if held is None:
+            _explain_missing(hold_id, user_id)
+        booking = Booking(user_id=user_id, event_id=held.event_id, seat_count=held.seat_count)
+        db.session.add(booking)
+        db.session.flush()
+        record_bookings([(held.event_id, held.seat_count, booking.booking_date.date(), 1)])
+        enqueue_outbox("booking.created", [{"booking_id": booking.id, "user_id": user_id,
+                                            "event_id": held.event_id, "seat_count": held.seat_count}])
+        # Serialized before the commit expires it, which would cost a reload
+        return booking.to_dict(), current_available_seats(held.event_id)
+
+    return run_with_retry(confirm, immediate=True)
+
+def release_hold(hold_id, user_id):
+    # Gives the seats back early; returns (event_id, available_seats)
+    def release():
+        held = db.session.execute(
+            delete(SeatHold)
+            .where(SeatHold.id == hold_id, SeatHold.user_id == user_id)
+            .returning(SeatHold.event_id, SeatHold.seat_count)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if held is None:
+            _explain_missing(hold_id, user_id)
+        release_seats(held.event_id, held.seat_count)
+        _, available_seats = promote_waitlist(held.event_id)
+        return held.event_id, available_seats
+
+    return run_with_retry(release, immediate=True)
+
+def reap_expired_holds(batch_size=REAP_BATCH_SIZE, now=None):
+    # Deletes expired holds oldest first, batch_size rows per transaction,
+    # and returns their seats with one UPDATE per event, offering them to the
+    # event's waitlist. Safe to run from several processes: only the rows a
+    # DELETE actually removed are released.
+    # Returns {event_id: seats released}.
+    now = now or datetime.utcnow()
+    released = Counter()
+
+    def reap_batch():
+        expired = (
+            select(SeatHold.id)
+            .where(SeatHold.expires_at <= now)
+            .order_by(SeatHold.expires_at)
+            .limit(batch_size)
+        )
+        rows = db.session.execute(
+            delete(SeatHold)
+            .where(SeatHold.id.in_(expired.scalar_subquery()))
+            .returning(SeatHold.event_id, SeatHold.seat_count)
+            .execution_options(synchronize_session=False)
+        ).all()
+        per_event = Counter()
+        for event_id, seat_count in rows:
+            per_event[event_id] += seat_count
+        for event_id, seat_count in per_event.items():
+            release_seats(event_id, seat_count)
+            promote_waitlist(event_id)
+        return len(rows), per_event
+
+    while True:
+        reaped, per_event = run_with_retry(reap_batch, immediate=True)
+        released.update(per_event)
+        if reaped < batch_size:
+            return released
+
+def clear_event_holds(event_id):
+    # The event is going away, so its held seats need no release
+    db.session.execute(
+        delete(SeatHold).where(SeatHold.event_id == event_id).execution_options(synchronize_session=False)
+    )
+
+holds_cli = AppGroup("holds", help="Seat hold commands.")
+
+@holds_cli.command("reap")
+@click.option("--batch-size", default=REAP_BATCH_SIZE, show_default=True)
+def reap_holds_command(batch_size):
+    """Release the seats of every expired hold."""
+    released = reap_expired_holds(batch_size)
+    catalog_cache.invalidate_events(set(released))
+    click.echo(f"Released {sum(released.values())} seats across {len(released)} events")
@@ -0,0 +1,237 @@
+# server/live.py
+import json
+import threading
+import time
+from collections import deque
+
+class LiveHubFull(Exception):
+    pass
+
+class Subscription:
+    # One connection's view of an event: a bounded buffer of encoded SSE
+    # messages and a wake() callback supplied by the consumer (a
+    # threading.Event for WSGI, the event loop for ASGI). Only the latest
+    # seat count matters, so a full buffer drops its oldest message.
+    __slots__ = ("event_id", "messages", "closed", "last_active", "opened_at", "_wake")
+
+    def __init__(self, event_id, buffer_size, wake):
+        self.event_id = event_id
+        self.messages = deque(maxlen=buffer_size)
+        self.closed = False
+        self.last_active = self.opened_at = time.monotonic()
+        self._wake = wake
+
+    def push(self, message):
+        # Returns True when an undelivered message was dropped to make room
+        dropped = len(self.messages) == self.messages.maxlen
+        self.messages.append(message)
+        self._wake()
+        return dropped
+
+    def close(self):
+        self.closed = True
+        self._wake()
+
+    def drain(self):
+        self.last_active = time.monotonic()
+        drained = []
+        while True:
+            try:
+                drained.append(self.messages.popleft())
+            except IndexError:
+                return drained
+
+class _Topic:
+    __slots__ = ("version", "subscribers")
+
+    def __init__(self, version):
+        self.version = version
+        self.subscribers = set()
+
+def encode_message(event_id, version, available_seats, max_seats):
+    data = json.dumps({"event_id": event_id, "available_seats": available_seats, "max_seats": max_seats})
+    return f"id: {version}\nevent: seats\ndata: {data}\n\n".encode()
+
+def encode_deleted(event_id):
+    return f"event: deleted\ndata: {json.dumps({'event_id': event_id})}\n\n".encode()
+
+class LiveHub:
+    # In-process pub/sub behind GET /api/events/<id>/live. Writers call
+    # publish(event_id) after committing, which only marks the event dirty.
+    # One flusher thread wakes every LIVE_COALESCE_SECONDS, reads the state
+    # of all dirty events in one query and encodes each message once for
+    # every subscriber of that event, so a burst of bookings costs one read
+    # and one message per window however many clients listen. Every
+    # LIVE_POLL_INTERVAL seconds it also re-reads the watched events, which
+    # picks up writes made by other worker processes. Subscribers that stop
+    # draining for LIVE_IDLE_TIMEOUT seconds are evicted.
+    def __init__(self):
+        self.coalesce_seconds = 0.25
+        self.poll_interval = 2.0
+        self.heartbeat_seconds = 15.0
+        self.idle_timeout = 60.0
+        self.max_connection_seconds = 600.0
+        self.max_subscribers = 10000
+        self.buffer_size = 8
+        self.subscribers = 0
+        self.messages_total = 0
+        self.dropped_total = 0
+        self.evicted_total = 0
+        self.flushes_total = 0
+        self._app = None
+        self._topics = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self.coalesce_seconds = float(app.config.get("LIVE_COALESCE_SECONDS", 0.25))
+        self.poll_interval = float(app.config.get("LIVE_POLL_INTERVAL", 2.0))
+        self.heartbeat_seconds = float(app.config.get("LIVE_HEARTBEAT_SECONDS", 15))
+        self.idle_timeout = float(app.config.get("LIVE_IDLE_TIMEOUT", 60))
+        self.max_connection_seconds = float(app.config.get("LIVE_MAX_CONNECTION_SECONDS", 600))
+        self.max_subscribers = int(app.config.get("LIVE_MAX_SUBSCRIBERS", 10000))
+        self.buffer_size = int(app.config.get("LIVE_BUFFER_MESSAGES", 8))
+        self._app = app
+        app.extensions["live_hub"] = self
+
+    def subscribe(self, event_id, version, wake):
+        # Raises LiveHubFull past LIVE_MAX_SUBSCRIBERS connections
+        subscription = Subscription(event_id, self.buffer_size, wake)
+        with self._lock:
+            if self.subscribers >= self.max_subscribers:
+                raise LiveHubFull()
+            topic = self._topics.get(event_id)
+            if topic is None:
+                topic = self._topics[event_id] = _Topic(version)
+            topic.subscribers.add(subscription)
+            self.subscribers += 1
+        self._ensure_started()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            topic = self._topics.get(subscription.event_id)
+            if topic is None or subscription not in topic.subscribers:
+                return
+            topic.subscribers.discard(subscription)
+            self.subscribers -= 1
+            if not topic.subscribers:
+                del self._topics[subscription.event_id]
+
+    def publish(self, event_id):
+        # Cheap enough for request handlers: nothing happens unless someone listens
+        if event_id in self._topics:
+            with self._lock:
+                self._dirty.add(event_id)
+
+    def expired(self, subscription, now):
+        return now - subscription.opened_at >= self.max_connection_seconds
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="live-hub", daemon=True)
+                    self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        last_poll = time.monotonic()
+        while not self._stop.wait(self.coalesce_seconds):
+            now = time.monotonic()
+            poll = self.poll_interval > 0 and now - last_poll >= self.poll_interval
+            if poll:
+                last_poll = now
+            try:
+                with self._app.app_context():
+                    self.flush(poll)
+                self._evict_idle(now)
+            except Exception as e:
+                self._app.logger.error(f"Live hub flush error: {str(e)}")
+
+    def flush(self, poll=False):
+        # Sends what changed since the last flush; poll=True checks every
+        # watched event instead of only the published ones
+        from sqlalchemy import select
+        from extensions import db
+        from models import Event
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            if poll:
+                dirty.update(self._topics)
+            dirty = [event_id for event_id in dirty if event_id in self._topics]
+        if not dirty:
+            return
+        self.flushes_total += 1
+        found = set()
+        for start in range(0, len(dirty), 500):
+            rows = db.session.execute(
+                select(Event.id, Event.version, Event.available_seats, Event.max_seats)
+                .where(Event.id.in_(dirty[start:start + 500]))
+            ).all()
+            for event_id, version, available_seats, max_seats in rows:
+                found.add(event_id)
+                with self._lock:
+                    topic = self._topics.get(event_id)
+                    if topic is None or topic.version == version:
+                        continue
+                    topic.version = version
+                    subscribers = list(topic.subscribers)
+                self._fan_out(subscribers, encode_message(event_id, version, available_seats, max_seats))
+        for event_id in set(dirty) - found:
+            # Deleted: tell the clients, then close their streams
+            with self._lock:
+                topic = self._topics.get(event_id)
+                subscribers = list(topic.subscribers) if topic is not None else []
+            self._fan_out(subscribers, encode_deleted(event_id), close=True)
+
+    def _fan_out(self, subscribers, message, close=False):
+        # Pushes outside the lock: subscribe/unsubscribe never wait on wake()
+        for subscription in subscribers:
+            if subscription.push(message):
+                self.dropped_total += 1
+            self.messages_total += 1
+            if close:
+                subscription.close()
+
+    def _evict_idle(self, now):
+        # A consumer that stopped draining (its client hung without closing
+        # the socket) would otherwise hold its slot forever
+        with self._lock:
+            subscriptions = [subscription for topic in self._topics.values() for subscription in topic.subscribers]
+        stale = [subscription for subscription in subscriptions if now - subscription.last_active > self.idle_timeout]
+        for subscription in stale:
+            subscription.close()
+            self.unsubscribe(subscription)
+        self.evicted_total += len(stale)
+
+    def stream(self, subscription, ready, first_message):
+        # WSGI body for a subscription made with wake=ready.set. Blocks its
+        # worker thread between messages, sends a comment line as heartbeat
+        # and ends after LIVE_MAX_CONNECTION_SECONDS so EventSource
+        # reconnects (possibly to a less busy worker).
+        try:
+            yield b"retry: 3000\n\n" + first_message
+            while not subscription.closed:
+                ready.wait(self.heartbeat_seconds)
+                ready.clear()
+                messages = subscription.drain()
+                if self.expired(subscription, time.monotonic()):
+                    return
+                yield b"".join(messages) if messages else b": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def collect(self):
+        # Metrics collector, see Metrics.register_collector
+        yield "live_subscribers", "gauge", "Open live availability streams.", [({}, self.subscribers)]
+        yield "live_events_watched", "gauge", "Events with at least one live subscriber.", [({}, len(self._topics))]
+        yield "live_flushes_total", "counter", "Live hub flushes that read event state.", [({}, self.flushes_total)]
+        yield "live_messages_total", "counter", "Messages queued to live subscribers.", [({}, self.messages_total)]
+        yield ("live_messages_dropped_total", "counter", "Messages superseded in a full subscriber buffer.",
+               [({}, self.dropped_total)])
+        yield "live_evicted_total", "counter", "Live subscribers evicted for not draining.", [({}, self.evicted_total)]
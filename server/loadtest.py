@@ -0,0 +1,170 @@
+# server/loadtest.py
+# Mixed read/write load against a throwaway SQLite database, once per DB_PROFILE:
+#   python loadtest.py --profile all --processes 4 --threads 8 --seconds 10
+# Several processes share the database file the way gunicorn workers would.
+# Prints one JSON object per profile with read/write throughput and errors.
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def configure(db_path, profile):
+    os.environ["DATABASE_URI"] = f"sqlite:///{db_path}"
+    os.environ["DB_PROFILE"] = profile
+    os.environ.setdefault("SECRET_KEY", "loadtest-secret-key-not-for-production")
+    # Cheap inline hashing: login cost is not what is being measured here
+    os.environ["HASH_POOL_SIZE"] = "0"
+    os.environ["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+    # Every simulated user shares one address; throughput is the point here
+    os.environ["RATELIMIT_ENABLED"] = "0"
+
+def prepare(db_path, profile, events):
+    configure(db_path, profile)
+    from app import app
+    from extensions import db
+    from models import Event, User
+    from sqlalchemy import insert
+
+    with app.app_context():
+        db.create_all()
+        organizer = User(email="organizer@loadtest", name="Organizer", is_organizer=True)
+        organizer.set_password("loadtest")
+        db.session.add(organizer)
+        db.session.flush()
+        now = datetime.utcnow()
+        db.session.execute(insert(Event), [{
+            "title": f"Load test event {i}", "description": "Load test", "location": "Paris",
+            "date": now + timedelta(days=i % 365 + 1), "category": "conference", "price": 10,
+            "max_seats": 1_000_000, "available_seats": 1_000_000, "organizer_id": organizer.id
+        } for i in range(events)])
+        db.session.commit()
+
+def run_worker(db_path, profile, threads, seconds, write_ratio, events, worker_id):
+    configure(db_path, profile)
+    from app import app
+
+    client = app.test_client()
+    tokens = []
+    for i in range(threads):
+        email = f"user{worker_id}-{i}@loadtest"
+        client.post("/api/auth/register", json={"email": email, "password": "loadtest", "name": email})
+        response = client.post("/api/auth/login", json={"email": email, "password": "loadtest"})
+        tokens.append({"Authorization": f"Bearer {response.get_json()['access_token']}"})
+
+    counts = {"reads": 0, "writes": 0, "errors": 0, "server_errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(headers):
+        client = app.test_client()
+        local = dict.fromkeys(counts, 0)
+        rng = random.Random()
+        while time.perf_counter() < deadline:
+            event_id = rng.randint(1, events)
+            if rng.random() < write_ratio:
+                response = client.post("/api/bookings", json={"event_id": event_id, "seat_count": 1}, headers=headers)
+                if response.status_code == 201:
+                    booking_id = response.get_json()["booking"]["id"]
+                    response = client.delete(f"/api/bookings/{booking_id}", headers=headers)
+                kind = "writes"
+            elif rng.random() < 0.5:
+                response = client.get("/api/events", query_string={"limit": 20})
+                kind = "reads"
+            else:
+                response = client.get(f"/api/events/{event_id}")
+                kind = "reads"
+            if response.status_code < 400:
+                local[kind] += 1
+            else:
+                local["errors"] += 1
+                if response.status_code >= 500:
+                    local["server_errors"] += 1
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    workers = [threading.Thread(target=worker, args=(headers,)) for headers in tokens]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return counts
+
+def run_profile(profile, processes, threads, seconds, write_ratio, events):
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    # Seeded in a child so this process never opens the database itself
+    subprocess.run([sys.executable, __file__, "--prepare", db_path, "--profile", profile,
+                    "--events", str(events)], check=True, cwd=HERE)
+
+    started = time.perf_counter()
+    children = [
+        subprocess.Popen([
+            sys.executable, __file__, "--worker", db_path, "--worker-id", str(i), "--profile", profile,
+            "--threads", str(threads), "--seconds", str(seconds),
+            "--write-ratio", str(write_ratio), "--events", str(events)
+        ], cwd=HERE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for i in range(processes)
+    ]
+    totals = {"reads": 0, "writes": 0, "errors": 0, "server_errors": 0}
+    for child in children:
+        output, _ = child.communicate()
+        for key, value in json.loads(output.strip().splitlines()[-1]).items():
+            totals[key] += value
+    # Includes worker start-up and login; the timed window itself is `seconds`
+    elapsed = time.perf_counter() - started
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    return {
+        "profile": profile,
+        "processes": processes,
+        "threads": threads,
+        "seconds": seconds,
+        "wall_seconds": round(elapsed, 2),
+        "reads_per_second": round(totals["reads"] / seconds, 1),
+        # Each write is a booking plus its cancellation
+        "writes_per_second": round(totals["writes"] / seconds, 1),
+        "errors": totals["errors"],
+        "server_errors": totals["server_errors"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed read/write load test per DB_PROFILE")
+    parser.add_argument("--profile", default="all", help="default, production or all")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8, help="Threads per process")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--prepare", help=argparse.SUPPRESS)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-id", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.prepare:
+        prepare(args.prepare, args.profile, args.events)
+        return
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.profile, args.threads, args.seconds,
+                                    args.write_ratio, args.events, args.worker_id)))
+        return
+
+    from sqlite_profile import PROFILES
+    profiles = list(PROFILES) if args.profile == "all" else [args.profile]
+    for profile in profiles:
+        print(json.dumps(run_profile(profile, args.processes, args.threads, args.seconds,
+                                     args.write_ratio, args.events)), flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# server/metrics.py
+import hmac
+import threading
+import time
+from collections import defaultdict
+from flask import current_app, g, request, has_app_context
+from sqlalchemy import event as sa_event
+
+# Latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Longest SQL statement kept in the slow-request log
+MAX_LOGGED_STATEMENT = 500
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def query_budget(limit):
+    # Overrides QUERY_BUDGET for one view; place it directly under the route decorator
+    def decorator(view):
+        view._query_budget = limit
+        return view
+    return decorator
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    # Per-endpoint request metrics, served in Prometheus text format on /metrics.
+    # Endpoints are labelled by URL rule, not raw path, to bound cardinality.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)     # (endpoint, method, status)
+        self._errors = defaultdict(int)       # (endpoint, method)
+        self._latency = defaultdict(_Histogram)
+        self._sql_queries = defaultdict(int)
+        self._sql_seconds = defaultdict(float)
+        self._response_bytes = defaultdict(int)
+        self._collectors = []
+        self.slow_request_seconds = 1.0
+        self.query_budget = None
+        self.token = None
+
+    def init_app(self, app):
+        self.slow_request_seconds = float(app.config.get("SLOW_REQUEST_MS", 1000)) / 1000
+        # When set (CI / test runs), any request issuing more SQL statements
+        # than its budget fails loudly instead of silently regressing
+        self.query_budget = app.config.get("QUERY_BUDGET")
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        # /metrics exposes internal counters, so it only exists with
+        # METRICS_ENABLED; METRICS_TOKEN further requires it as a bearer token
+        self.token = app.config.get("METRICS_TOKEN")
+        if app.config.get("METRICS_ENABLED"):
+            app.add_url_rule("/metrics", "metrics", self.metrics_view)
+        with app.app_context():
+            from extensions import db
+            # Every bind, so statements sent to read replicas are counted too
+            for engine in db.engines.values():
+                sa_event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+                sa_event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        app.extensions["metrics"] = self
+
+    def register_collector(self, collector):
+        # collector() yields (name, type, help, [(labels, value), ...])
+        self._collectors.append(collector)
+
+    # Per-request bookkeeping lives on flask.g, which is context-local
+
+    def _before_request(self):
+        g._metrics_start = time.perf_counter()
+        g._metrics_sql_count = 0
+        g._metrics_sql_seconds = 0.0
+        g._metrics_statements = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_app_context() and "_metrics_start" in g:
+            g._metrics_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_app_context() and "_metrics_query_start" in g:
+            elapsed = time.perf_counter() - g.pop("_metrics_query_start")
+            g._metrics_sql_count += 1
+            g._metrics_sql_seconds += elapsed
+            g._metrics_statements.append((elapsed, statement[:MAX_LOGGED_STATEMENT]))
+
+    def _after_request(self, response):
+        if "_metrics_start" not in g:
+            return response
+        elapsed = time.perf_counter() - g._metrics_start
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        key = (endpoint, request.method)
+        # Streaming responses have no length up front
+        size = response.content_length if not response.is_streamed else None
+
+        with self._lock:
+            self._requests[key + (response.status_code,)] += 1
+            if response.status_code >= 500:
+                self._errors[key] += 1
+            self._latency[key].observe(elapsed)
+            self._sql_queries[key] += g._metrics_sql_count
+            self._sql_seconds[key] += g._metrics_sql_seconds
+            if size:
+                self._response_bytes[key] += size
+
+        if elapsed >= self.slow_request_seconds:
+            statements = "\n".join(
+                f"  [{duration * 1000:.1f} ms] {statement}"
+                for duration, statement in g._metrics_statements
+            )
+            current_app.logger.warning(
+                f"Slow request {request.method} {request.path}: {elapsed * 1000:.0f} ms, "
+                f"{g._metrics_sql_count} queries, {g._metrics_sql_seconds * 1000:.1f} ms SQL\n{statements}"
+            )
+
+        # Checked once: the error response for a violation passes through here again
+        if self.query_budget is not None and not g.pop("_metrics_budget_checked", False):
+            g._metrics_budget_checked = True
+            view = current_app.view_functions.get(request.endpoint)
+            budget = getattr(view, "_query_budget", self.query_budget)
+            if g._metrics_sql_count > budget:
+                statements = "\n".join(statement for _, statement in g._metrics_statements)
+                raise QueryBudgetExceeded(
+                    f"{request.method} {endpoint} issued {g._metrics_sql_count} queries "
+                    f"(budget {budget}):\n{statements}"
+                )
+        return response
+
+    def _families(self):
+        with self._lock:
+            requests = [({"endpoint": e, "method": m, "status": s}, v) for (e, m, s), v in self._requests.items()]
+            errors = [({"endpoint": e, "method": m}, v) for (e, m), v in self._errors.items()]
+            sql_queries = [({"endpoint": e, "method": m}, v) for (e, m), v in self._sql_queries.items()]
+            sql_seconds = [({"endpoint": e, "method": m}, v) for (e, m), v in self._sql_seconds.items()]
+            response_bytes = [({"endpoint": e, "method": m}, v) for (e, m), v in self._response_bytes.items()]
+            latency = [
+                ({"endpoint": e, "method": m}, list(h.buckets), h.sum, h.count)
+                for (e, m), h in self._latency.items()
+            ]
+
+        yield "http_requests_total", "counter", "Requests handled.", requests
+        yield "http_request_errors_total", "counter", "Requests answered with a 5xx status.", errors
+        yield "http_request_sql_queries_total", "counter", "SQL statements issued while handling requests.", sql_queries
+        yield "http_request_sql_seconds_total", "counter", "Time spent in SQL while handling requests.", sql_seconds
+        yield "http_response_size_bytes_total", "counter", "Response body bytes sent (non-streamed).", response_bytes
+        yield "http_request_duration_seconds", "histogram", "Request latency.", latency
+
+        for collector in self._collectors:
+            yield from collector()
+
+    def render(self):
+        lines = []
+        for name, kind, help_text, samples in self._families():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for labels, buckets, total, count in samples:
+                    cumulative = 0
+                    for bound, bucket in zip(LATENCY_BUCKETS, buckets):
+                        cumulative += bucket
+                        lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {total}")
+                    lines.append(f"{name}_count{_labels(labels)} {count}")
+            else:
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def metrics_view(self):
+        if self.token and not hmac.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {self.token}"
+        ):
+            return current_app.response_class("Unauthorized\n", status=401, mimetype="text/plain")
+        return current_app.response_class(self.render(), mimetype="text/plain; version=0.0.4")
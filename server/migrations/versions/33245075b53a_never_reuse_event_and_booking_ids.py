@@ -0,0 +1,45 @@
+"""Never reuse event and booking ids
+
+Revision ID: 33245075b53a
+Revises: 63bcd9bc0f99
+Create Date: 2026-10-18 22:26:39.402310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '33245075b53a'
+down_revision = '63bcd9bc0f99'
+branch_labels = None
+depends_on = None
+
+# Hot table -> archive table sharing its ids
+TABLES = (('events', 'events_archive'), ('bookings', 'bookings_archive'))
+
+
+def upgrade():
+    # Without AUTOINCREMENT SQLite hands out max(id) + 1, so once the newest
+    # rows are deleted an id already moved to the archive comes back. The
+    # flag can only be set by rebuilding the table. Other databases use
+    # sequences, which never go backwards.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, archive in TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        # Continue after every id handed out so far, archived ones included
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', max("
+            f"coalesce((SELECT max(id) FROM {table}), 0), coalesce((SELECT max(id) FROM {archive}), 0))"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table, _ in reversed(TABLES):
+        with op.batch_alter_table(table, recreate='always'):
+            pass
@@ -1,6 +1,6 @@
-from werkzeug.security import generate_password_hash, check_password_hash
-from extensions import db
+from extensions import db, password_hasher
 from datetime import datetime
+from sqlalchemy import event as sa_event
 
 class User(db.Model):
     __tablename__ = 'users'  # Explicit table name (good practice)
@@ -12,21 +12,35 @@ class User(db.Model):
     is_organizer = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Use UTC
     
-    # Relationship to events
-    events = db.relationship('Event', backref='organizer', lazy=True)
+    # Relationship to events. Collections never load implicitly: callers use
+    # selectinload() or the count/exists helpers in queries.py
+    events = db.relationship('Event', backref='organizer', lazy='raise_on_sql')
 
     def get_id(self):
         return str(self.id)
 
+    # Hashing runs on the bounded pool in hashing.py and may raise HashingBusy
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
 
 # models.py (updated Event model)
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # Listing indexes: every GET /api/events page is a range scan on one of these
+        db.Index('ix_events_date_id', 'date', 'id'),
+        db.Index('ix_events_category_date', 'category', 'date'),
+        db.Index('ix_events_organizer_date', 'organizer_id', 'date'),
+        # Ids are never handed out twice, so they stay unique across
+        # events and events_archive (see archive.py)
+        {'sqlite_autoincrement': True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
@@ -40,9 +54,18 @@ class Event(db.Model):
     category = db.Column(db.String(50), nullable=False)  # Made non-nullable
     image = db.Column(db.String(255), nullable=True)  # Added for event images
     price = db.Column(db.Numeric(10, 2), nullable=False)  # Added for ticket price
+    # Bumped on every write; ETags and Last-Modified are derived from these
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # Indexed for the catalog ETag's max(updated_at) probe
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # 0: bookings decrement available_seats. N > 0: the free seats live in N
+    # EventSeatShard rows and available_seats is a cached sum of them.
+    seat_shards = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
-    bookings = db.relationship('Booking', backref='event', lazy=True, cascade="all, delete")
+    # passive_deletes: deleting an event does not load its bookings first
+    bookings = db.relationship('Booking', backref='event', lazy='raise_on_sql',
+                               cascade="all, delete", passive_deletes=True)
 
     def __repr__(self):
         return f'<Event {self.title}>'
@@ -63,17 +86,35 @@ class Event(db.Model):
             'price': float(self.price) if self.price else 0.0  # Convert Decimal to float
         }
 
+@sa_event.listens_for(Event, 'before_update')
+def bump_event_version(mapper, connection, target):
+    # ORM updates; the Core seat UPDATEs in reservations.py bump it themselves
+    target.version = Event.version + 1
+
+# A single row counting event removals (deletes and archive moves), bumped
+# in the removing transaction (see catalog.py). Inserts, edits and seat
+# changes already move max(id) / max(updated_at) of events; removals move
+# neither, so the catalog ETag reads this counter alongside them.
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_version'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    # As for events: archived booking ids must never come back
+    __table_args__ = {'sqlite_autoincrement': True}
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
     seat_count = db.Column(db.Integer, nullable=False)
     booking_date = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Define relationships
-    user = db.relationship('User', backref=db.backref('bookings', lazy=True))
+    user = db.relationship('User', backref=db.backref('bookings', lazy='raise_on_sql'), lazy='raise_on_sql')
     
     def to_dict(self):
         return {
@@ -82,4 +123,166 @@ class Booking(db.Model):
             'event_id': self.event_id,
             'seat_count': self.seat_count,
             'booking_date': self.booking_date.isoformat()
-        }
\ No newline at end of file
+        }
+
+# Access tokens revoked by POST /api/auth/logout, kept until they expire
+# (see tokens.py)
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+# Past events and their bookings, moved out of the hot tables in batches by
+# `flask archive run` (see archive.py) and only ever read afterwards, via
+# ?include_past=true. Rows keep their original ids, which the hot tables
+# never reuse (AUTOINCREMENT on SQLite, sequences elsewhere).
+class ArchivedEvent(db.Model):
+    __tablename__ = 'events_archive'
+    __table_args__ = (
+        db.Index('ix_events_archive_date_id', 'date', 'id'),
+        db.Index('ix_events_archive_category_date', 'category', 'date'),
+        db.Index('ix_events_archive_organizer_date', 'organizer_id', 'date'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(120), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    date = db.Column(db.DateTime, nullable=False)
+    location = db.Column(db.String(120), nullable=False)
+    max_seats = db.Column(db.Integer, nullable=False)
+    available_seats = db.Column(db.Integer, nullable=False)
+    organizer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_at = db.Column(db.DateTime)
+    category = db.Column(db.String(50), nullable=False)
+    image = db.Column(db.String(255), nullable=True)
+    price = db.Column(db.Numeric(10, 2), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class ArchivedBooking(db.Model):
+    __tablename__ = 'bookings_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events_archive.id'), nullable=False, index=True)
+    seat_count = db.Column(db.Integer, nullable=False)
+    booking_date = db.Column(db.DateTime)
+
+# One slice of a hot event's free seats, so concurrent bookings update
+# different rows instead of queueing on the event row (see reservations.py)
+class EventSeatShard(db.Model):
+    __tablename__ = 'event_seat_shards'
+
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True)
+    available_seats = db.Column(db.Integer, nullable=False)
+
+# Seats set aside for a user while they confirm; the seats are already taken
+# off Event.available_seats and go back when the hold expires (see holds.py)
+class SeatHold(db.Model):
+    __tablename__ = 'seat_holds'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
+    seat_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # The reaper scans this index for expired holds
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'event_id': self.event_id,
+            'seat_count': self.seat_count,
+            'expires_at': self.expires_at.isoformat()
+        }
+
+# Users waiting for seats on a sold-out event, served in id order (see waitlist.py)
+class WaitlistEntry(db.Model):
+    __tablename__ = 'waitlist_entries'
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'user_id', name='uq_waitlist_event_user'),
+        # Promotion reads the head of one event's queue
+        db.Index('ix_waitlist_event_id', 'event_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    seat_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'event_id': self.event_id,
+            'seat_count': self.seat_count,
+            'created_at': self.created_at.isoformat()
+        }
+
+# Messages written in the same transaction as the change they announce and
+# delivered afterwards by the outbox worker (see outbox.py), so a side
+# effect never runs for a rolled back change
+class OutboxMessage(db.Model):
+    __tablename__ = 'outbox_messages'
+    __table_args__ = (
+        # Claiming scans pending rows that are due
+        db.Index('ix_outbox_status_available', 'status', 'available_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(80), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # pending -> done, or dead once out of attempts
+    status = db.Column(db.String(16), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Lease held by the worker processing the row; an expired lease makes
+    # the row claimable again after a worker crash
+    locked_until = db.Column(db.DateTime)
+    claimed_by = db.Column(db.String(64))
+    processed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'topic': self.topic,
+            'payload': self.payload,
+            'status': self.status,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat(),
+            'last_error': self.last_error
+        }
+
+# Booking rollups, maintained in the same transaction as bookings (see stats.py)
+class EventStats(db.Model):
+    __tablename__ = 'event_stats'
+
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), primary_key=True)
+    bookings_count = db.Column(db.Integer, nullable=False, default=0)
+    seats_booked = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+class EventDailyStats(db.Model):
+    __tablename__ = 'event_daily_stats'
+
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    bookings_count = db.Column(db.Integer, nullable=False, default=0)
+    seats_booked = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+class OrganizerStats(db.Model):
+    __tablename__ = 'organizer_stats'
+
+    organizer_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    bookings_count = db.Column(db.Integer, nullable=False, default=0)
+    seats_booked = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
@@ -0,0 +1,206 @@
+# server/outbox.py
+import json
+import urllib.request
+from datetime import datetime, timedelta
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import delete, func, insert, or_, select, update
+from extensions import db, outbox_worker
+from models import OutboxMessage
+from reservations import run_with_retry
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_MAX_ATTEMPTS = 8
+BASE_RETRY_DELAY = 2  # seconds, doubled per failed attempt
+MAX_RETRY_DELAY = 3600
+
+# topic -> handler(message_id, topic, payload); see handles()
+HANDLERS = {}
+
+class NoHandler(Exception):
+    pass
+
+def enqueue_outbox(topic, payloads):
+    # One multi-row INSERT in the caller's transaction, so the messages
+    # commit or roll back with the change they describe
+    if payloads:
+        now = datetime.utcnow()
+        db.session.execute(insert(OutboxMessage), [
+            {"topic": topic, "payload": payload, "created_at": now, "available_at": now}
+            for payload in payloads
+        ])
+
+def handles(*topics):
+    def register(handler):
+        for topic in topics:
+            HANDLERS[topic] = handler
+        return handler
+    return register
+
+@handles("booking.created", "booking.cancelled", "waitlist.promoted", "event.updated", "event.deleted")
+def deliver_notification(message_id, topic, payload):
+    # Booking confirmations and organizer notifications. POSTed to
+    # OUTBOX_WEBHOOK_URL when set (the mail/push service), logged otherwise.
+    # Delivery is at least once: receivers dedupe on the message id.
+    url = current_app.config.get("OUTBOX_WEBHOOK_URL")
+    if not url:
+        current_app.logger.info(f"Outbox {topic} #{message_id}: {payload}")
+        return
+    body = json.dumps({"id": message_id, "topic": topic, "payload": payload}).encode()
+    webhook = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+    timeout = float(current_app.config.get("OUTBOX_WEBHOOK_TIMEOUT", 5))
+    # urlopen raises on 4xx/5xx, which counts as a failed attempt
+    with urllib.request.urlopen(webhook, timeout=timeout) as response:
+        response.read()
+
+def claim_batch(worker_id, batch_size=DEFAULT_BATCH_SIZE, lease_seconds=DEFAULT_LEASE_SECONDS):
+    # Leases up to batch_size due messages to worker_id with one UPDATE.
+    # On Postgres the candidate SELECT uses FOR UPDATE SKIP LOCKED, so
+    # concurrent workers split the queue instead of queueing on row locks;
+    # SQLite ignores the clause and the write lock serialises claims. The
+    # lease brings a message back if its worker dies mid-batch.
+    # Returns [(id, topic, payload, attempts)] in id order.
+    now = datetime.utcnow()
+    due = (
+        OutboxMessage.status == "pending",
+        OutboxMessage.available_at <= now,
+        or_(OutboxMessage.locked_until.is_(None), OutboxMessage.locked_until < now)
+    )
+
+    # Idle polls stop at a plain read of ix_outbox_status_available, so an
+    # empty queue never takes the SQLite write lock away from bookings
+    if db.session.scalar(select(OutboxMessage.id).where(*due).limit(1)) is None:
+        db.session.rollback()
+        return []
+
+    def claim():
+        candidates = (
+            select(OutboxMessage.id)
+            .where(*due)
+            .order_by(OutboxMessage.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return db.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(candidates.scalar_subquery()))
+            .values(
+                locked_until=now + timedelta(seconds=lease_seconds),
+                claimed_by=worker_id,
+                attempts=OutboxMessage.attempts + 1
+            )
+            .returning(OutboxMessage.id, OutboxMessage.topic, OutboxMessage.payload, OutboxMessage.attempts)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+    return sorted(run_with_retry(claim, immediate=True))
+
+def retry_delay(attempts):
+    return min(MAX_RETRY_DELAY, BASE_RETRY_DELAY * 2 ** (attempts - 1))
+
+def complete_messages(worker_id, message_ids):
+    # Guarded by claimed_by: a worker whose lease expired and was taken over
+    # does not overwrite the new owner's state
+    if not message_ids:
+        return
+    db.session.execute(
+        update(OutboxMessage)
+        .where(OutboxMessage.id.in_(message_ids), OutboxMessage.claimed_by == worker_id)
+        .values(status="done", processed_at=datetime.utcnow(), locked_until=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+def fail_message(worker_id, message_id, attempts, error, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    # Schedules a retry with exponential backoff, or dead-letters the
+    # message once it is out of attempts. Returns True when dead-lettered.
+    dead = attempts >= max_attempts or isinstance(error, NoHandler)
+    now = datetime.utcnow()
+    db.session.execute(
+        update(OutboxMessage)
+        .where(OutboxMessage.id == message_id, OutboxMessage.claimed_by == worker_id)
+        .values(
+            status="dead" if dead else "pending",
+            available_at=now if dead else now + timedelta(seconds=retry_delay(attempts)),
+            locked_until=None,
+            last_error=f"{type(error).__name__}: {error}"[:1000]
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return dead
+
+def dispatch(message_id, topic, payload):
+    handler = HANDLERS.get(topic)
+    if handler is None:
+        raise NoHandler(f"no handler for topic {topic}")
+    handler(message_id, topic, payload)
+
+def queue_stats():
+    # (pending, dead, seconds since the oldest pending message was written)
+    pending, oldest = db.session.execute(
+        select(func.count(), func.min(OutboxMessage.created_at)).where(OutboxMessage.status == "pending")
+    ).one()
+    dead = db.session.scalar(select(func.count()).where(OutboxMessage.status == "dead"))
+    lag = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    return pending, dead, lag
+
+outbox_cli = AppGroup("outbox", help="Transactional outbox commands.")
+
+@outbox_cli.command("work")
+@click.option("--threads", default=2, show_default=True)
+def work_command(threads):
+    """Process outbox messages until interrupted."""
+    click.echo(f"Outbox worker running with {threads} threads, Ctrl+C to stop")
+    try:
+        outbox_worker.start(threads)
+        outbox_worker.join()
+    except KeyboardInterrupt:
+        outbox_worker.stop()
+        outbox_worker.join()
+
+@outbox_cli.command("stats")
+def stats_command():
+    """Show queue depth, dead letters and lag."""
+    pending, dead, lag = queue_stats()
+    click.echo(f"pending={pending} dead={dead} lag_seconds={lag:.1f}")
+
+@outbox_cli.command("retry-dead")
+@click.option("--topic", default=None, help="Only messages of this topic.")
+def retry_dead_command(topic):
+    """Move dead-lettered messages back to the queue."""
+    stmt = (
+        update(OutboxMessage)
+        .where(OutboxMessage.status == "dead")
+        .values(status="pending", attempts=0, available_at=datetime.utcnow(), last_error=None)
+    )
+    if topic:
+        stmt = stmt.where(OutboxMessage.topic == topic)
+    requeued = db.session.execute(stmt).rowcount
+    db.session.commit()
+    click.echo(f"Requeued {requeued} messages")
+
+@outbox_cli.command("prune")
+@click.option("--older-than-days", default=7, show_default=True)
+@click.option("--batch-size", default=1000, show_default=True)
+def prune_command(older_than_days, batch_size):
+    """Delete delivered messages older than the given age."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    total = 0
+    while True:
+        batch = (
+            select(OutboxMessage.id)
+            .where(OutboxMessage.status == "done", OutboxMessage.created_at < cutoff)
+            .limit(batch_size)
+        )
+        deleted = db.session.execute(
+            delete(OutboxMessage).where(OutboxMessage.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        total += deleted
+        if deleted < batch_size:
+            break
+    click.echo(f"Deleted {total} delivered messages")
@@ -0,0 +1,107 @@
+# server/outbox_worker.py
+import os
+import socket
+import threading
+
+class OutboxWorker:
+    # Thread pool draining the outbox (see outbox.py). Each thread claims a
+    # batch, runs the handlers outside any transaction, then records the
+    # outcome. OUTBOX_WORKER_THREADS threads start with the first request of
+    # each web process; set it to 0 and run `flask outbox work` as a separate
+    # process instead. Several pools can share a queue: claims are leases.
+    def __init__(self):
+        self.threads = 1
+        self.batch_size = 100
+        self.poll_interval = 1.0
+        self.lease_seconds = 60
+        self.max_attempts = 8
+        self.processed_total = 0
+        self.failures_total = 0
+        self.dead_total = 0
+        self._app = None
+        self._pool = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self.threads = int(app.config.get("OUTBOX_WORKER_THREADS", 1))
+        self.batch_size = int(app.config.get("OUTBOX_BATCH_SIZE", 100))
+        self.poll_interval = float(app.config.get("OUTBOX_POLL_INTERVAL", 1.0))
+        self.lease_seconds = int(app.config.get("OUTBOX_LEASE_SECONDS", 60))
+        self.max_attempts = int(app.config.get("OUTBOX_MAX_ATTEMPTS", 8))
+        self._app = app
+        if self.threads > 0:
+            app.before_request(self._ensure_started)
+        app.extensions["outbox_worker"] = self
+
+    def _ensure_started(self):
+        if not self._pool:
+            self.start(self.threads)
+
+    def start(self, threads):
+        with self._lock:
+            if self._pool:
+                return
+            self._stop.clear()
+            self._pool = [
+                threading.Thread(target=self._run, name=f"outbox-{i}", daemon=True) for i in range(threads)
+            ]
+            for thread in self._pool:
+                thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self):
+        # Polls so Ctrl+C reaches the CLI's main thread
+        for thread in self._pool:
+            while thread.is_alive():
+                thread.join(0.5)
+
+    def worker_id(self):
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+    def run_once(self):
+        # One claim/process cycle; returns the number of messages claimed
+        from outbox import claim_batch, complete_messages, dispatch, fail_message
+        worker_id = self.worker_id()
+        messages = claim_batch(worker_id, self.batch_size, self.lease_seconds)
+        done = []
+        for message_id, topic, payload, attempts in messages:
+            try:
+                dispatch(message_id, topic, payload)
+                done.append(message_id)
+            except Exception as e:
+                self.failures_total += 1
+                if fail_message(worker_id, message_id, attempts, e, self.max_attempts):
+                    self.dead_total += 1
+                    self._app.logger.error(f"Outbox message {message_id} ({topic}) dead-lettered: {str(e)}")
+                else:
+                    self._app.logger.warning(f"Outbox message {message_id} ({topic}) failed, will retry: {str(e)}")
+        complete_messages(worker_id, done)
+        self.processed_total += len(done)
+        return len(messages)
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._app.app_context():
+                try:
+                    claimed = self.run_once()
+                except Exception as e:
+                    claimed = 0
+                    self._app.logger.error(f"Outbox worker error: {str(e)}")
+            # A full batch means more is probably waiting
+            if claimed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+    def collect(self):
+        # Metrics collector, see Metrics.register_collector; called from the
+        # /metrics request, so the queue gauges read the database
+        from outbox import queue_stats
+        pending, dead, lag = queue_stats()
+        yield "outbox_pending_messages", "gauge", "Outbox messages waiting for delivery.", [({}, pending)]
+        yield "outbox_dead_messages", "gauge", "Outbox messages out of attempts.", [({}, dead)]
+        yield "outbox_lag_seconds", "gauge", "Age of the oldest pending outbox message.", [({}, round(lag, 3))]
+        yield "outbox_processed_total", "counter", "Outbox messages delivered by this process.", [({}, self.processed_total)]
+        yield "outbox_failures_total", "counter", "Failed outbox delivery attempts in this process.", [({}, self.failures_total)]
+        yield "outbox_dead_lettered_total", "counter", "Outbox messages dead-lettered by this process.", [({}, self.dead_total)]
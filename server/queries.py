@@ -0,0 +1,238 @@
+# server/queries.py
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import and_, or_, select, func, exists, true, union_all
+from extensions import db
+from models import ArchivedBooking, ArchivedEvent, Booking, CatalogVersion, Event
+from catalog import CATALOG_VERSION_ID
+from conditional import make_etag
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Listing sorts backed by the (date, id) index; "-" means descending
+SORT_OPTIONS = ("date", "-date")
+
+def _parse_bool(value):
+    return str(value).lower() in ("1", "true", "yes")
+
+def _parse_price(value, name):
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"{name} must be a number")
+
+def encode_cursor(event_date, event_id):
+    return f"{event_date.isoformat()},{event_id}"
+
+def decode_cursor(cursor):
+    # Cursor format: "<iso date>,<event id>" (isoformat never contains a comma)
+    try:
+        raw_date, raw_id = cursor.rsplit(",", 1)
+        return datetime.fromisoformat(raw_date), int(raw_id)
+    except ValueError:
+        raise ValueError("after must be '<iso date>,<event id>'")
+
+def parse_include_past(args):
+    # ?include_past=true also reads the archive tables (see archive.py)
+    return _parse_bool(args.get("include_past", "false"))
+
+def parse_event_filters(args):
+    filters = {
+        "category": args.get("category") or None,
+        "organizer_id": None,
+        "date_from": None,
+        "date_to": None,
+        "min_price": None,
+        "max_price": None,
+        "available": _parse_bool(args.get("available", "false")),
+        "sort": args.get("sort", "date"),
+        "after": None,
+        "limit": DEFAULT_PAGE_SIZE,
+        "include_past": parse_include_past(args),
+    }
+
+    if filters["sort"] not in SORT_OPTIONS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_OPTIONS)}")
+
+    if args.get("organizer_id"):
+        try:
+            filters["organizer_id"] = int(args["organizer_id"])
+        except ValueError:
+            raise ValueError("organizer_id must be an integer")
+
+    for name in ("date_from", "date_to"):
+        if args.get(name):
+            try:
+                filters[name] = datetime.fromisoformat(args[name])
+            except ValueError:
+                raise ValueError(f"{name} must be an ISO date")
+
+    for name in ("min_price", "max_price"):
+        if args.get(name):
+            filters[name] = _parse_price(args[name], name)
+
+    if args.get("after"):
+        filters["after"] = decode_cursor(args["after"])
+
+    if args.get("limit"):
+        try:
+            limit = int(args["limit"])
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        filters["limit"] = min(limit, MAX_PAGE_SIZE)
+
+    return filters
+
+def apply_event_filters(stmt, filters, model=Event):
+    if filters["category"]:
+        stmt = stmt.where(model.category == filters["category"])
+    if filters["organizer_id"] is not None:
+        stmt = stmt.where(model.organizer_id == filters["organizer_id"])
+    if filters["date_from"]:
+        stmt = stmt.where(model.date >= filters["date_from"])
+    if filters["date_to"]:
+        stmt = stmt.where(model.date <= filters["date_to"])
+    if filters["min_price"] is not None:
+        stmt = stmt.where(model.price >= filters["min_price"])
+    if filters["max_price"] is not None:
+        stmt = stmt.where(model.price <= filters["max_price"])
+    if filters["available"]:
+        stmt = stmt.where(model.available_seats > 0)
+    return stmt
+
+def events_query(filters, columns=None, archived_columns=None, model=Event):
+    # Builds a keyset page over (date, id). Equality filters on category or
+    # organizer_id turn this into a range scan of the matching composite index.
+    # With include_past and archived_columns, the same page is taken from
+    # both the hot and the archive table and the two are merged.
+    if filters["include_past"] and archived_columns is not None:
+        return _merged_page(filters, (
+            events_query(filters, columns),
+            events_query(filters, archived_columns, model=ArchivedEvent),
+        ))
+    stmt = apply_event_filters(select(*(columns or [model])), filters, model)
+
+    descending = filters["sort"].startswith("-")
+    if filters["after"]:
+        after_date, after_id = filters["after"]
+        if descending:
+            stmt = stmt.where(or_(
+                model.date < after_date,
+                and_(model.date == after_date, model.id < after_id)
+            ))
+        else:
+            stmt = stmt.where(or_(
+                model.date > after_date,
+                and_(model.date == after_date, model.id > after_id)
+            ))
+
+    if descending:
+        stmt = stmt.order_by(model.date.desc(), model.id.desc())
+    else:
+        stmt = stmt.order_by(model.date.asc(), model.id.asc())
+
+    # Fetch one extra row to know whether another page exists
+    return stmt.limit(filters["limit"] + 1)
+
+def _merged_page(filters, branches):
+    # Each branch is already limited to a page, so the union stays small
+    pages = [branch.subquery() for branch in branches]
+    merged = union_all(*(select(page) for page in pages)).subquery()
+    if filters["sort"].startswith("-"):
+        order = (merged.c.date.desc(), merged.c.id.desc())
+    else:
+        order = (merged.c.date.asc(), merged.c.id.asc())
+    return select(merged).order_by(*order).limit(filters["limit"] + 1)
+
+# Cheap change markers for conditional GETs: a handful of indexed
+# aggregates instead of loading and serializing the rows themselves
+
+def catalog_version_query():
+    # max(id) and max(updated_at) move on every insert, edit and seat
+    # change; removals move neither and bump the catalog_version row instead
+    # (see catalog.py). The row may be missing on a database that never
+    # removed an event, which reads as 0. One subquery per max() keeps each
+    # a single index probe (SQLite only optimizes a lone min/max aggregate).
+    row = CatalogVersion.id == CATALOG_VERSION_ID
+    return select(
+        select(func.max(Event.id)).scalar_subquery(),
+        select(func.max(Event.updated_at)).scalar_subquery(),
+        func.coalesce(select(CatalogVersion.version).where(row).scalar_subquery(), 0),
+        select(CatalogVersion.updated_at).where(row).scalar_subquery()
+    )
+
+def catalog_validators(version):
+    # (etag, last_modified) from a catalog_version_query row
+    max_id, last_change, removals, removed_at = version
+    last_modified = max(filter(None, (last_change, removed_at)), default=None)
+    return make_etag("events", max_id or 0, last_change or 0, removals), last_modified
+
+def event_version_query(event_id):
+    return select(Event.version, Event.updated_at).where(Event.id == event_id)
+
+def bookings_version_query(user_id):
+    # Event edits show up too, since the listing embeds event title and date
+    return select(
+        func.count(Booking.id),
+        func.max(Booking.id),
+        func.max(Booking.booking_date),
+        func.max(Event.updated_at)
+    ).join(Event, Booking.event_id == Event.id).where(Booking.user_id == user_id)
+
+def my_bookings_query(user_id, columns, archived_columns=None):
+    # archived_columns (?include_past=true) appends the archived bookings
+    stmt = select(*columns).join(Event, Booking.event_id == Event.id).where(Booking.user_id == user_id)
+    if archived_columns is None:
+        return stmt
+    return union_all(stmt, select(*archived_columns).join(
+        ArchivedEvent, ArchivedBooking.event_id == ArchivedEvent.id
+    ).where(ArchivedBooking.user_id == user_id))
+
+def category_facets_query(date_from):
+    # Upcoming events per category, a range scan of ix_events_category_date
+    return (
+        select(Event.category, func.count(Event.id))
+        .where(Event.date >= date_from)
+        .group_by(Event.category)
+        .order_by(func.count(Event.id).desc(), Event.category)
+    )
+
+def home_version_query(user_id=None):
+    # catalog_version_query and bookings_version_query in one statement, so
+    # revalidating the home page costs a single round trip
+    stmt = catalog_version_query()
+    if user_id is None:
+        return stmt
+    # Both sides always yield exactly one row, so joining them on true is safe
+    catalog = stmt.subquery()
+    bookings = bookings_version_query(user_id).subquery()
+    return select(*catalog.c, *bookings.c).join_from(catalog, bookings, true())
+
+def catalog_version():
+    # Scalar subqueries only, so always exactly one row
+    return db.session.execute(catalog_version_query()).one()
+
+def event_version(event_id):
+    return db.session.execute(event_version_query(event_id)).one_or_none()
+
+def bookings_version(user_id):
+    return db.session.execute(bookings_version_query(user_id)).one()
+
+# Relationship helpers: answer "how many" / "any" with one aggregate query
+# instead of loading the collection, e.g. count_related(Event.bookings, 7)
+
+def _related_criterion(relationship, parent_id):
+    prop = relationship.property
+    (_, remote), = prop.local_remote_pairs
+    return prop.mapper.class_, remote == parent_id
+
+def count_related(relationship, parent_id):
+    target, criterion = _related_criterion(relationship, parent_id)
+    return db.session.scalar(select(func.count()).select_from(target).where(criterion))
+
+def has_related(relationship, parent_id):
+    _, criterion = _related_criterion(relationship, parent_id)
+    return db.session.scalar(select(exists().where(criterion)))
@@ -0,0 +1,232 @@
+# server/ratelimit.py
+import math
+import threading
+import time
+from collections import defaultdict
+from flask import current_app, jsonify, request
+from flask_jwt_extended import decode_token
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Most client buckets the memory backend keeps before sweeping idle ones
+MAX_MEMORY_BUCKETS = 100000
+
+# Verified bearer tokens remembered by their header value
+MAX_TOKEN_SUBJECTS = 10000
+
+_UNRESOLVED = object()
+
+def parse_limit(text):
+    # "10/minute" or "10/minute burst 20" -> (tokens per second, burst).
+    # The burst defaults to the count. "off" disables limiting.
+    text = text.strip()
+    if text == "off":
+        return None
+    rate_part, _, burst_part = text.partition(" burst ")
+    count, _, period = rate_part.partition("/")
+    count = int(count)
+    seconds = PERIODS[period.strip().rstrip("s")]
+    burst = int(burst_part) if burst_part else count
+    if count <= 0 or burst <= 0:
+        raise ValueError(f"invalid rate limit {text!r}")
+    return count / seconds, burst
+
+def parse_limits(text):
+    # RATE_LIMITS: "auth.login=5/minute,bookings=20/second burst 40"
+    limits = {}
+    for item in (text or "").split(","):
+        if item.strip():
+            target, _, limit = item.partition("=")
+            limits[target.strip()] = limit.strip()
+    return limits
+
+def rate_limit(limit):
+    # Default limit for one view, overridable through RATE_LIMITS; place it
+    # directly under the route decorator
+    def decorator(view):
+        view._rate_limit = limit
+        return view
+    return decorator
+
+class MemoryBackend:
+    # Token buckets in a dict: [tokens, last refill, rate, burst]. Per
+    # process, so with N workers a client gets N times the configured rate.
+    # Each check reads and writes its bucket under one lock, so threads
+    # racing on the same client cannot both spend the last token; the
+    # critical section is a few float operations.
+    def __init__(self, max_buckets=MAX_MEMORY_BUCKETS):
+        self.max_buckets = max_buckets
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key, rate, burst, monotonic=time.monotonic):
+        # Takes one token; returns 0.0 when allowed, else seconds until one refills
+        now = monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_buckets:
+                    self._sweep(now)
+                self._buckets[key] = [burst - 1.0, now, rate, burst]
+                return 0.0
+            tokens = bucket[0] + (now - bucket[1]) * rate
+            if tokens > burst:
+                tokens = burst
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+            bucket[0] = tokens
+            return (1.0 - tokens) / rate
+
+    def _sweep(self, now):
+        # Full buckets carry no state worth keeping
+        idle = [key for key, (tokens, last, rate, burst) in list(self._buckets.items())
+                if tokens + (now - last) * rate >= burst]
+        for key in idle:
+            self._buckets.pop(key, None)
+        if len(self._buckets) >= self.max_buckets:
+            self._buckets.clear()
+
+# Runs atomically inside Redis, on Redis' clock so web hosts need not agree
+# on the time. Returns the wait in seconds as a string (Lua numbers would be
+# truncated to integers on the way out).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+if tokens == nil then
+  tokens = burst
+else
+  tokens = math.min(burst, tokens + (now - tonumber(state[2])) * rate)
+end
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(wait)
+"""
+
+class RedisBackend:
+    # Buckets shared by every process talking to the same Redis. Any Redis
+    # client with register_script() works (redis-py, or fakeredis in tests).
+    def __init__(self, client, prefix="ratelimit:"):
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATELIMIT_STORAGE_URI=redis://... needs: pip install redis")
+        return cls(redis.Redis.from_url(url, socket_timeout=0.05))
+
+    def acquire(self, key, rate, burst):
+        scope, client = key
+        return float(self._script(keys=[f"{self.prefix}{scope}:{client}"], args=[rate, burst]))
+
+class RateLimiter:
+    # Token-bucket admission control, checked before the view runs. Limits
+    # come from RATE_LIMITS (endpoint or blueprint name -> limit), then from
+    # @rate_limit on the view; a blueprint-wide limit shares one bucket
+    # across its routes. Clients are keyed by token subject when the request
+    # carries a valid bearer token, else by remote address; behind a reverse
+    # proxy set PROXY_FIX_HOPS so that address is the client's, not the
+    # proxy's. A failing shared backend lets requests through rather than
+    # taking the site down.
+    def __init__(self):
+        self.enabled = True
+        self.backend = MemoryBackend()
+        self.limits = {}
+        self.rejected = defaultdict(int)
+        self.backend_errors = 0
+        self._resolved = {}
+        self._token_subjects = {}
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("RATELIMIT_ENABLED", True))
+        self.limits = {target: parse_limit(limit) for target, limit in app.config.get("RATE_LIMITS", {}).items()}
+        storage = app.config.get("RATELIMIT_STORAGE_URI", "memory://")
+        if storage.startswith("redis"):
+            self.backend = RedisBackend.from_url(storage)
+        else:
+            self.backend = MemoryBackend(int(app.config.get("RATELIMIT_MEMORY_BUCKETS", MAX_MEMORY_BUCKETS)))
+        self._resolved = {}
+        self._token_subjects = {}
+        if self.enabled:
+            app.before_request(self._before_request)
+        app.extensions["rate_limiter"] = self
+
+    def _resolve(self, endpoint):
+        # (bucket scope, rate, burst) or None; computed once per endpoint
+        if endpoint in self.limits:
+            limit = self.limits[endpoint]
+            return (endpoint, *limit) if limit else None
+        view = current_app.view_functions.get(endpoint)
+        if getattr(view, "_rate_limit", None):
+            limit = parse_limit(view._rate_limit)
+            return (endpoint, *limit) if limit else None
+        blueprint = endpoint.rpartition(".")[0]
+        if blueprint and self.limits.get(blueprint):
+            return (blueprint, *self.limits[blueprint])
+        return None
+
+    def _token_subject(self, authorization):
+        # Only tokens that verified are remembered, so a forged subject can
+        # never pick someone else's bucket
+        if not authorization.startswith("Bearer "):
+            return None
+        try:
+            subject = "u:" + str(decode_token(authorization[7:])["sub"])
+        except Exception:
+            return None
+        if len(self._token_subjects) >= MAX_TOKEN_SUBJECTS:
+            self._token_subjects.clear()
+        self._token_subjects[authorization] = subject
+        return subject
+
+    def _before_request(self):
+        # The hot path: plain attribute and dict reads on the real request
+        # object, no Flask proxies or header parsing
+        req = request._get_current_object()
+        limit = self._resolved.get(req.endpoint, _UNRESOLVED)
+        if limit is _UNRESOLVED:
+            limit = self._resolved[req.endpoint] = self._resolve(req.endpoint) if req.endpoint else None
+        if limit is None or req.method == "OPTIONS":
+            return None
+        scope, rate, burst = limit
+        environ = req.environ
+        authorization = environ.get("HTTP_AUTHORIZATION")
+        client = None
+        if authorization:
+            client = self._token_subjects.get(authorization) or self._token_subject(authorization)
+        if client is None:
+            client = environ.get("REMOTE_ADDR") or "-"
+        try:
+            wait = self.backend.acquire((scope, client), rate, burst)
+        except Exception as e:
+            self.backend_errors += 1
+            current_app.logger.warning(f"Rate limit backend error, allowing request: {str(e)}")
+            return None
+        if wait <= 0:
+            return None
+        self.rejected[scope] += 1
+        retry_after = max(1, math.ceil(wait))
+        response = jsonify({"error": "Too many requests, please retry later", "retry_after": retry_after})
+        response.headers["Retry-After"] = str(retry_after)
+        return response, 429
+
+    def collect(self):
+        # Metrics collector, see Metrics.register_collector
+        yield ("rate_limit_rejected_total", "counter", "Requests refused by the rate limiter.",
+               [({"scope": scope}, count) for scope, count in sorted(self.rejected.items())])
+        yield ("rate_limit_backend_errors_total", "counter", "Rate limit checks skipped because the backend failed.",
+               [({}, self.backend_errors)])
@@ -0,0 +1,67 @@
+# server/reaper.py
+import threading
+import time
+
+class HoldReaper:
+    # Background thread releasing expired seat holds every
+    # HOLD_REAPER_INTERVAL seconds (0 disables it; use `flask holds reap`
+    # from cron instead). Started by the first request, so CLI commands and
+    # one-off scripts never spawn it. One per process is fine: the reap only
+    # releases the holds its own DELETE removed.
+    def __init__(self):
+        self.interval = 30.0
+        self.batch_size = 500
+        self.reaped_total = 0
+        self.runs_total = 0
+        self.failures_total = 0
+        self._app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self.interval = float(app.config.get("HOLD_REAPER_INTERVAL", 30))
+        self.batch_size = int(app.config.get("HOLD_REAPER_BATCH_SIZE", 500))
+        self._app = app
+        if self.interval > 0:
+            app.before_request(self._ensure_started)
+        app.extensions["hold_reaper"] = self
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="hold-reaper", daemon=True)
+                    self._thread.start()
+
+    def run_once(self):
+        from holds import reap_expired_holds
+        from reservations import sync_sharded_seats
+        from extensions import catalog_cache
+        released = reap_expired_holds(self.batch_size)
+        # The same pass refreshes the cached availability of sharded events
+        # that went quiet before their writers' next sync was due
+        synced = sync_sharded_seats()
+        catalog_cache.invalidate_events(set(released) | set(synced))
+        self.runs_total += 1
+        self.reaped_total += sum(released.values())
+        return released
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._app.app_context():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    self.failures_total += 1
+                    self._app.logger.error(f"Hold reaper error: {str(e)}")
+
+    def stop(self):
+        self._stop.set()
+
+    def collect(self):
+        # Metrics collector, see Metrics.register_collector
+        yield "hold_reaper_runs_total", "counter", "Expired hold sweeps completed.", [({}, self.runs_total)]
+        yield "hold_reaper_failures_total", "counter", "Expired hold sweeps that failed.", [({}, self.failures_total)]
+        yield ("hold_reaper_seats_released_total", "counter", "Seats returned from expired holds.",
+               [({}, self.reaped_total)])
@@ -0,0 +1,358 @@
+# server/reservations.py
+import random
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import delete, func, insert, update, select
+from sqlalchemy.exc import DBAPIError
+from extensions import db, catalog_cache
+from models import Event, EventSeatShard
+from sqlite_profile import begin_immediate
+
+# Retry budget for transactions aborted by lock contention
+MAX_ATTEMPTS = 5
+BASE_BACKOFF = 0.01  # seconds
+MAX_BACKOFF = 0.2
+
+# Bulk endpoints: reject the whole batch on any failure, or apply what fits
+BULK_MODES = ("all_or_nothing", "partial")
+
+# SQLSTATEs Postgres uses for serialization failures and deadlocks
+RETRYABLE_SQLSTATES = ("40001", "40P01")
+
+# Most seat shards one event may be split into
+MAX_SEAT_SHARDS = 64
+
+# event id -> monotonic time this process last refreshed the cached sum
+_shard_sums_synced = {}
+
+class EventNotFound(Exception):
+    pass
+
+class CapacityBelowBooked(Exception):
+    # resize_event refused: more seats are booked or held than the new size
+    pass
+
+class SeatsUnavailable(Exception):
+    def __init__(self, available_seats):
+        super().__init__("Not enough seats available")
+        self.available_seats = available_seats
+
+class BatchRejected(Exception):
+    def __init__(self, outcomes):
+        super().__init__("Batch rejected")
+        self.outcomes = outcomes
+
+def is_retryable(error):
+    orig = getattr(error, "orig", None)
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    # SQLite reports writer contention as "database is locked"
+    return "database is locked" in str(orig) or "database table is locked" in str(orig)
+
+def run_with_retry(work, immediate=False):
+    # Runs work() and commits; on a serialization error the whole transaction
+    # is rolled back and replayed with jittered exponential backoff.
+    # immediate=True takes the SQLite write lock when the transaction begins.
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            if immediate:
+                begin_immediate(db.session())
+            result = work()
+            db.session.commit()
+            return result
+        except DBAPIError as e:
+            db.session.rollback()
+            if attempt == MAX_ATTEMPTS or not is_retryable(e):
+                raise
+            delay = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (attempt - 1))
+            time.sleep(delay * random.uniform(0.5, 1.0))
+        except Exception:
+            db.session.rollback()
+            raise
+
+def current_available_seats(event_id):
+    # Exact free seats: the shard total for sharded events, where
+    # Event.available_seats may lag. None if the event does not exist.
+    row = db.session.execute(
+        select(Event.seat_shards, Event.available_seats).where(Event.id == event_id)
+    ).one_or_none()
+    if row is None:
+        return None
+    if not row.seat_shards:
+        return row.available_seats
+    return _shard_total(event_id)
+
+def reserve_seats(event_id, seat_count):
+    # Single conditional UPDATE: the seat check and the decrement happen
+    # atomically in the database, so concurrent bookings cannot oversell.
+    # Sharded events fail the seat_shards guard and take the shard path.
+    available = db.session.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.seat_shards == 0, Event.available_seats >= seat_count)
+        .values(available_seats=Event.available_seats - seat_count, version=Event.version + 1)
+        .returning(Event.available_seats)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+    if available is None:
+        row = db.session.execute(
+            select(Event.seat_shards, Event.available_seats).where(Event.id == event_id)
+        ).one_or_none()
+        if row is None:
+            raise EventNotFound()
+        if row.seat_shards:
+            return _reserve_sharded(event_id, row.seat_shards, seat_count)
+        raise SeatsUnavailable(row.available_seats)
+    return available
+
+def release_seats(event_id, seat_count):
+    # Returns the new seat count, or None if the event no longer exists
+    available = db.session.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.seat_shards == 0)
+        .values(available_seats=Event.available_seats + seat_count, version=Event.version + 1)
+        .returning(Event.available_seats)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+    if available is None:
+        shards = db.session.scalar(select(Event.seat_shards).where(Event.id == event_id))
+        if shards:
+            db.session.execute(
+                update(EventSeatShard)
+                .where(EventSeatShard.event_id == event_id, EventSeatShard.shard == random.randrange(shards))
+                .values(available_seats=EventSeatShard.available_seats + seat_count)
+                .execution_options(synchronize_session=False)
+            )
+            return _sync_shard_sum(event_id)
+    return available
+
+def resize_event(event_id, new_max):
+    # Moves max_seats and available_seats together; the guard refuses to drop
+    # capacity below what is already booked at the moment the UPDATE runs.
+    # Returns False when the guard rejects the change.
+    result = db.session.execute(
+        update(Event)
+        .where(
+            Event.id == event_id, Event.seat_shards == 0,
+            Event.max_seats - Event.available_seats <= new_max
+        )
+        .values(
+            available_seats=Event.available_seats + (new_max - Event.max_seats),
+            max_seats=new_max,
+            version=Event.version + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        return True
+    if db.session.scalar(select(Event.seat_shards).where(Event.id == event_id)):
+        return _resize_sharded(event_id, new_max)
+    return False
+
+# Sharded inventory. A sold-out headliner turns every booking into an UPDATE
+# of the same events row, and on Postgres those writers queue on its row
+# lock. Splitting the free seats across N EventSeatShard rows lets bookings
+# land on different rows; a booking tries one shard at random and only
+# looks at the others when that one is short. Event.available_seats stays
+# as a cached sum for listings, refreshed at most every
+# SEAT_SHARD_SYNC_INTERVAL seconds per process by the writers themselves
+# and on every hold reaper pass.
+
+def _shard_total(event_id):
+    return db.session.scalar(
+        select(func.coalesce(func.sum(EventSeatShard.available_seats), 0))
+        .where(EventSeatShard.event_id == event_id)
+    )
+
+def _sync_shard_sum(event_id):
+    # Returns the exact total; rewrites the cached sum when it is due
+    total = _shard_total(event_id)
+    now = time.monotonic()
+    interval = float(current_app.config.get("SEAT_SHARD_SYNC_INTERVAL", 1.0))
+    if now - _shard_sums_synced.get(event_id, 0.0) >= interval:
+        _shard_sums_synced[event_id] = now
+        db.session.execute(
+            update(Event)
+            .where(Event.id == event_id, Event.available_seats != total)
+            .values(available_seats=total, version=Event.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+    return total
+
+def _take_from_shard(event_id, shard, seat_count):
+    return db.session.execute(
+        update(EventSeatShard)
+        .where(
+            EventSeatShard.event_id == event_id, EventSeatShard.shard == shard,
+            EventSeatShard.available_seats >= seat_count
+        )
+        .values(available_seats=EventSeatShard.available_seats - seat_count)
+        .returning(EventSeatShard.available_seats)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+
+def _reserve_sharded(event_id, shards, seat_count):
+    if _take_from_shard(event_id, random.randrange(shards), seat_count) is None:
+        # The shard picked is short: lock the others and take from the
+        # fullest first, spread over several when no single one fits
+        rows = db.session.execute(
+            select(EventSeatShard.shard, EventSeatShard.available_seats)
+            .where(EventSeatShard.event_id == event_id, EventSeatShard.available_seats > 0)
+            .order_by(EventSeatShard.available_seats.desc())
+            .with_for_update()
+        ).all()
+        total = sum(available for _, available in rows)
+        if total < seat_count:
+            raise SeatsUnavailable(total)
+        needed = seat_count
+        for shard, available in rows:
+            take = min(available, needed)
+            if _take_from_shard(event_id, shard, take) is None:
+                raise SeatsUnavailable(_shard_total(event_id))
+            needed -= take
+            if not needed:
+                break
+    return _sync_shard_sum(event_id)
+
+def _fill_shards(event_id, shards, available):
+    # Replaces the event's shards with `shards` rows splitting `available` evenly
+    db.session.execute(
+        delete(EventSeatShard).where(EventSeatShard.event_id == event_id)
+        .execution_options(synchronize_session=False)
+    )
+    if shards:
+        share, extra = divmod(available, shards)
+        db.session.execute(insert(EventSeatShard), [
+            {"event_id": event_id, "shard": shard, "available_seats": share + (1 if shard < extra else 0)}
+            for shard in range(shards)
+        ])
+
+def _resize_sharded(event_id, new_max):
+    # Rebalances the free seats across the shards under the new capacity.
+    # The event row is written first so concurrent resizes queue there, then
+    # the shards are locked so no booking slips between the sum and the refill.
+    max_seats, shards = db.session.execute(
+        update(Event).where(Event.id == event_id)
+        .values(version=Event.version + 1)
+        .returning(Event.max_seats, Event.seat_shards)
+        .execution_options(synchronize_session=False)
+    ).one()
+    free = sum(db.session.scalars(
+        select(EventSeatShard.available_seats).where(EventSeatShard.event_id == event_id).with_for_update()
+    ).all())
+    booked = max_seats - free
+    if booked > new_max:
+        return False
+    _fill_shards(event_id, shards, new_max - booked)
+    db.session.execute(
+        update(Event).where(Event.id == event_id)
+        .values(max_seats=new_max, available_seats=new_max - booked)
+        .execution_options(synchronize_session=False)
+    )
+    return True
+
+def set_seat_shards(event_id, shards):
+    # Switches an event between single-row (0) and sharded inventory,
+    # carrying the free seats over. Returns the free seats.
+    if not 0 <= shards <= MAX_SEAT_SHARDS:
+        raise ValueError(f"shards must be between 0 and {MAX_SEAT_SHARDS}")
+
+    def reshard():
+        row = db.session.execute(
+            select(Event.seat_shards, Event.available_seats).where(Event.id == event_id).with_for_update()
+        ).one_or_none()
+        if row is None:
+            raise EventNotFound()
+        available = row.available_seats
+        if row.seat_shards:
+            available = sum(db.session.scalars(
+                select(EventSeatShard.available_seats).where(EventSeatShard.event_id == event_id).with_for_update()
+            ).all())
+        _fill_shards(event_id, shards, available)
+        db.session.execute(
+            update(Event).where(Event.id == event_id)
+            .values(seat_shards=shards, available_seats=available, version=Event.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return available
+
+    return run_with_retry(reshard, immediate=True)
+
+def sync_sharded_seats():
+    # Refreshes every stale cached sum in one UPDATE; returns the event ids
+    total = (
+        select(func.coalesce(func.sum(EventSeatShard.available_seats), 0))
+        .where(EventSeatShard.event_id == Event.id)
+        .scalar_subquery()
+    )
+    return run_with_retry(lambda: db.session.scalars(
+        update(Event)
+        .where(Event.seat_shards > 0, Event.available_seats != total)
+        .values(available_seats=total, version=Event.version + 1)
+        .returning(Event.id)
+        .execution_options(synchronize_session=False)
+    ).all())
+
+def clear_event_shards(event_id):
+    _shard_sums_synced.pop(event_id, None)
+    db.session.execute(
+        delete(EventSeatShard).where(EventSeatShard.event_id == event_id).execution_options(synchronize_session=False)
+    )
+
+def reserve_batch(items, all_or_nothing=True):
+    # items: [(key, event_id, seat_count)]. Takes the summed seats of each
+    # event with one conditional UPDATE; in partial mode an event that cannot
+    # fit the whole group falls back to per-item UPDATEs in request order.
+    # Returns {key: (available_seats, None) or (None, error)}.
+    groups = {}
+    for key, event_id, seat_count in items:
+        groups.setdefault(event_id, []).append((key, seat_count))
+
+    outcomes = {}
+    for event_id, group in groups.items():
+        try:
+            available = reserve_seats(event_id, sum(seat_count for _, seat_count in group))
+            outcomes.update((key, (available, None)) for key, _ in group)
+            continue
+        except EventNotFound:
+            outcomes.update((key, (None, "Event not found")) for key, _ in group)
+            continue
+        except SeatsUnavailable:
+            if all_or_nothing or len(group) == 1:
+                outcomes.update((key, (None, "Not enough seats available")) for key, _ in group)
+                continue
+
+        for key, seat_count in group:
+            try:
+                outcomes[key] = (reserve_seats(event_id, seat_count), None)
+            except SeatsUnavailable:
+                outcomes[key] = (None, "Not enough seats available")
+
+    if all_or_nothing and any(error for _, error in outcomes.values()):
+        raise BatchRejected(outcomes)
+    return outcomes
+
+seats_cli = AppGroup("seats", help="Seat inventory commands.")
+
+@seats_cli.command("shard")
+@click.argument("event_id", type=int)
+@click.option("--shards", default=16, show_default=True, help="0 goes back to the single counter.")
+def shard_command(event_id, shards):
+    """Split an event's free seats across counter rows."""
+    try:
+        available = set_seat_shards(event_id, shards)
+    except (EventNotFound, ValueError) as e:
+        raise click.ClickException(str(e) or "Event not found")
+    catalog_cache.invalidate_event(event_id)
+    click.echo(f"Event {event_id}: {available} free seats over {shards} shards")
+
+@seats_cli.command("sync")
+def sync_command():
+    """Refresh the cached availability of sharded events."""
+    synced = sync_sharded_seats()
+    catalog_cache.invalidate_events(set(synced))
+    click.echo(f"Refreshed {len(synced)} events")
@@ -1,14 +1,26 @@
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask import Blueprint, request, jsonify, current_app
-from extensions import db
+from extensions import db, jwt
 from models import User
 from datetime import timedelta
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt
 from sqlalchemy.exc import IntegrityError
+from hashing import HashingBusy
+from tokens import current_identity
+from ratelimit import rate_limit
+
+# Seconds a client should wait when the password hashing pool is saturated
+HASH_RETRY_AFTER = 1
+
+def hashing_busy_response():
+    response = jsonify({"error": "Server busy, please retry shortly"})
+    response.headers["Retry-After"] = str(HASH_RETRY_AFTER)
+    return response, 503
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route("/register", methods=["POST"])
+@rate_limit("10/minute")
 def register():
     data = request.get_json()
     
@@ -34,9 +46,10 @@ def register():
         
         # Create token immediately after registration
         access_token = create_access_token(
-            identity=new_user.id,
+            identity=str(new_user.id),
             additional_claims={
                 "email": new_user.email,
+                "name": new_user.name,
                 "is_organizer": new_user.is_organizer
             },
             expires_delta=timedelta(days=1))
@@ -54,12 +67,16 @@ def register():
     except IntegrityError:
         db.session.rollback()
         return jsonify({"error": "Email already exists"}), 409
+    except HashingBusy:
+        db.session.rollback()
+        return hashing_busy_response()
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Registration error: {str(e)}")
         return jsonify({"error": "Registration failed"}), 500
     
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit("10/minute")
 def login():
     data = request.get_json()
     
@@ -75,11 +92,22 @@ def login():
         if not user.check_password(data["password"]):
             return jsonify({"error": "Invalid email or password"}), 401
 
+        # Transparently upgrade hashes made with older method/cost settings.
+        # Best effort: the password is already verified, so a saturated pool
+        # only postpones the upgrade to a later login
+        if user.password_needs_rehash():
+            try:
+                user.set_password(data["password"])
+                db.session.commit()
+            except HashingBusy:
+                db.session.rollback()
+
         # Create JWT token with consistent identity
         access_token = create_access_token(
             identity=str(user.id),  # Using database ID as identity
             additional_claims={
                 "email": user.email,
+                "name": user.name,
                 "is_organizer": user.is_organizer
             },
             expires_delta=timedelta(days=1)
@@ -94,6 +122,9 @@ def login():
                 'is_organizer': user.is_organizer
             }
         }), 200
+    except HashingBusy:
+        db.session.rollback()
+        return hashing_busy_response()
     except Exception as e:
         current_app.logger.error(f"Login error: {str(e)}")
         return jsonify({"error": "Login failed"}), 500
@@ -102,18 +133,24 @@ def login():
 @jwt_required()
 def get_current_user():
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
-        
-        if not user:
-            return jsonify({"error": "User not found"}), 404
-            
+        # Every field is in the token claims; tokens issued before "name" was
+        # added fall back to one lookup
+        identity = current_identity()
         return jsonify({
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "is_organizer": user.is_organizer
+            "id": identity.id,
+            "name": identity.name,
+            "email": identity.email,
+            "is_organizer": identity.is_organizer
         }), 200
+    except AttributeError:
+        return jsonify({"error": "User not found"}), 404
     except Exception as e:
         current_app.logger.error(f"Get current user error: {str(e)}")
-        return jsonify({"error": "Unable to fetch user data"}), 500
\ No newline at end of file
+        return jsonify({"error": "Unable to fetch user data"}), 500
+
+# Revoke the current token; every worker refuses it from now on
+@auth_bp.route("/logout", methods=["POST"])
+@jwt_required()
+def logout():
+    jwt.revoke(get_jwt())
+    return jsonify({"message": "Logged out"}), 200
@@ -1,9 +1,24 @@
 # server/routes/bookings.py
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from collections import defaultdict
 from datetime import datetime
-from extensions import db
+from sqlalchemy import delete, select, insert
+from extensions import db, catalog_cache, live_hub
 from models import Booking, Event, User
+from queries import bookings_version, my_bookings_query, parse_include_past
+from conditional import make_etag, not_modified, apply_validators
+from stats import record_bookings
+from waitlist import promote_waitlist
+from outbox import enqueue_outbox
+from routing import read_only
+from metrics import query_budget
+from ratelimit import rate_limit
+from serializers import MY_BOOKING_COLUMNS, ARCHIVED_BOOKING_COLUMNS, encode_bookings
+from reservations import (
+    EventNotFound, SeatsUnavailable, BatchRejected, BULK_MODES,
+    reserve_seats, reserve_batch, release_seats, run_with_retry
+)
 
 booking_bp = Blueprint('bookings', __name__)
 
@@ -17,6 +32,8 @@ def handle_options():
         return response
 
 @booking_bp.route('', methods=['POST', 'OPTIONS'])
+@query_budget(10)
+@rate_limit("10/second burst 20")
 @jwt_required()
 def create_booking():
     if request.method == "OPTIONS":
@@ -39,42 +56,153 @@ def create_booking():
     if seat_count <= 0:
         return jsonify({"error": "Seat count must be positive"}), 400
     
-    # Check if event exists and has available seats
-    event = Event.query.get(event_id)
-    if not event:
-        return jsonify({"error": "Event not found"}), 404
-    
-    if event.available_seats < seat_count:
-        return jsonify({
-            "error": "Not enough seats available",
-            "available_seats": event.available_seats
-        }), 400
-    
-    try:
-        # Create booking
-        new_booking = Booking(
+    def book():
+        # Seats are taken with one conditional UPDATE before the booking row
+        # is written, so the check and the decrement cannot interleave
+        available_seats = reserve_seats(event_id, seat_count)
+        booking = Booking(
             user_id=current_user_id,
             event_id=event_id,
             seat_count=seat_count
         )
-        
-        # Update available seats
-        event.available_seats -= seat_count
-        
-        db.session.add(new_booking)
-        db.session.commit()
-        
+        db.session.add(booking)
+        db.session.flush()
+        record_bookings([(event_id, seat_count, booking.booking_date.date(), 1)])
+        enqueue_outbox("booking.created", [{"booking_id": booking.id, "user_id": int(current_user_id),
+                                            "event_id": event_id, "seat_count": seat_count}])
+        # Serialized before the commit expires it, which would cost a reload
+        return booking.to_dict(), available_seats
+
+    try:
+        new_booking, available_seats = run_with_retry(book, immediate=True)
+        catalog_cache.invalidate_event(event_id)
+        live_hub.publish(event_id)
+
         return jsonify({
             "message": "Booking created successfully",
-            "booking": new_booking.to_dict(),
-            "available_seats": event.available_seats
+            "booking": new_booking,
+            "available_seats": available_seats
         }), 201
+    except EventNotFound:
+        return jsonify({"error": "Event not found"}), 404
+    except SeatsUnavailable as e:
+        return jsonify({
+            "error": "Not enough seats available",
+            "available_seats": e.available_seats
+        }), 400
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Booking creation error: {str(e)}")
         return jsonify({"error": "Failed to create booking"}), 500
 
+# Most bookings a single bulk request may contain
+MAX_BULK_BOOKINGS = 100
+
+# Book many items in one transaction (group sales)
+@booking_bp.route('/bulk', methods=['POST', 'OPTIONS'])
+# One seat UPDATE per distinct event; everything else is batched
+@query_budget(9 + MAX_BULK_BOOKINGS)
+@rate_limit("2/second burst 5")
+@jwt_required()
+def create_bookings_bulk():
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    items = data.get('bookings')
+    mode = data.get('mode', 'all_or_nothing')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "bookings must be a non-empty list"}), 400
+    if len(items) > MAX_BULK_BOOKINGS:
+        return jsonify({"error": f"At most {MAX_BULK_BOOKINGS} bookings per request"}), 400
+    if mode not in BULK_MODES:
+        return jsonify({"error": "Invalid mode", "modes": list(BULK_MODES)}), 400
+
+    # Validate everything in one pass before touching the database
+    results = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            event_id = int(item['event_id'])
+            seat_count = int(item['seat_count'])
+        except (KeyError, TypeError, ValueError):
+            results.append({"index": index, "status": "error", "error": "Invalid data format"})
+            continue
+        if seat_count <= 0:
+            results.append({"index": index, "status": "error", "error": "Seat count must be positive"})
+            continue
+        results.append({"index": index, "status": "booked", "event_id": event_id, "seat_count": seat_count})
+        valid.append((index, event_id, seat_count))
+
+    all_or_nothing = mode == 'all_or_nothing'
+    if (all_or_nothing and len(valid) < len(items)) or not valid:
+        # Nothing was attempted, so the well-formed items were not booked either
+        for index, _, _ in valid:
+            results[index].update(status="not_applied")
+        return jsonify({"booked": 0, "failed": len(items), "results": results}), 400
+
+    def book():
+        outcomes = reserve_batch(valid, all_or_nothing)
+        booked_at = datetime.utcnow()
+        rows = [
+            {"user_id": current_user_id, "event_id": event_id, "seat_count": seat_count, "booking_date": booked_at}
+            for index, event_id, seat_count in valid if outcomes[index][1] is None
+        ]
+        if not rows:
+            return outcomes, []
+        # One multi-row INSERT. Asking RETURNING for parameter order would make
+        # SQLite insert row by row; items with the same event and seat count
+        # are interchangeable, so ids are matched back by those instead.
+        inserted = db.session.execute(
+            insert(Booking).returning(Booking.id, Booking.event_id, Booking.seat_count), rows
+        ).all()
+        ids_by_item = defaultdict(list)
+        for booking_id, event_id, seat_count in sorted(inserted, reverse=True):
+            ids_by_item[(event_id, seat_count)].append(booking_id)
+        booking_ids = [ids_by_item[(row["event_id"], row["seat_count"])].pop() for row in rows]
+        record_bookings([(row["event_id"], row["seat_count"], booked_at.date(), 1) for row in rows])
+        enqueue_outbox("booking.created", [
+            {"booking_id": booking_id, "user_id": current_user_id, "event_id": row["event_id"],
+             "seat_count": row["seat_count"]}
+            for booking_id, row in zip(booking_ids, rows)
+        ])
+        return outcomes, booking_ids
+
+    try:
+        outcomes, booking_ids = run_with_retry(book, immediate=True)
+    except BatchRejected as e:
+        outcomes, booking_ids = e.outcomes, []
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk booking error: {str(e)}")
+        return jsonify({"error": "Failed to create bookings"}), 500
+
+    new_ids = iter(booking_ids)
+    for index, event_id, _ in valid:
+        available_seats, error = outcomes[index]
+        if error:
+            results[index].update(status="error", error=error)
+        elif booking_ids:
+            results[index].update(booking_id=next(new_ids), available_seats=available_seats)
+        else:
+            results[index].update(status="not_applied")
+
+    if booking_ids:
+        catalog_cache.invalidate_events({event_id for _, event_id, _ in valid})
+        for event_id in {event_id for _, event_id, _ in valid}:
+            live_hub.publish(event_id)
+
+    booked = len(booking_ids)
+    failed = len(items) - booked
+    return jsonify({
+        "booked": booked,
+        "failed": failed,
+        "results": results
+    }), 201 if not failed else (207 if booked else 400)
+
 @booking_bp.route('/my', methods=['GET', 'OPTIONS'])
+@read_only
 @jwt_required()
 def get_my_bookings():
     if request.method == "OPTIONS":
@@ -83,33 +211,26 @@ def get_my_bookings():
     current_user_id = get_jwt_identity()
     
     try:
-        bookings = db.session.query(
-            Booking,
-            Event.title.label('event_title'),
-            Event.date.label('event_date')
-        ).join(
-            Event, Booking.event_id == Event.id
-        ).filter(
-            Booking.user_id == current_user_id
-        ).all()
-        
-        result = []
-        for booking, event_title, event_date in bookings:
-            result.append({
-                "id": booking.id,
-                "seat_count": booking.seat_count, 
-                "booking_date": booking.booking_date.isoformat(),
-                "event_title": event_title,
-                "event_date": event_date.isoformat(),
-                "event_id": booking.event_id
-            })
-            
-        return jsonify(result), 200
+        count, max_id, last_booked, last_event_change = bookings_version(current_user_id)
+        last_modified = max(filter(None, (last_booked, last_event_change)), default=None)
+        etag = make_etag("bookings", current_user_id, count, max_id, last_modified or 0)
+        response = not_modified(etag, last_modified, private=True)
+        if response is not None:
+            return response
+
+        # Bookings of archived events only come back with ?include_past=true
+        archived_columns = ARCHIVED_BOOKING_COLUMNS if parse_include_past(request.args) else None
+        rows = db.session.execute(my_bookings_query(current_user_id, MY_BOOKING_COLUMNS, archived_columns)).all()
+
+        response = current_app.response_class(encode_bookings(rows), mimetype='application/json')
+        return apply_validators(response, etag, last_modified, private=True), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching bookings: {str(e)}")
         return jsonify({"error": "Failed to fetch bookings"}), 500
 
 @booking_bp.route('/<int:booking_id>', methods=['DELETE', 'OPTIONS'])
+# Includes a waitlist promotion pass, booked in one batch however long the queue
+@query_budget(22)
 @jwt_required()
 def cancel_booking(booking_id):
     if request.method == "OPTIONS":
@@ -129,17 +250,36 @@ def cancel_booking(booking_id):
             "booking_user_id": booking.user_id
         }), 403
     
+    event_id = booking.event_id
+    seat_count = booking.seat_count
+    booking_user_id = booking.user_id
+    booked_on = booking.booking_date.date()
+
+    def cancel():
+        # Deleting by id first means two concurrent cancels release the seats once
+        deleted = db.session.execute(
+            delete(Booking).where(Booking.id == booking_id)
+        ).rowcount
+        if not deleted:
+            return False, None
+        release_seats(event_id, seat_count)
+        record_bookings([(event_id, seat_count, booked_on, -1)])
+        enqueue_outbox("booking.cancelled", [{"booking_id": booking_id, "user_id": booking_user_id,
+                                              "event_id": event_id, "seat_count": seat_count}])
+        # Freed seats go to the waitlist before anyone else can take them
+        _, available_seats = promote_waitlist(event_id)
+        return True, available_seats
+
     try:
-        event = Event.query.get(booking.event_id)
-        if event:
-            event.available_seats += booking.seat_count
-        
-        db.session.delete(booking)
-        db.session.commit()
-        
+        cancelled, available_seats = run_with_retry(cancel, immediate=True)
+        if not cancelled:
+            return jsonify({"error": "Booking not found"}), 404
+        catalog_cache.invalidate_event(event_id)
+        live_hub.publish(event_id)
+
         return jsonify({
             "message": "Booking cancelled successfully",
-            "available_seats": event.available_seats if event else 0
+            "available_seats": available_seats if available_seats is not None else 0
         }), 200
     except Exception as e:
         db.session.rollback()
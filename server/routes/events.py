@@ -1,9 +1,32 @@
 # server/routes/events.py
-from flask import Blueprint, request, jsonify, current_app
+import threading
+from flask import Blueprint, request, jsonify, current_app, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from models import Event, User, db
-from extensions import db
+from sqlalchemy import select, insert
+from models import Booking, Event, User, EventStats, EventDailyStats, db
+from extensions import db, catalog_cache, live_hub
+from queries import (
+    parse_event_filters, events_query, encode_cursor, catalog_version, catalog_validators, event_version,
+    has_related, count_related
+)
+from conditional import make_etag, not_modified, apply_validators
+from serializers import EVENT_COLUMNS, ARCHIVED_EVENT_COLUMNS, encode_events, encode_event, encode_search_hits
+from search import MAX_SEARCH_RESULTS, SearchUnavailable, ensure_search_available, parse_search_terms, search_query
+from export import EXPORT_FORMATS, stream_export
+from reservations import (
+    resize_event, clear_event_shards, run_with_retry, BULK_MODES, CapacityBelowBooked, EventNotFound, SeatsUnavailable
+)
+from authz import current_user_is_organizer
+from catalog import bump_catalog_version
+from routing import read_only
+from metrics import query_budget
+from ratelimit import rate_limit
+from stats import clear_event_stats
+from holds import create_hold, clear_event_holds
+from outbox import enqueue_outbox
+from live import LiveHubFull, encode_message
+from waitlist import AlreadyWaiting, join_waitlist, leave_waitlist, promote_waitlist, clear_event_waitlist
 
 event_bp = Blueprint('events', __name__)
  
@@ -16,14 +39,206 @@ def handle_options():
         response.headers.add("Access-Control-Allow-Methods", "GET,POST,PUT,DELETE,OPTIONS")
         return response
 
-# Get all events (public)
+REQUIRED_EVENT_FIELDS = ['title', 'date', 'location', 'max_seats', 'category', 'price']
+
+# Most events a single bulk request may create
+MAX_BULK_EVENTS = 500
+
+def validate_event_payload(data, organizer_id):
+    # Returns (column values, None) for a valid create payload, or (None, error body)
+    if not isinstance(data, dict) or not all(field in data for field in REQUIRED_EVENT_FIELDS):
+        return None, {
+            'error': 'Missing required fields',
+            'required_fields': REQUIRED_EVENT_FIELDS
+        }
+
+    try:
+        max_seats = int(data['max_seats'])
+        price = float(data['price'])
+        event_date = datetime.fromisoformat(data['date'])
+    except (ValueError, TypeError) as e:
+        return None, {'error': 'Invalid data format', 'details': str(e)}
+
+    # Validate field types and constraints
+    if max_seats <= 0:
+        return None, {'error': 'max_seats must be positive'}
+    if price < 0:
+        return None, {'error': 'price cannot be negative'}
+    if event_date <= datetime.utcnow():
+        return None, {'error': 'Event date must be in the future'}
+
+    return {
+        'title': data['title'],
+        'description': data.get('description', ''),
+        'date': event_date,
+        'location': data['location'],
+        'max_seats': max_seats,
+        'available_seats': max_seats,
+        'organizer_id': organizer_id,
+        'category': data['category'],
+        'price': price
+    }, None
+
+# Get events (public), one keyset page at a time
 @event_bp.route("", methods=["GET", "OPTIONS"])
+@read_only
 def get_events():
     if request.method == "OPTIONS":
         return {}, 200
-        
-    events = Event.query.all()
-    return jsonify([event.to_dict() for event in events]), 200
+
+    # The catalog version is read first: a matching If-None-Match is answered
+    # without touching the cache, the ORM or the serializer
+    etag, last_modified = catalog_validators(catalog_version())
+    response = not_modified(etag, last_modified)
+    if response is not None:
+        return response
+
+    # Pages are cached pre-encoded, keyed by the normalized query string and
+    # tagged with the catalog ETag they were built at
+    page_key = tuple(sorted(request.args.items(multi=True)))
+    page = catalog_cache.get_page(page_key)
+    if page is None or page[0] != etag:
+        try:
+            filters = parse_event_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': 'Invalid query parameters', 'details': str(e)}), 400
+
+        rows = db.session.execute(
+            events_query(filters, columns=EVENT_COLUMNS, archived_columns=ARCHIVED_EVENT_COLUMNS)
+        ).all()
+
+        next_cursor = None
+        if len(rows) > filters['limit']:
+            rows = rows[:filters['limit']]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+
+        page = (etag, encode_events(rows), next_cursor)
+        catalog_cache.set_page(page_key, page)
+
+    _, body, next_cursor = page
+    response = current_app.response_class(body, mimetype='application/json')
+    # The body stays a plain list; the cursor for the next page travels in a header
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return apply_validators(response, etag, last_modified), 200
+
+# Full-text search over title, description and location (public)
+@event_bp.route("/search", methods=["GET", "OPTIONS"])
+@read_only
+def search_events():
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    terms = parse_search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({'error': 'Missing search query', 'details': 'q is required'}), 400
+
+    try:
+        filters = parse_event_filters(request.args)
+        offset = int(request.args.get('offset', 0))
+    except ValueError as e:
+        return jsonify({'error': 'Invalid query parameters', 'details': str(e)}), 400
+
+    try:
+        ensure_search_available()
+    except SearchUnavailable as e:
+        return jsonify({'error': 'Search unavailable', 'details': str(e)}), e.status
+
+    limit = min(filters['limit'], MAX_SEARCH_RESULTS)
+    rows = db.session.execute(search_query(terms, filters, limit, max(offset, 0))).all()
+    return current_app.response_class(encode_search_hits(rows), mimetype='application/json'), 200
+
+# Catalog cache counters, for sizing CATALOG_CACHE_SIZE / CATALOG_CACHE_TTL (organizer only)
+@event_bp.route("/cache/stats", methods=["GET"])
+@jwt_required()
+def get_cache_stats():
+    if not current_user_is_organizer():
+        return jsonify({"error": "Unauthorized: Organizer access required"}), 403
+    return jsonify(catalog_cache.stats()), 200
+
+# Stream the whole catalog (public) as NDJSON or CSV
+@event_bp.route("/export", methods=["GET", "OPTIONS"])
+@read_only
+def export_events():
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'Invalid format', 'formats': list(EXPORT_FORMATS)}), 400
+
+    stmt = select(*EVENT_COLUMNS).order_by(Event.id)
+    return stream_export(stmt, fmt, 'events')
+
+# Stream the bookings of one event (organizer only)
+@event_bp.route("/<int:event_id>/bookings/export", methods=["GET", "OPTIONS"])
+@read_only
+@jwt_required()
+def export_event_bookings(event_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'Invalid format', 'formats': list(EXPORT_FORMATS)}), 400
+
+    organizer_id = db.session.scalar(select(Event.organizer_id).where(Event.id == event_id))
+    if organizer_id is None:
+        abort(404)
+
+    current_user_id = get_jwt_identity()
+    if str(organizer_id) != str(current_user_id):
+        current_app.logger.warning(f"Unauthorized bookings export of event {event_id} by user {current_user_id}")
+        return jsonify({"error": "Unauthorized: Not the event organizer"}), 403
+
+    stmt = select(
+        Booking.id, Booking.user_id, User.name.label('user_name'),
+        User.email.label('user_email'), Booking.seat_count, Booking.booking_date
+    ).join(
+        User, Booking.user_id == User.id
+    ).where(
+        Booking.event_id == event_id
+    ).order_by(Booking.id)
+    return stream_export(stmt, fmt, f'event-{event_id}-bookings')
+
+# Booking statistics for one event (organizer only), read from the rollup tables
+@event_bp.route("/<int:event_id>/stats", methods=["GET", "OPTIONS"])
+@read_only
+@jwt_required()
+def get_event_stats(event_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    event = db.session.execute(
+        select(Event.organizer_id, Event.max_seats, Event.available_seats).where(Event.id == event_id)
+    ).first()
+    if event is None:
+        abort(404)
+
+    current_user_id = get_jwt_identity()
+    if str(event.organizer_id) != str(current_user_id):
+        current_app.logger.warning(f"Unauthorized stats request for event {event_id} by user {current_user_id}")
+        return jsonify({"error": "Unauthorized: Not the event organizer"}), 403
+
+    totals = db.session.get(EventStats, event_id)
+    daily = db.session.execute(
+        select(EventDailyStats.day, EventDailyStats.bookings_count, EventDailyStats.seats_booked, EventDailyStats.revenue)
+        .where(EventDailyStats.event_id == event_id).order_by(EventDailyStats.day)
+    ).all()
+
+    return jsonify({
+        "event_id": event_id,
+        "bookings_count": totals.bookings_count if totals else 0,
+        "seats_booked": totals.seats_booked if totals else 0,
+        "revenue": float(totals.revenue) if totals else 0.0,
+        "max_seats": event.max_seats,
+        "available_seats": event.available_seats,
+        "fill_rate": round((event.max_seats - event.available_seats) / event.max_seats, 4) if event.max_seats else 0.0,
+        "daily": [
+            {"day": day.isoformat(), "bookings_count": count, "seats_booked": seats, "revenue": float(revenue)}
+            for day, count, seats, revenue in daily
+        ]
+    }), 200
 
 # Create event (organizer only)
 @event_bp.route('', methods=['POST', 'OPTIONS'])
@@ -34,47 +249,21 @@ def create_event():
         
     try:
         current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
         
-        if not user or not user.is_organizer:
+        if not current_user_is_organizer():
             return jsonify({'error': 'Unauthorized'}), 403
 
         data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['title', 'date', 'location', 'max_seats', 'category', 'price']
-        if not all(field in data for field in required_fields):
-            return jsonify({
-                'error': 'Missing required fields',
-                'required_fields': required_fields
-            }), 400
-        
-        # Validate field types and constraints
-        if int(data['max_seats']) <= 0:
-            return jsonify({'error': 'max_seats must be positive'}), 400
-            
-        if float(data['price']) < 0:
-            return jsonify({'error': 'price cannot be negative'}), 400
-            
-        event_date = datetime.fromisoformat(data['date'])
-        if event_date <= datetime.utcnow():
-            return jsonify({'error': 'Event date must be in the future'}), 400
-        
+        values, error = validate_event_payload(data, current_user_id)
+        if error:
+            return jsonify(error), 400
+
         # Create the event
-        event = Event(
-            title=data['title'],
-            description=data.get('description', ''),
-            date=event_date,
-            location=data['location'],
-            max_seats=int(data['max_seats']),
-            available_seats=int(data['max_seats']),
-            organizer_id=current_user_id,
-            category=data['category'],
-            price=float(data['price'])
-        )
+        event = Event(**values)
         
         db.session.add(event)
         db.session.commit()
+        catalog_cache.invalidate_event(event.id)
         
         return jsonify({
             'message': 'Event created successfully',
@@ -89,17 +278,213 @@ def create_event():
         current_app.logger.error(f"Error creating event: {str(e)}")
         return jsonify({'error': 'Server error', 'details': str(e)}), 500
     
+# Create many events in one transaction (organizer only)
+@event_bp.route('/bulk', methods=['POST', 'OPTIONS'])
+@jwt_required()
+def create_events_bulk():
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    current_user_id = get_jwt_identity()
+    if not current_user_is_organizer():
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    data = request.get_json() or {}
+    items = data.get('events')
+    mode = data.get('mode', 'all_or_nothing')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'events must be a non-empty list'}), 400
+    if len(items) > MAX_BULK_EVENTS:
+        return jsonify({'error': f'At most {MAX_BULK_EVENTS} events per request'}), 400
+    if mode not in BULK_MODES:
+        return jsonify({'error': 'Invalid mode', 'modes': list(BULK_MODES)}), 400
+
+    # Validate everything in one pass before touching the database
+    results = []
+    rows = []
+    for index, item in enumerate(items):
+        values, error = validate_event_payload(item, current_user_id)
+        if error:
+            results.append({'index': index, 'status': 'error', **error})
+        else:
+            results.append({'index': index, 'status': 'created'})
+            rows.append((index, values))
+
+    failed = len(items) - len(rows)
+    if (failed and mode == 'all_or_nothing') or not rows:
+        return jsonify({'created': 0, 'failed': failed, 'results': results}), 400
+
+    try:
+        # One multi-row INSERT; RETURNING hands back ids in parameter order
+        event_ids = db.session.scalars(
+            insert(Event).returning(Event.id, sort_by_parameter_order=True),
+            [values for _, values in rows]
+        ).all()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk creating events: {str(e)}")
+        return jsonify({'error': 'Server error', 'details': str(e)}), 500
+
+    catalog_cache.invalidate_events(event_ids)
+    for (index, _), event_id in zip(rows, event_ids):
+        results[index]['event_id'] = event_id
+
+    return jsonify({
+        'created': len(event_ids),
+        'failed': failed,
+        'results': results
+    }), 207 if failed else 201
+
 # Get single event (public)
 @event_bp.route("/<int:event_id>", methods=["GET", "OPTIONS"])
+@read_only
 def get_event(event_id):
     if request.method == "OPTIONS":
         return {}, 200
         
-    event = Event.query.get_or_404(event_id)
-    return jsonify(event.to_dict()), 200
+    current = event_version(event_id)
+    if current is None:
+        abort(404)
+    version, last_modified = current
+    etag = make_etag("event", event_id, version)
+    response = not_modified(etag, last_modified)
+    if response is not None:
+        return response
+
+    # Cached bodies are tagged with the version they were serialized at
+    cached = catalog_cache.get_event(event_id)
+    if cached is None or cached[0] != version:
+        row = db.session.execute(
+            select(*EVENT_COLUMNS).where(Event.id == event_id)
+        ).one_or_none()
+        if row is None:
+            abort(404)
+        cached = (version, encode_event(row))
+        catalog_cache.set_event(event_id, cached)
+
+    response = current_app.response_class(cached[1], mimetype='application/json')
+    return apply_validators(response, etag, last_modified), 200
+
+# Live seat availability as Server-Sent Events, instead of polling get_event
+@event_bp.route("/<int:event_id>/live", methods=["GET", "OPTIONS"])
+def live_event(event_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    row = db.session.execute(
+        select(Event.version, Event.available_seats, Event.max_seats).where(Event.id == event_id)
+    ).one_or_none()
+    if row is None:
+        abort(404)
+    ready = threading.Event()
+    try:
+        subscription = live_hub.subscribe(event_id, row.version, ready.set)
+    except LiveHubFull:
+        response = jsonify({"error": "Too many live connections, please retry later"})
+        response.headers["Retry-After"] = "30"
+        return response, 503
+    # The stream outlives the request; give its connection back now
+    db.session.remove()
+    first_message = encode_message(event_id, row.version, row.available_seats, row.max_seats)
+    return current_app.response_class(
+        live_hub.stream(subscription, ready, first_message), mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Hold seats while the user checks out; confirm with POST /api/holds/<id>/confirm
+@event_bp.route("/<int:event_id>/holds", methods=["POST", "OPTIONS"])
+@rate_limit("5/second burst 10")
+@jwt_required()
+def create_event_hold(event_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    data = request.get_json() or {}
+    try:
+        seat_count = int(data['seat_count'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Invalid data format"}), 400
+    if seat_count <= 0:
+        return jsonify({"error": "Seat count must be positive"}), 400
+
+    try:
+        seat_hold, available_seats = create_hold(int(get_jwt_identity()), event_id, seat_count)
+        catalog_cache.invalidate_event(event_id)
+        live_hub.publish(event_id)
+        return jsonify({
+            "message": "Seats held",
+            "hold": seat_hold.to_dict(),
+            "available_seats": available_seats
+        }), 201
+    except EventNotFound:
+        return jsonify({"error": "Event not found"}), 404
+    except SeatsUnavailable as e:
+        return jsonify({
+            "error": "Not enough seats available",
+            "available_seats": e.available_seats
+        }), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Hold creation error: {str(e)}")
+        return jsonify({"error": "Failed to hold seats"}), 500
+
+# Join the FIFO waitlist of a sold-out event instead of polling it; waiting
+# users are booked automatically when seats come back
+@event_bp.route("/<int:event_id>/waitlist", methods=["POST", "OPTIONS"])
+@rate_limit("5/second burst 10")
+@jwt_required()
+def join_event_waitlist(event_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    data = request.get_json() or {}
+    try:
+        seat_count = int(data['seat_count'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Invalid data format"}), 400
+    if seat_count <= 0:
+        return jsonify({"error": "Seat count must be positive"}), 400
+
+    try:
+        entry, booking_id, position = join_waitlist(int(get_jwt_identity()), event_id, seat_count)
+        if booking_id:
+            catalog_cache.invalidate_event(event_id)
+            live_hub.publish(event_id)
+            return jsonify({"message": "Seats were free: booking created", "status": "booked",
+                            "booking_id": booking_id}), 201
+        return jsonify({"message": "Added to the waitlist", "status": "waiting",
+                        "entry": entry, "position": position}), 201
+    except EventNotFound:
+        return jsonify({"error": "Event not found"}), 404
+    except AlreadyWaiting:
+        return jsonify({"error": "Already on the waitlist for this event"}), 409
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Waitlist join error: {str(e)}")
+        return jsonify({"error": "Failed to join the waitlist"}), 500
+
+@event_bp.route("/<int:event_id>/waitlist", methods=["DELETE", "OPTIONS"])
+@jwt_required()
+def leave_event_waitlist(event_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    try:
+        if not leave_waitlist(int(get_jwt_identity()), event_id):
+            return jsonify({"error": "Not on the waitlist for this event"}), 404
+        catalog_cache.invalidate_event(event_id)
+        live_hub.publish(event_id)
+        return jsonify({"message": "Left the waitlist"}), 200
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Waitlist leave error: {str(e)}")
+        return jsonify({"error": "Failed to leave the waitlist"}), 500
 
 # Update event (organizer only)
 @event_bp.route("/<int:event_id>", methods=["PUT", "OPTIONS"])
+# Field edits, the resize and the waitlist promotion pass it allows
+@query_budget(21)
 @jwt_required()
 def update_event(event_id):
     if request.method == "OPTIONS":
@@ -122,29 +507,42 @@ def update_event(event_id):
 
     data = request.get_json()
     try:
-        if 'title' in data:
-            event.title = data['title']
-        if 'description' in data:
-            event.description = data['description']
+        # Parsed up front: the transaction below may be replayed
+        changes = {field: data[field] for field in ('title', 'description', 'location') if field in data}
         if 'date' in data:
             new_date = datetime.fromisoformat(data['date'])
             if new_date <= datetime.utcnow():
                 return jsonify({"error": "Event date must be in the future"}), 400
-            event.date = new_date
-        if 'location' in data:
-            event.location = data['location']
+            changes['date'] = new_date
+        new_max = None
         if 'max_seats' in data:
             new_max = int(data['max_seats'])
             if new_max <= 0:
                 return jsonify({"error": "max_seats must be positive"}), 400
-            if new_max < (event.max_seats - event.available_seats):
-                return jsonify({"error": "Cannot reduce seats below booked count"}), 400
-            event.available_seats += new_max - event.max_seats
-            event.max_seats = new_max
-        
-        db.session.commit()
+
+        organizer_id = event.organizer_id
+
+        def update():
+            for field, value in changes.items():
+                setattr(event, field, value)
+            if new_max is not None:
+                # Applied as one guarded UPDATE so concurrent bookings are not lost
+                if not resize_event(event_id, new_max):
+                    raise CapacityBelowBooked()
+                # Added seats go to the waitlist in the same transaction
+                promote_waitlist(event_id)
+            enqueue_outbox("event.updated", [{"event_id": event_id, "organizer_id": organizer_id,
+                                              "fields": sorted(data)}])
+
+        # IMMEDIATE like bookings and cancellations: the resize and the
+        # promotions it allows write to rows those requests write too
+        run_with_retry(update, immediate=True)
+        catalog_cache.invalidate_event(event_id)
+        live_hub.publish(event_id)
         current_app.logger.info(f"Event {event_id} updated successfully by user {current_user_id}")
         return jsonify(event.to_dict()), 200
+    except CapacityBelowBooked:
+        return jsonify({"error": "Cannot reduce seats below booked count"}), 400
     except ValueError as e:
         db.session.rollback()
         current_app.logger.error(f"ValueError in update_event: {str(e)}")
@@ -159,6 +557,8 @@ def update_event(event_id):
 
 # Delete event (organizer only)
 @event_bp.route("/<int:event_id>", methods=["DELETE", "OPTIONS"])
+# One DELETE per table holding rows of the event
+@query_budget(13)
 @jwt_required()
 def delete_event(event_id):
     if request.method == "OPTIONS":
@@ -187,14 +587,23 @@ def delete_event(event_id):
 
     try:
         # Check if there are any bookings for this event
-        if event.bookings:
+        if has_related(Event.bookings, event_id):
             return jsonify({
                 "error": "Cannot delete event with existing bookings",
-                "bookings_count": len(event.bookings)
+                "bookings_count": count_related(Event.bookings, event_id)
             }), 422
 
+        clear_event_stats(event_id)
+        clear_event_holds(event_id)
+        clear_event_waitlist(event_id)
+        clear_event_shards(event_id)
+        enqueue_outbox("event.deleted", [{"event_id": event_id, "organizer_id": event.organizer_id,
+                                          "title": event.title}])
         db.session.delete(event)
+        bump_catalog_version()
         db.session.commit()
+        catalog_cache.invalidate_event(event_id)
+        live_hub.publish(event_id)
         
         current_app.logger.info(f"Event {event_id} deleted successfully")
         return jsonify({
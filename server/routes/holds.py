@@ -0,0 +1,66 @@
+# server/routes/holds.py
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from extensions import db, catalog_cache, live_hub
+from metrics import query_budget
+from holds import HoldNotFound, HoldExpired, HoldForbidden, confirm_hold, release_hold
+
+hold_bp = Blueprint('holds', __name__)
+
+@hold_bp.before_request
+def handle_options():
+    if request.method == "OPTIONS":
+        response = jsonify({"message": "Preflight OK"})
+        response.headers.add("Access-Control-Allow-Origin", "http://localhost:3000")
+        response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
+        response.headers.add("Access-Control-Allow-Methods", "POST,DELETE,OPTIONS")
+        return response
+
+def hold_error(error):
+    if isinstance(error, HoldForbidden):
+        return jsonify({"error": "Unauthorized: You can only use your own holds"}), 403
+    if isinstance(error, HoldExpired):
+        return jsonify({"error": "Hold has expired"}), 410
+    return jsonify({"error": "Hold not found"}), 404
+
+@hold_bp.route('/<int:hold_id>/confirm', methods=['POST', 'OPTIONS'])
+@query_budget(11)
+@jwt_required()
+def confirm(hold_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    try:
+        booking, available_seats = confirm_hold(hold_id, int(get_jwt_identity()))
+        return jsonify({
+            "message": "Booking created successfully",
+            "booking": booking,
+            "available_seats": available_seats
+        }), 201
+    except (HoldNotFound, HoldExpired, HoldForbidden) as e:
+        return hold_error(e)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Hold confirmation error: {str(e)}")
+        return jsonify({"error": "Failed to confirm hold"}), 500
+
+@hold_bp.route('/<int:hold_id>', methods=['DELETE', 'OPTIONS'])
+@jwt_required()
+def release(hold_id):
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    try:
+        event_id, available_seats = release_hold(hold_id, int(get_jwt_identity()))
+        catalog_cache.invalidate_event(event_id)
+        live_hub.publish(event_id)
+        return jsonify({
+            "message": "Hold released",
+            "available_seats": available_seats if available_seats is not None else 0
+        }), 200
+    except (HoldNotFound, HoldForbidden) as e:
+        return hold_error(e)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Hold release error: {str(e)}")
+        return jsonify({"error": "Failed to release hold"}), 500
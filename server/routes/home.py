@@ -0,0 +1,122 @@
+# server/routes/home.py
+from datetime import datetime
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from extensions import db, catalog_cache
+from queries import (
+    parse_event_filters, events_query, encode_cursor, category_facets_query, home_version_query,
+    my_bookings_query, catalog_validators
+)
+from conditional import make_etag, not_modified, apply_validators
+from serializers import (
+    EVENT_COLUMNS, ARCHIVED_EVENT_COLUMNS, MY_BOOKING_COLUMNS, ARCHIVED_BOOKING_COLUMNS,
+    encode_events, encode_categories, encode_bookings, encode_home
+)
+from routing import read_only_blueprint
+
+home_bp = Blueprint('home', __name__)
+
+@home_bp.before_request
+def handle_options():
+    if request.method == "OPTIONS":
+        response = jsonify({"message": "Preflight OK"})
+        response.headers.add("Access-Control-Allow-Origin", "http://localhost:3000")
+        response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
+        response.headers.add("Access-Control-Allow-Methods", "GET,OPTIONS")
+        return response
+
+def home_args(args):
+    # "Upcoming" starts at midnight UTC so the page cache key only changes
+    # once a day; any GET /api/events parameter may narrow the listing
+    args = args.copy()
+    if not args.get("date_from"):
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        args["date_from"] = today.isoformat()
+    return args
+
+def home_validators(version, date_from, user_id=None):
+    # version is a home_version_query row; returns (etag, last_modified,
+    # catalog etag), the last being what GET /api/events tags its pages with
+    catalog_etag, catalog_modified = catalog_validators(version[:4])
+    if user_id is None:
+        return make_etag("home", date_from, catalog_etag), catalog_modified, catalog_etag
+    bookings_count, bookings_max_id, last_booked, last_event_change = version[4:]
+    last_modified = max(filter(None, (catalog_modified, last_booked, last_event_change)), default=None)
+    etag = make_etag("home", date_from, catalog_etag, user_id, bookings_count, bookings_max_id, last_modified or 0)
+    return etag, last_modified, catalog_etag
+
+def optional_identity():
+    # Like @jwt_required(optional=True), except that an expired, revoked or
+    # malformed token also gets the anonymous page instead of a 401/422: a
+    # browser holding a stale token must still see the landing page
+    try:
+        verify_jwt_in_request(optional=True)
+    except (JWTExtendedException, PyJWTError):
+        return None
+    return get_jwt_identity()
+
+def home_catalog_keys(args):
+    # Page cache keys for the events page (shared with GET /api/events) and the facets
+    return tuple(sorted(args.items(multi=True))), ("categories", args["date_from"])
+
+# Everything the landing pages need in one request: the first page of
+# upcoming events, category facets and, when a token is sent, the caller's
+# bookings. Saves the browser two requests, their preflights and two JWT
+# decodes per page load; revalidation is a single query.
+@home_bp.route('', methods=['GET', 'OPTIONS'])
+def get_home():
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    identity = optional_identity()
+    user_id = int(identity) if identity is not None else None
+    args = home_args(request.args)
+    try:
+        filters = parse_event_filters(args)
+    except ValueError as e:
+        return jsonify({'error': 'Invalid query parameters', 'details': str(e)}), 400
+
+    version = db.session.execute(home_version_query(user_id)).one()
+    etag, last_modified, catalog_etag = home_validators(version, filters['date_from'], user_id)
+    private = user_id is not None
+    response = not_modified(etag, last_modified, private=private)
+    if response is not None:
+        return response
+
+    events_body, next_cursor, categories_body = _catalog_parts(args, filters, catalog_etag)
+
+    bookings_body = None
+    if user_id is not None:
+        archived_columns = ARCHIVED_BOOKING_COLUMNS if filters['include_past'] else None
+        bookings_body = encode_bookings(db.session.execute(
+            my_bookings_query(user_id, MY_BOOKING_COLUMNS, archived_columns)
+        ).all())
+
+    body = encode_home(events_body, next_cursor, categories_body, bookings_body)
+    response = current_app.response_class(body, mimetype='application/json')
+    return apply_validators(response, etag, last_modified, private=private), 200
+
+def _catalog_parts(args, filters, etag):
+    page_key, facets_key = home_catalog_keys(args)
+    page = catalog_cache.get_page(page_key)
+    if page is None or page[0] != etag:
+        rows = db.session.execute(
+            events_query(filters, columns=EVENT_COLUMNS, archived_columns=ARCHIVED_EVENT_COLUMNS)
+        ).all()
+        next_cursor = None
+        if len(rows) > filters['limit']:
+            rows = rows[:filters['limit']]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+        page = (etag, encode_events(rows), next_cursor)
+        catalog_cache.set_page(page_key, page)
+
+    facets = catalog_cache.get_page(facets_key)
+    if facets is None or facets[0] != etag:
+        facets = (etag, encode_categories(db.session.execute(category_facets_query(filters['date_from'])).all()), None)
+        catalog_cache.set_page(facets_key, facets)
+    return page[1], page[2], facets[1]
+
+# Every view here only reads
+read_only_blueprint(home_bp)
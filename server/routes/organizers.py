@@ -0,0 +1,40 @@
+# server/routes/organizers.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from extensions import db
+from models import OrganizerStats
+from authz import current_user_is_organizer
+from routing import read_only_blueprint
+
+organizer_bp = Blueprint('organizers', __name__)
+
+@organizer_bp.before_request
+def handle_options():
+    if request.method == "OPTIONS":
+        response = jsonify({"message": "Preflight OK"})
+        response.headers.add("Access-Control-Allow-Origin", "http://localhost:3000")
+        response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
+        response.headers.add("Access-Control-Allow-Methods", "GET,OPTIONS")
+        return response
+
+# Booking totals across all of the current organizer's events
+@organizer_bp.route('/me/stats', methods=['GET', 'OPTIONS'])
+@jwt_required()
+def get_my_stats():
+    if request.method == "OPTIONS":
+        return {}, 200
+
+    if not current_user_is_organizer():
+        return jsonify({"error": "Unauthorized: Organizer access required"}), 403
+
+    current_user_id = int(get_jwt_identity())
+    stats = db.session.get(OrganizerStats, current_user_id)
+    return jsonify({
+        "organizer_id": current_user_id,
+        "bookings_count": stats.bookings_count if stats else 0,
+        "seats_booked": stats.seats_booked if stats else 0,
+        "revenue": float(stats.revenue) if stats else 0.0
+    }), 200
+
+# Every view here only reads
+read_only_blueprint(organizer_bp)
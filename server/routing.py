@@ -0,0 +1,187 @@
+# server/routing.py
+import random
+import sqlite3
+import threading
+import time
+from functools import wraps
+import click
+from flask import current_app, g, has_request_context, request
+from flask.cli import AppGroup
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event as sa_event
+from sqlalchemy.exc import DBAPIError
+from cache import TTLCache
+
+READ_METHODS = ("GET", "HEAD")
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+class RoutingSession(Session):
+    # Sends reads from read-only views to a replica. Flushes, DML statements
+    # and sessions holding unflushed changes always go to the primary.
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if clause is not None and getattr(clause, "is_dml", False):
+                if has_request_context():
+                    g._routing_primary = True
+            elif not (self._flushing or self.new or self.dirty or self.deleted):
+                replica_router = current_app.extensions.get("replica_router")
+                engine = replica_router.bind_for_read() if replica_router else None
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+def read_only(view):
+    # Lets GET/HEAD requests to this view read from a replica; place it
+    # directly under the route decorator
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        replica_router = current_app.extensions.get("replica_router")
+        if replica_router is None or request.method not in READ_METHODS:
+            return view(*args, **kwargs)
+        return replica_router.run_read_only(view, args, kwargs)
+    wrapper._read_only = True
+    return wrapper
+
+def read_only_blueprint(blueprint):
+    # read_only for every view of the blueprint; call after its routes are defined
+    def wrap_views(state):
+        prefix = f"{state.name}."
+        for endpoint, view in list(state.app.view_functions.items()):
+            if endpoint.startswith(prefix) and not getattr(view, "_read_only", False):
+                state.app.view_functions[endpoint] = read_only(view)
+    blueprint.record_once(wrap_views)
+
+class ReplicaRouter:
+    # Replica binds come from DATABASE_REPLICA_URIS (comma separated) and are
+    # registered as SQLALCHEMY_BINDS "replica_0", "replica_1", ... A replica
+    # that errors is skipped for REPLICA_RETRY_SECONDS, and the request that
+    # hit the error is replayed on the primary. After a successful write a
+    # user reads from the primary for READ_YOUR_WRITES_SECONDS.
+    def __init__(self):
+        self.bind_keys = []
+        self.retry_seconds = 30.0
+        self._down_until = {}
+        self._lock = threading.Lock()
+        self._recent_writers = TTLCache(maxsize=10000, ttl=5)
+
+    @staticmethod
+    def replica_binds(uris):
+        # SQLALCHEMY_BINDS entries for a comma-separated list of replica URIs
+        return {f"replica_{i}": uri.strip() for i, uri in enumerate(uris.split(",")) if uri.strip()}
+
+    def init_app(self, app):
+        self.bind_keys = [key for key in app.config.get("SQLALCHEMY_BINDS", {}) if key.startswith("replica_")]
+        self.retry_seconds = float(app.config.get("REPLICA_RETRY_SECONDS", 30))
+        self._recent_writers = TTLCache(
+            maxsize=int(app.config.get("READ_YOUR_WRITES_USERS", 10000)),
+            ttl=float(app.config.get("READ_YOUR_WRITES_SECONDS", 5))
+        )
+        app.after_request(self._after_request)
+        with app.app_context():
+            from extensions import db
+            for key in self.bind_keys:
+                sa_event.listen(db.engines[key], "handle_error", self._on_replica_error(key))
+        app.extensions["replica_router"] = self
+
+    def _on_replica_error(self, key):
+        def handle_error(context):
+            # Any error counts: a replica missing a table is as unusable as a dead one
+            with self._lock:
+                self._down_until[key] = time.monotonic() + self.retry_seconds
+            if has_request_context():
+                g._replica_failed = True
+        return handle_error
+
+    def _identity(self):
+        try:
+            return get_jwt_identity()
+        except RuntimeError:
+            pass
+        # Views without jwt_required (the public catalog) still recognise a
+        # signed-in user, so an organizer sees the event they just created
+        if "Authorization" not in request.headers:
+            return None
+        try:
+            verify_jwt_in_request(optional=True)
+            return get_jwt_identity()
+        except Exception:
+            return None
+
+    def bind_for_read(self):
+        if not self.bind_keys or not has_request_context() or not g.get("_routing_read_only"):
+            return None
+        if g.get("_routing_primary"):
+            return None
+        if "_routing_replica" not in g:
+            identity = self._identity()
+            if identity is not None and self._recent_writers.get(str(identity)):
+                g._routing_primary = True
+                return None
+            now = time.monotonic()
+            with self._lock:
+                healthy = [key for key in self.bind_keys if self._down_until.get(key, 0) <= now]
+            if not healthy:
+                g._routing_primary = True
+                return None
+            # One replica per request so version checks and reads agree
+            g._routing_replica = random.choice(healthy)
+        from extensions import db
+        return db.engines[g._routing_replica]
+
+    def run_read_only(self, view, args, kwargs):
+        if not self.bind_keys:
+            return view(*args, **kwargs)
+        g._routing_read_only = True
+        try:
+            response = view(*args, **kwargs)
+        except DBAPIError:
+            if not g.get("_replica_failed"):
+                raise
+            response = None
+        if g.pop("_replica_failed", False):
+            replica = g.pop("_routing_replica", None)
+            current_app.logger.warning(f"Replica {replica} failed for {request.path}, retrying on primary")
+            current_app.extensions["sqlalchemy"].session.rollback()
+            g._routing_primary = True
+            response = view(*args, **kwargs)
+        return response
+
+    def _after_request(self, response):
+        if self.bind_keys and request.method in WRITE_METHODS and response.status_code < 400:
+            identity = self._identity()
+            if identity is not None:
+                self._recent_writers.set(str(identity), True)
+        return response
+
+    def collect(self):
+        # Metrics collector, see Metrics.register_collector
+        now = time.monotonic()
+        with self._lock:
+            healthy = [({"bind": key}, int(self._down_until.get(key, 0) <= now)) for key in self.bind_keys]
+        yield "db_replica_healthy", "gauge", "1 while a read replica is in rotation.", healthy
+
+replicas_cli = AppGroup("replicas", help="Read replica commands.")
+
+@replicas_cli.command("sync")
+def sync_replicas_command():
+    """Copy a SQLite primary onto SQLite replica files (local testing)."""
+    from extensions import db
+    # Engine URLs, not config: Flask-SQLAlchemy resolves relative SQLite paths
+    primary = db.engine.url
+    if primary.get_backend_name() != "sqlite":
+        raise click.ClickException("replicas sync only copies SQLite databases")
+    source = sqlite3.connect(primary.database)
+    try:
+        for key in current_app.extensions["replica_router"].bind_keys:
+            engine = db.engines[key]
+            if engine.url.get_backend_name() != "sqlite":
+                click.echo(f"Skipping {key}: not a SQLite database")
+                continue
+            engine.dispose()
+            target = sqlite3.connect(engine.url.database)
+            source.backup(target)
+            target.close()
+            click.echo(f"Copied primary to {key} ({engine.url.database})")
+    finally:
+        source.close()
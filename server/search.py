@@ -0,0 +1,142 @@
+# server/search.py
+import re
+import click
+from flask.cli import AppGroup
+from sqlalchemy import event as sa_event, func, literal_column, select, table, column, text
+from extensions import db
+from models import Event
+from queries import apply_event_filters
+from serializers import EVENT_COLUMNS
+
+MAX_SEARCH_RESULTS = 50
+
+# Column weights for ranking: a hit in the title counts most, then location
+TITLE_WEIGHT, DESCRIPTION_WEIGHT, LOCATION_WEIGHT = 10.0, 1.0, 4.0
+
+# SQLite: external-content FTS5 index over events, kept in sync by triggers.
+# The update trigger only fires for indexed columns, so seat changes from
+# bookings never touch the index.
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, description, location,
+        content='events', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, description, location ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+]
+SQLITE_REBUILD = "INSERT INTO events_fts(events_fts) VALUES ('rebuild')"
+
+# Postgres: a generated, weighted tsvector column with a GIN index
+POSTGRES_DDL = [
+    """ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+]
+
+def install_search(connection):
+    if connection.dialect.name == "sqlite":
+        statements = SQLITE_DDL
+    elif connection.dialect.name == "postgresql":
+        statements = POSTGRES_DDL
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
+
+@sa_event.listens_for(Event.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    install_search(connection)
+
+class SearchUnavailable(Exception):
+    # status is 501 when the database has no full-text search, 503 when the
+    # index has not been created yet
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+# Engines whose index was found; a missing one is looked for again on every
+# search, so `flask search init` takes effect without a restart
+_indexed_engines = set()
+
+def ensure_search_available():
+    # Raises SearchUnavailable unless the session's database can answer search_query
+    bind = db.session.get_bind()
+    if bind in _indexed_engines:
+        return
+    if bind.dialect.name == "sqlite":
+        probe = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+    elif bind.dialect.name == "postgresql":
+        probe = ("SELECT 1 FROM information_schema.columns "
+                 "WHERE table_name = 'events' AND column_name = 'search_vector'")
+    else:
+        raise SearchUnavailable(f"Full-text search is not available on {bind.dialect.name}", 501)
+    if db.session.scalar(text(probe)) is None:
+        raise SearchUnavailable("The search index has not been created, run `flask search init`", 503)
+    _indexed_engines.add(bind)
+
+def parse_search_terms(raw):
+    # Only word characters reach the query syntax; every term is a prefix match
+    return re.findall(r"\w+", raw or "")[:10]
+
+def search_query(terms, filters, limit, offset=0):
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        fts = table("events_fts", column("rowid"))
+        fts_ref = literal_column("events_fts")
+        match = " ".join(f'"{term}"*' for term in terms)
+        rank = func.bm25(fts_ref, TITLE_WEIGHT, DESCRIPTION_WEIGHT, LOCATION_WEIGHT)
+        snippet = func.snippet(fts_ref, 1, "<mark>", "</mark>", "…", 12)
+        stmt = select(*EVENT_COLUMNS, snippet.label("snippet")).select_from(fts).join(
+            Event, Event.id == fts.c.rowid
+        ).where(fts_ref.op("MATCH")(match)).order_by(rank)
+    elif dialect == "postgresql":
+        vector = literal_column("events.search_vector")
+        query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        snippet = func.ts_headline(
+            "simple", Event.description, query,
+            "StartSel=<mark>, StopSel=</mark>, MaxWords=20, MinWords=5"
+        )
+        stmt = select(*EVENT_COLUMNS, snippet.label("snippet")).where(
+            vector.op("@@")(query)
+        ).order_by(func.ts_rank_cd(vector, query).desc())
+    else:
+        raise SearchUnavailable(f"Full-text search is not available on {dialect}", 501)
+
+    return apply_event_filters(stmt, filters).limit(limit).offset(offset)
+
+search_cli = AppGroup("search", help="Full-text search index commands.")
+
+@search_cli.command("init")
+def init_search_command():
+    """Create the search index on an existing database and fill it."""
+    with db.engine.begin() as connection:
+        install_search(connection)
+        if connection.dialect.name == "sqlite":
+            connection.execute(text(SQLITE_REBUILD))
+    click.echo("Search index ready")
+
+@search_cli.command("rebuild")
+def rebuild_search_command():
+    """Rebuild the SQLite FTS index from the events table."""
+    with db.engine.begin() as connection:
+        if connection.dialect.name == "sqlite":
+            connection.execute(text(SQLITE_REBUILD))
+    click.echo("Search index rebuilt")
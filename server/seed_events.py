@@ -1,23 +1,21 @@
 # backend/seed_events.py
+# Demo data, or a synthetic data set at production scale:
+#   python seed_events.py                      (the six sample events below)
+#   python seed_events.py --users 1000000 --events 100000 --bookings 5000000
+# Synthetic rows go in through Core multi-row INSERTs, one transaction per
+# --batch-size rows. Popularity is skewed the way real traffic is: a few hot
+# events take most bookings, some categories dominate, and dates spread over
+# the past and the coming year. --random-seed makes a run repeatable.
+import argparse
+import random
+import time
 from datetime import datetime, timedelta
-from models import db, Event, User
+from itertools import accumulate
+from sqlalchemy import func, insert, select, update
+from extensions import password_hasher
+from models import db, Event, User, Booking
 from app import create_app
 
-app = create_app()
-app.app_context().push()
-
-# Sample organizer user (if doesn't exist)
-organizer = User.query.filter_by(email='organizer@demo.com').first()
-if not organizer:
-    organizer = User(
-        email='organizer@demo.com',
-        name='Demo Organizer',
-        is_organizer=True
-    )
-    organizer.set_password('demo123')
-    db.session.add(organizer)
-    db.session.commit()
-
 # Sample events data
 sample_events = [
     {
@@ -88,7 +86,23 @@ sample_events = [
     }
 ]
 
+def get_or_create_organizer():
+    # Sample organizer user (if doesn't exist)
+    organizer = User.query.filter_by(email='organizer@demo.com').first()
+    if not organizer:
+        organizer = User(
+            email='organizer@demo.com',
+            name='Demo Organizer',
+            is_organizer=True
+        )
+        organizer.set_password('demo123')
+        db.session.add(organizer)
+        db.session.commit()
+    return organizer
+
 def seed_events():
+    organizer = get_or_create_organizer()
+
     # Check if events already exist
     existing_events = Event.query.count()
     if existing_events > 0:
@@ -114,5 +128,195 @@ def seed_events():
     db.session.commit()
     print(f"Successfully seeded {len(sample_events)} events")
 
+# Synthetic data set. Category and city weights give a long tail; every
+# synthetic user shares SYNTHETIC_PASSWORD so benchmarks can log in as anyone.
+SYNTHETIC_PASSWORD = "seed-password"
+CATEGORIES = [("Music", 30), ("Technology", 18), ("Food", 14), ("Business", 12),
+              ("Sport", 10), ("Art", 8), ("Health", 5), ("Theatre", 3)]
+CITIES = [("Paris", 25), ("New York", 20), ("London", 15), ("Berlin", 10), ("San Francisco", 10),
+          ("Montreal", 6), ("Lyon", 5), ("Austin", 4), ("Lisbon", 3), ("Seattle", 2)]
+VENUES = ["Arena", "Convention Center", "Park", "Hall", "Club", "Museum", "Theatre", "Loft"]
+ADJECTIVES = ["Annual", "Open Air", "Late Night", "Summer", "Winter", "Grand", "Local", "International"]
+NOUNS = {
+    "Music": ["Concert", "Festival", "Jam Session"], "Technology": ["Conference", "Meetup", "Hackathon"],
+    "Food": ["Tasting", "Market", "Festival"], "Business": ["Summit", "Pitch Night", "Workshop"],
+    "Sport": ["Tournament", "Run", "Match"], "Art": ["Exhibition", "Opening", "Fair"],
+    "Health": ["Retreat", "Workshop", "Class"], "Theatre": ["Premiere", "Play", "Improv Night"],
+}
+# Capacity tiers: mostly small venues, a few stadiums
+CAPACITIES = [(30, 20), (50, 25), (100, 25), (250, 15), (1000, 10), (5000, 5)]
+# Seats per booking
+SEAT_COUNTS = [(1, 55), (2, 30), (3, 8), (4, 7)]
+
+def zipf_weights(count, skew):
+    # Weight of each rank, heaviest first
+    return [1.0 / rank ** skew for rank in range(1, count + 1)]
+
+def cumulative(pairs):
+    values, weights = zip(*pairs)
+    return list(values), list(accumulate(weights))
+
+def next_id(model):
+    return (db.session.scalar(select(func.max(model.id))) or 0) + 1
+
+def insert_batches(model, rows, batch_size, label):
+    # One multi-row INSERT and one commit per batch; returns the row count
+    started = time.perf_counter()
+    batch, total = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.session.execute(insert(model), batch)
+            db.session.commit()
+            total += len(batch)
+            batch = []
+            print(f"  {label}: {total} rows, {total / (time.perf_counter() - started):.0f}/s", flush=True)
+    if batch:
+        db.session.execute(insert(model), batch)
+        db.session.commit()
+        total += len(batch)
+    print(f"{label}: {total} rows in {time.perf_counter() - started:.1f}s", flush=True)
+    return total
+
+def seed_users(count, organizers, batch_size):
+    # The first `organizers` users are organizers. Returns the id range.
+    first_id = next_id(User)
+    # Hashing is deliberately slow, so every user shares one hash
+    password_hash = password_hasher.hash(SYNTHETIC_PASSWORD)
+    now = datetime.utcnow()
+    rows = (
+        {"id": user_id, "email": f"user{user_id}@seed.test", "name": f"Seed User {user_id}",
+         "password_hash": password_hash, "is_organizer": user_id - first_id < organizers, "created_at": now}
+        for user_id in range(first_id, first_id + count)
+    )
+    insert_batches(User, rows, batch_size, "users")
+    return range(first_id, first_id + count)
+
+def seed_synthetic_events(count, organizer_ids, batch_size, rng, skew, past_fraction, horizon_days):
+    # Returns (first id, [max_seats], [date]) for the booking pass
+    first_id = next_id(Event)
+    categories, category_weights = cumulative(CATEGORIES)
+    cities, city_weights = cumulative(CITIES)
+    capacities, capacity_weights = cumulative(CAPACITIES)
+    # A handful of organizers run most events
+    organizer_weights = list(accumulate(zipf_weights(len(organizer_ids), skew)))
+    now = datetime.utcnow()
+    seats, dates = [], []
+
+    def rows():
+        for event_id in range(first_id, first_id + count):
+            category = rng.choices(categories, cum_weights=category_weights)[0]
+            city = rng.choices(cities, cum_weights=city_weights)[0]
+            max_seats = rng.choices(capacities, cum_weights=capacity_weights)[0]
+            offset = timedelta(days=rng.uniform(1, horizon_days))
+            date = now - offset if rng.random() < past_fraction else now + offset
+            seats.append(max_seats)
+            dates.append(date)
+            title = f"{rng.choice(ADJECTIVES)} {category} {rng.choice(NOUNS[category])} #{event_id}"
+            yield {
+                "id": event_id, "title": title,
+                "description": f"{title} at the {city} {rng.choice(VENUES)}",
+                "date": date, "location": f"{city} {rng.choice(VENUES)}",
+                "max_seats": max_seats, "available_seats": max_seats,
+                "organizer_id": rng.choices(organizer_ids, cum_weights=organizer_weights)[0],
+                "category": category, "image": None,
+                "price": 0 if rng.random() < 0.1 else round(rng.uniform(5, 150), 2),
+                "created_at": min(now, date) - timedelta(days=rng.uniform(1, 60)), "updated_at": now,
+            }
+
+    insert_batches(Event, rows(), batch_size, "events")
+    return first_id, seats, dates
+
+def seed_bookings(count, user_ids, first_event_id, seats, dates, batch_size, rng, skew):
+    # Zipf popularity over a shuffled event order, so hot events are spread
+    # across ids and categories. Bookings never exceed an event's capacity;
+    # the pass stops early once the events it draws from are full. Returns
+    # the seats left per event.
+    ranks = list(range(len(seats)))
+    rng.shuffle(ranks)
+    weights = zipf_weights(len(seats), skew)
+    event_weights = list(accumulate(weights[rank] for rank in ranks))
+    seat_counts, seat_weights = cumulative(SEAT_COUNTS)
+    remaining = list(seats)
+    now = datetime.utcnow()
+    state = {"misses": 0}
+
+    def rows():
+        made = 0
+        while made < count:
+            index = rng.choices(ranks, cum_weights=event_weights)[0]
+            seat_count = rng.choices(seat_counts, cum_weights=seat_weights)[0]
+            if remaining[index] < seat_count:
+                state["misses"] += 1
+                if state["misses"] > 10 * count + 1000:
+                    print("bookings: events are full, stopping early", flush=True)
+                    return
+                continue
+            remaining[index] -= seat_count
+            made += 1
+            # Booked up to two months before the event, and never in the future
+            booked_at = min(now, dates[index]) - timedelta(days=rng.uniform(0, 60))
+            yield {
+                "user_id": rng.choice(user_ids), "event_id": first_event_id + index,
+                "seat_count": seat_count, "booking_date": booked_at,
+            }
+
+    insert_batches(Booking, rows(), batch_size, "bookings")
+    return remaining
+
+def update_available_seats(first_event_id, seats, remaining, batch_size):
+    # Bulk UPDATE by primary key, only for events that took bookings
+    changed = [
+        {"id": first_event_id + index, "available_seats": left}
+        for index, (total, left) in enumerate(zip(seats, remaining)) if left != total
+    ]
+    for start in range(0, len(changed), batch_size):
+        db.session.execute(update(Event), changed[start:start + batch_size])
+        db.session.commit()
+    print(f"events: available seats updated for {len(changed)} events", flush=True)
+
+def seed_synthetic(users, events, bookings, organizers=None, batch_size=10000, random_seed=None,
+                   skew=1.1, past_fraction=0.3, horizon_days=365):
+    rng = random.Random(random_seed)
+    organizers = min(users, organizers or max(1, users // 200))
+    user_ids = seed_users(users, organizers, batch_size)
+    organizer_ids = list(user_ids[:organizers])
+    if events:
+        first_event_id, seats, dates = seed_synthetic_events(
+            events, organizer_ids, batch_size, rng, skew, past_fraction, horizon_days)
+        if bookings:
+            remaining = seed_bookings(bookings, user_ids, first_event_id, seats, dates, batch_size, rng, skew)
+            update_available_seats(first_event_id, seats, remaining, batch_size)
+            from stats import rebuild_stats
+            processed = rebuild_stats()
+            print(f"stats: rebuilt for {processed} events", flush=True)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the demo events, or a synthetic data set")
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--organizers", type=int, default=None, help="Default: one per 200 users")
+    parser.add_argument("--events", type=int, default=0)
+    parser.add_argument("--bookings", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for event popularity")
+    parser.add_argument("--past-fraction", type=float, default=0.3, help="Share of events already over")
+    parser.add_argument("--horizon-days", type=int, default=365, help="Events spread this far either side of today")
+    parser.add_argument("--random-seed", type=int, default=None)
+    args = parser.parse_args()
+    if (args.events or args.bookings) and not args.users:
+        parser.error("--events and --bookings need --users (events need organizers, bookings need users)")
+    if args.bookings and not args.events:
+        parser.error("--bookings needs --events")
+    return args
+
+# Everything runs under the main guard: the password hashing pool spawns
+# worker processes that re-import this module
 if __name__ == '__main__':
-    seed_events()
\ No newline at end of file
+    args = parse_args()
+    app = create_app()
+    app.app_context().push()
+    if args.users:
+        seed_synthetic(args.users, args.events, args.bookings, args.organizers, args.batch_size,
+                       args.random_seed, args.skew, args.past_fraction, args.horizon_days)
+    else:
+        seed_events()
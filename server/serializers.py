@@ -0,0 +1,116 @@
+# server/serializers.py
+import csv
+import io
+import json
+from sqlalchemy import type_coerce
+from extensions import db
+from models import ArchivedBooking, ArchivedEvent, Booking, Event
+
+try:
+    import orjson
+except ImportError:  # optional, roughly 3-5x faster encoding when installed
+    orjson = None
+
+# Listing reads select these columns as plain row tuples: no ORM identity
+# map, no per-row to_dict(). Price is read as a float straight from the
+# driver instead of going through Decimal. The archive tables have the same
+# columns, so ?include_past=true pages decode the same way.
+def event_columns(model):
+    return (
+        model.id, model.title, model.description, model.date, model.location,
+        model.max_seats, model.available_seats, model.organizer_id,
+        model.created_at, model.category, model.image,
+        type_coerce(model.price, db.Float).label("price"),
+    )
+
+def my_booking_columns(booking_model, event_model):
+    return (
+        booking_model.id, booking_model.seat_count, booking_model.booking_date,
+        event_model.title.label("event_title"), event_model.date.label("event_date"),
+        booking_model.event_id,
+    )
+
+EVENT_COLUMNS = event_columns(Event)
+ARCHIVED_EVENT_COLUMNS = event_columns(ArchivedEvent)
+MY_BOOKING_COLUMNS = my_booking_columns(Booking, Event)
+ARCHIVED_BOOKING_COLUMNS = my_booking_columns(ArchivedBooking, ArchivedEvent)
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), check_circular=False)
+
+if orjson is not None:
+    def _encode(value):
+        return orjson.dumps(value)
+
+    # orjson writes naive datetimes exactly like isoformat(), so pass them through
+    def _datetime(value):
+        return value
+else:
+    def _encode(value):
+        return _json_encoder.encode(value).encode("utf-8")
+
+    def _datetime(value):
+        return value.isoformat() if value is not None else None
+
+def _event_record(row):
+    (id, title, description, date, location, max_seats, available_seats,
+     organizer_id, created_at, category, image, price) = row
+    return {
+        "id": id, "title": title, "description": description, "date": _datetime(date),
+        "location": location, "max_seats": max_seats,
+        "available_seats": available_seats, "organizer_id": organizer_id,
+        "created_at": _datetime(created_at), "category": category, "image": image,
+        "price": float(price) if price else 0.0,
+    }
+
+def _booking_record(row):
+    id, seat_count, booking_date, event_title, event_date, event_id = row
+    return {
+        "id": id, "seat_count": seat_count, "booking_date": _datetime(booking_date),
+        "event_title": event_title, "event_date": _datetime(event_date), "event_id": event_id,
+    }
+
+def encode_events(rows):
+    return _encode([_event_record(row) for row in rows])
+
+def encode_event(row):
+    return _encode(_event_record(row))
+
+def encode_bookings(rows):
+    return _encode([_booking_record(row) for row in rows])
+
+# Export formats take the result's column names, so any select() can be streamed
+
+def _export_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+def encode_ndjson(keys, rows):
+    return b"".join(
+        _encode({key: _datetime(value) if hasattr(value, "isoformat") else value
+                 for key, value in zip(keys, row)}) + b"\n"
+        for row in rows
+    )
+
+def encode_csv(keys, rows, header=False):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(keys)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+def encode_search_hits(rows):
+    # Search rows are the event columns followed by a highlighted snippet
+    return _encode([dict(_event_record(row[:-1]), snippet=row[-1]) for row in rows])
+
+def encode_categories(rows):
+    return _encode([{"category": category, "count": count} for category, count in rows])
+
+def encode_home(events_body, next_cursor, categories_body, bookings_body=None):
+    # Splices already encoded parts (cached pages included) into one object
+    return b"".join((
+        b'{"events":', events_body,
+        b',"next_cursor":', _encode(next_cursor),
+        b',"categories":', categories_body,
+        b',"bookings":', bookings_body if bookings_body is not None else b"null",
+        b"}",
+    ))
@@ -0,0 +1,168 @@
+# server/stats.py
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, delete, func, insert
+from extensions import db
+from models import ArchivedBooking, ArchivedEvent, Booking, Event, EventStats, EventDailyStats, OrganizerStats
+from reservations import run_with_retry
+
+REBUILD_BATCH_SIZE = 1000
+
+def _dialect_insert(model):
+    if db.session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model)
+
+def _upsert_add(model, keys, rows):
+    # INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col, one
+    # executemany for every row of the model
+    if not rows:
+        return
+    deltas = [column for column in rows[0] if column not in keys]
+    stmt = _dialect_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={column: getattr(model, column) + stmt.excluded[column] for column in deltas}
+    )
+    db.session.execute(stmt, rows)
+
+def record_bookings(changes):
+    # changes: [(event_id, seat_count, day, sign)], sign +1 for a booking and
+    # -1 for a cancellation. Runs inside the caller's booking transaction so
+    # the rollups can never drift from the bookings table.
+    event_ids = {event_id for event_id, _, _, _ in changes}
+    events = {
+        row.id: row for row in db.session.execute(
+            select(Event.id, Event.price, Event.organizer_id).where(Event.id.in_(event_ids))
+        )
+    }
+
+    per_event = defaultdict(lambda: [0, 0, Decimal(0)])
+    per_day = defaultdict(lambda: [0, 0, Decimal(0)])
+    per_organizer = defaultdict(lambda: [0, 0, Decimal(0)])
+    for event_id, seat_count, day, sign in changes:
+        event = events.get(event_id)
+        if event is None:
+            continue
+        revenue = Decimal(str(event.price or 0)) * seat_count
+        for bucket in (per_event[event_id], per_day[(event_id, day)], per_organizer[event.organizer_id]):
+            bucket[0] += sign
+            bucket[1] += sign * seat_count
+            bucket[2] += sign * revenue
+
+    _upsert_add(EventStats, ["event_id"], [
+        {"event_id": event_id, "bookings_count": count, "seats_booked": seats, "revenue": revenue}
+        for event_id, (count, seats, revenue) in per_event.items()
+    ])
+    _upsert_add(EventDailyStats, ["event_id", "day"], [
+        {"event_id": event_id, "day": day, "bookings_count": count, "seats_booked": seats, "revenue": revenue}
+        for (event_id, day), (count, seats, revenue) in per_day.items()
+    ])
+    _upsert_add(OrganizerStats, ["organizer_id"], [
+        {"organizer_id": organizer_id, "bookings_count": count, "seats_booked": seats, "revenue": revenue}
+        for organizer_id, (count, seats, revenue) in per_organizer.items()
+    ])
+
+def clear_event_stats(event_id):
+    db.session.execute(delete(EventDailyStats).where(EventDailyStats.event_id == event_id))
+    db.session.execute(delete(EventStats).where(EventStats.event_id == event_id))
+
+def rebuild_stats(batch_size=REBUILD_BATCH_SIZE):
+    # Recomputes every rollup from the bookings table. Each batch of events is
+    # re-aggregated and replaced in one IMMEDIATE transaction, so live
+    # bookings wait on the write lock instead of landing between the DELETE
+    # and the INSERT; organizer totals are derived the same way at the end.
+    last_id = 0
+    processed = 0
+    while True:
+        event_ids = run_with_retry(lambda: _rebuild_event_batch(last_id, batch_size), immediate=True)
+        if not event_ids:
+            break
+        last_id = event_ids[-1]
+        processed += len(event_ids)
+
+    run_with_retry(_rebuild_organizer_stats, immediate=True)
+    return processed
+
+def _rebuild_event_batch(after_id, batch_size):
+    # Returns the ids of the events rebuilt, empty once past the last one
+    day = func.date(Booking.booking_date)
+    event_ids = db.session.scalars(
+        select(Event.id).where(Event.id > after_id).order_by(Event.id).limit(batch_size)
+    ).all()
+    if not event_ids:
+        return event_ids
+    db.session.execute(delete(EventDailyStats).where(EventDailyStats.event_id.in_(event_ids)))
+    db.session.execute(delete(EventStats).where(EventStats.event_id.in_(event_ids)))
+
+    totals = db.session.execute(
+        select(
+            Booking.event_id, func.count(Booking.id), func.sum(Booking.seat_count),
+            func.sum(Booking.seat_count * Event.price)
+        ).join(Event, Booking.event_id == Event.id)
+        .where(Booking.event_id.in_(event_ids)).group_by(Booking.event_id)
+    ).all()
+    if totals:
+        db.session.execute(insert(EventStats), [
+            {"event_id": event_id, "bookings_count": count, "seats_booked": seats, "revenue": revenue or 0}
+            for event_id, count, seats, revenue in totals
+        ])
+
+    daily = db.session.execute(
+        select(
+            Booking.event_id, day, func.count(Booking.id), func.sum(Booking.seat_count),
+            func.sum(Booking.seat_count * Event.price)
+        ).join(Event, Booking.event_id == Event.id)
+        .where(Booking.event_id.in_(event_ids)).group_by(Booking.event_id, day)
+    ).all()
+    if daily:
+        db.session.execute(insert(EventDailyStats), [
+            {"event_id": event_id, "day": _as_date(booking_day), "bookings_count": count,
+             "seats_booked": seats, "revenue": revenue or 0}
+            for event_id, booking_day, count, seats, revenue in daily
+        ])
+    return event_ids
+
+def _rebuild_organizer_stats():
+    # Organizer totals also count the bookings of archived events (archive.py)
+    db.session.execute(delete(OrganizerStats))
+    organizers = defaultdict(lambda: [0, 0, Decimal(0)])
+    hot = select(
+        Event.organizer_id, func.sum(EventStats.bookings_count),
+        func.sum(EventStats.seats_booked), func.sum(EventStats.revenue)
+    ).join(Event, EventStats.event_id == Event.id).group_by(Event.organizer_id)
+    archived = select(
+        ArchivedEvent.organizer_id, func.count(ArchivedBooking.id), func.sum(ArchivedBooking.seat_count),
+        func.sum(ArchivedBooking.seat_count * ArchivedEvent.price)
+    ).join(ArchivedEvent, ArchivedBooking.event_id == ArchivedEvent.id).group_by(ArchivedEvent.organizer_id)
+    for stmt in (hot, archived):
+        for organizer_id, count, seats, revenue in db.session.execute(stmt):
+            totals = organizers[organizer_id]
+            totals[0] += count or 0
+            totals[1] += seats or 0
+            totals[2] += Decimal(str(revenue or 0))
+    if organizers:
+        db.session.execute(insert(OrganizerStats), [
+            {"organizer_id": organizer_id, "bookings_count": count, "seats_booked": seats, "revenue": revenue}
+            for organizer_id, (count, seats, revenue) in organizers.items()
+        ])
+
+def _as_date(value):
+    # func.date() comes back as a string on SQLite and a date on Postgres
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
+stats_cli = AppGroup("stats", help="Booking statistics rollups.")
+
+@stats_cli.command("rebuild")
+@click.option("--batch-size", default=REBUILD_BATCH_SIZE, show_default=True, help="Events per transaction.")
+def rebuild_stats_command(batch_size):
+    """Recompute all booking rollups from the bookings table."""
+    processed = rebuild_stats(batch_size)
+    click.echo(f"Rebuilt stats for {processed} events")
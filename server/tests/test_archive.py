@@ -0,0 +1,42 @@
+# server/tests/test_archive.py
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from archive import archive_batch
+from extensions import db
+from models import ArchivedBooking, ArchivedEvent, Booking
+
+def book(app, user_id, event_id, seat_count=1):
+    with app.app_context():
+        booking = Booking(user_id=user_id, event_id=event_id, seat_count=seat_count)
+        db.session.add(booking)
+        db.session.commit()
+        return booking.id
+
+def test_ids_are_not_reused_after_archive_and_delete(app, client, make_user, make_event):
+    organizer_id, organizer = make_user(is_organizer=True)
+    user_id, _ = make_user()
+    past = datetime.utcnow() - timedelta(days=7)
+
+    old_event = make_event(organizer_id, date=past)
+    old_booking = book(app, user_id, old_event)
+    newest_event = make_event(organizer_id)
+    with app.app_context():
+        assert archive_batch(datetime.utcnow()) == ([old_event], 1)
+
+    # Empties the hot table: plain SQLite would hand out id 1 again
+    assert client.delete(f"/api/events/{newest_event}", headers=organizer).status_code == 200
+
+    event_id = make_event(organizer_id, date=past)
+    booking_id = book(app, user_id, event_id)
+    assert event_id > newest_event
+    assert booking_id > old_booking
+
+    listing = client.get("/api/events?include_past=true&date_from=2000-01-01").get_json()
+    ids = [event["id"] for event in listing]
+    assert len(ids) == len(set(ids)) == 2
+
+    # The next batch archives the new event next to the old one
+    with app.app_context():
+        assert archive_batch(datetime.utcnow()) == ([event_id], 1)
+        assert db.session.scalars(select(ArchivedEvent.id).order_by(ArchivedEvent.id)).all() == [old_event, event_id]
+        assert db.session.scalars(select(ArchivedBooking.id).order_by(ArchivedBooking.id)).all() == [old_booking, booking_id]
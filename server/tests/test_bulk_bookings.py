@@ -0,0 +1,33 @@
+# server/tests/test_bulk_bookings.py
+from extensions import db
+from models import Event
+
+def test_all_or_nothing_rejects_without_marking_valid_items_booked(app, client, make_user, make_event):
+    organizer_id, _ = make_user(is_organizer=True)
+    _, user = make_user()
+    event_id = make_event(organizer_id)
+
+    response = client.post("/api/bookings/bulk", headers=user, json={
+        "bookings": [{"event_id": event_id, "seat_count": 2}, {"event_id": "bad", "seat_count": 1}]
+    })
+    body = response.get_json()
+    assert response.status_code == 400
+    assert body["booked"] == 0
+    assert [result["status"] for result in body["results"]] == ["not_applied", "error"]
+    with app.app_context():
+        assert db.session.get(Event, event_id).available_seats == 10
+
+def test_partial_books_valid_items(app, client, make_user, make_event):
+    organizer_id, _ = make_user(is_organizer=True)
+    _, user = make_user()
+    event_id = make_event(organizer_id)
+
+    response = client.post("/api/bookings/bulk", headers=user, json={
+        "mode": "partial",
+        "bookings": [{"event_id": event_id, "seat_count": 2}, {"event_id": "bad", "seat_count": 1}]
+    })
+    body = response.get_json()
+    assert response.status_code == 207
+    assert body["booked"] == 1
+    assert [result["status"] for result in body["results"]] == ["booked", "error"]
+    assert body["results"][0]["available_seats"] == 8
@@ -0,0 +1,29 @@
+# server/tests/test_events.py
+from extensions import db
+from models import Event
+
+def test_update_refusing_the_resize_changes_nothing(app, client, make_user, make_event):
+    organizer_id, organizer = make_user(is_organizer=True)
+    _, user = make_user()
+    event_id = make_event(organizer_id, max_seats=5)
+    client.post("/api/bookings", headers=user, json={"event_id": event_id, "seat_count": 4})
+
+    response = client.put(f"/api/events/{event_id}", headers=organizer, json={"title": "Renamed", "max_seats": 3})
+    assert response.status_code == 400
+    with app.app_context():
+        event = db.session.get(Event, event_id)
+        assert (event.title, event.max_seats, event.available_seats) == ("Test event", 5, 1)
+
+def test_added_seats_go_to_the_waitlist(app, client, make_user, make_event):
+    organizer_id, organizer = make_user(is_organizer=True)
+    _, user = make_user()
+    _, waiting = make_user()
+    event_id = make_event(organizer_id, max_seats=2)
+    client.post("/api/bookings", headers=user, json={"event_id": event_id, "seat_count": 2})
+    assert client.post(f"/api/events/{event_id}/waitlist", headers=waiting,
+                       json={"seat_count": 2}).get_json()["status"] == "waiting"
+
+    response = client.put(f"/api/events/{event_id}", headers=organizer, json={"title": "Bigger", "max_seats": 5})
+    assert response.status_code == 200
+    assert (response.get_json()["title"], response.get_json()["available_seats"]) == ("Bigger", 1)
+    assert [booking["seat_count"] for booking in client.get("/api/bookings/my", headers=waiting).get_json()] == [2]
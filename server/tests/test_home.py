@@ -0,0 +1,35 @@
+# server/tests/test_home.py
+from datetime import timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+
+def test_signed_in_home_includes_bookings(app, client, make_user, make_event):
+    organizer_id, _ = make_user(is_organizer=True)
+    _, user = make_user()
+    event_id = make_event(organizer_id)
+    client.post("/api/bookings", headers=user, json={"event_id": event_id, "seat_count": 1})
+
+    body = client.get("/api/home", headers=user).get_json()
+    assert [event["id"] for event in body["events"]] == [event_id]
+    assert [booking["event_id"] for booking in body["bookings"]] == [event_id]
+
+@pytest.mark.parametrize("token", ["garbage", "expired", "revoked"])
+def test_unusable_token_gets_the_anonymous_home(app, client, make_user, make_event, token):
+    organizer_id, _ = make_user(is_organizer=True)
+    user_id, user = make_user()
+    event_id = make_event(organizer_id)
+    if token == "garbage":
+        headers = {"Authorization": "Bearer not-a-jwt"}
+    elif token == "expired":
+        with app.app_context():
+            expired = create_access_token(identity=str(user_id), expires_delta=timedelta(seconds=-1))
+        headers = {"Authorization": f"Bearer {expired}"}
+    else:
+        assert client.post("/api/auth/logout", headers=user).status_code == 200
+        headers = user
+
+    response = client.get("/api/home", headers=headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [event["id"] for event in body["events"]] == [event_id]
+    assert body["bookings"] is None
@@ -0,0 +1,67 @@
+# server/tests/test_live.py
+import json
+import threading
+import time
+import pytest
+from extensions import live_hub
+
+@pytest.fixture
+def hub(app, monkeypatch):
+    # Flushes are driven by the test, not by the hub's background thread
+    monkeypatch.setattr(live_hub, "_ensure_started", lambda: None)
+    yield live_hub
+    assert live_hub.subscribers == 0
+
+def _seats(message):
+    return json.loads(message.decode().split("data: ", 1)[1])["available_seats"]
+
+def test_flush_reaches_every_subscriber(app, client, hub, make_user, make_event):
+    organizer_id, _ = make_user(is_organizer=True)
+    _, user = make_user()
+    event_id = make_event(organizer_id)
+    subscriptions = [hub.subscribe(event_id, 0, lambda: None) for _ in range(5000)]
+
+    client.post("/api/bookings", headers=user, json={"event_id": event_id, "seat_count": 3})
+    with app.app_context():
+        hub.flush()
+
+    for subscription in subscriptions:
+        assert [_seats(message) for message in subscription.drain()] == [7]
+        hub.unsubscribe(subscription)
+
+def test_flush_and_eviction_while_subscribers_come_and_go(app, hub, make_user, make_event):
+    organizer_id, _ = make_user(is_organizer=True)
+    event_ids = [make_event(organizer_id) for _ in range(20)]
+    errors = []
+    done = threading.Event()
+
+    def churn(offset):
+        try:
+            for index in range(1000):
+                subscription = hub.subscribe(event_ids[(offset + index) % len(event_ids)], 0, lambda: None)
+                subscription.drain()
+                hub.unsubscribe(subscription)
+        except Exception as e:
+            errors.append(e)
+
+    def flush():
+        try:
+            with app.app_context():
+                while not done.is_set():
+                    hub.flush(poll=True)
+                    hub._evict_idle(time.monotonic())
+        except Exception as e:
+            errors.append(e)
+
+    flusher = threading.Thread(target=flush)
+    flusher.start()
+    workers = [threading.Thread(target=churn, args=(offset,)) for offset in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    done.set()
+    flusher.join()
+
+    assert errors == []
+    assert hub._topics == {}
@@ -0,0 +1,68 @@
+# server/tests/test_query_budget.py
+# conftest sets QUERY_BUDGET, so a request going over its view's budget
+# raises QueryBudgetExceeded out of the test client. These tests walk the
+# main endpoints so a new N+1 shows up here first.
+import pytest
+from extensions import metrics
+from metrics import QueryBudgetExceeded
+
+def test_browse_endpoints_stay_within_budget(app, client, make_user, make_event):
+    organizer_id, organizer = make_user(is_organizer=True)
+    _, user = make_user()
+    event_id = make_event(organizer_id)
+    client.post("/api/bookings", headers=user, json={"event_id": event_id, "seat_count": 1})
+
+    for path, headers in [
+        ("/api/events", None), (f"/api/events/{event_id}", None), ("/api/events/search?q=test", None),
+        ("/api/home", None), ("/api/home", user), ("/api/bookings/my", user), ("/api/auth/me", user),
+        ("/api/organizers/me/stats", organizer),
+    ]:
+        assert client.get(path, headers=headers).status_code == 200, path
+
+def test_booking_flow_stays_within_budget(app, client, make_user, make_event):
+    organizer_id, organizer = make_user(is_organizer=True)
+    _, user = make_user()
+    _, other = make_user()
+    _, third = make_user()
+    event_id = make_event(organizer_id, max_seats=2)
+
+    booking = client.post("/api/bookings", headers=user, json={"event_id": event_id, "seat_count": 1})
+    assert booking.status_code == 201
+    hold = client.post(f"/api/events/{event_id}/holds", headers=other, json={"seat_count": 1})
+    assert hold.status_code == 201
+    assert client.post(f"/api/holds/{hold.get_json()['hold']['id']}/confirm", headers=other).status_code == 201
+    assert client.post(f"/api/events/{event_id}/waitlist", headers=other, json={"seat_count": 1}).status_code == 201
+    # Cancelling promotes the waitlist in the same request
+    booking_id = booking.get_json()["booking"]["id"]
+    assert client.delete(f"/api/bookings/{booking_id}", headers=user).status_code == 200
+    # So does adding seats
+    assert client.post(f"/api/events/{event_id}/waitlist", headers=third, json={"seat_count": 1}).status_code == 201
+    assert client.put(f"/api/events/{event_id}", headers=organizer, json={"max_seats": 5}).status_code == 200
+    assert client.get("/api/bookings/my", headers=third).get_json()
+    assert client.post("/api/auth/logout", headers=user).status_code == 200
+
+def test_bulk_booking_queries_do_not_grow_with_items(app, client, make_user, make_event, monkeypatch):
+    organizer_id, _ = make_user(is_organizer=True)
+    _, user = make_user()
+    event_ids = [make_event(organizer_id) for _ in range(3)]
+    # Statements scale with distinct events (one seat UPDATE each), never
+    # with the number of items
+    view = app.view_functions["bookings.create_bookings_bulk"]
+    monkeypatch.setattr(view, "_query_budget", 9 + len(event_ids))
+
+    response = client.post("/api/bookings/bulk", headers=user, json={
+        "bookings": [{"event_id": event_id, "seat_count": 1} for event_id in event_ids] * 3
+    })
+    body = response.get_json()
+    assert response.status_code == 201
+    booking_ids = [result["booking_id"] for result in body["results"]]
+    assert len(set(booking_ids)) == 9
+
+    bookings = {booking["id"]: booking for booking in client.get("/api/bookings/my", headers=user).get_json()}
+    for result in body["results"]:
+        assert bookings[result["booking_id"]]["event_id"] == result["event_id"]
+
+def test_request_over_budget_fails(app, client, monkeypatch):
+    monkeypatch.setattr(metrics, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/api/events")
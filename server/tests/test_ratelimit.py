@@ -0,0 +1,45 @@
+# server/tests/test_ratelimit.py
+import threading
+import time
+from ratelimit import MemoryBackend, RateLimiter
+
+class YieldingRate(float):
+    # Hands the GIL to another thread in the middle of a bucket update
+    def __rmul__(self, other):
+        time.sleep(0.0001)
+        return float(self) * other
+
+def test_memory_backend_never_spends_a_token_twice():
+    backend = MemoryBackend()
+    # A frozen clock: nothing refills, so exactly `burst` checks may pass
+    clock = lambda: 0.0
+    rate = YieldingRate(1.0)
+    backend.acquire(("scope", "client"), rate, 50, clock)
+    barrier = threading.Barrier(16)
+    allowed = []
+
+    def hammer():
+        barrier.wait()
+        for _ in range(100):
+            if backend.acquire(("scope", "client"), rate, 50, clock) == 0.0:
+                allowed.append(1)
+
+    threads = [threading.Thread(target=hammer) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(allowed) == 49
+
+def test_anonymous_clients_are_keyed_by_remote_address(app):
+    limiter = RateLimiter()
+    limiter._resolved = {"bookings.create_booking": ("bookings.create_booking", 1e-6, 1)}
+
+    def check(remote_addr):
+        with app.test_request_context("/api/bookings", method="POST", environ_base={"REMOTE_ADDR": remote_addr}):
+            response = limiter._before_request()
+            return 200 if response is None else response[1]
+
+    assert check("203.0.113.1") == 200
+    assert check("203.0.113.1") == 429
+    assert check("203.0.113.2") == 200
@@ -0,0 +1,37 @@
+# server/tests/test_reservations.py
+import threading
+from sqlalchemy import func, select
+from extensions import db
+from models import Booking, Event
+
+THREADS = 16
+
+def test_concurrent_bookings_never_oversell(app, make_user, make_event):
+    organizer_id, _ = make_user(is_organizer=True)
+    users = [make_user()[1] for _ in range(THREADS)]
+    event_id = make_event(organizer_id, max_seats=5)
+
+    barrier = threading.Barrier(THREADS)
+    statuses = []
+
+    def book(headers):
+        client = app.test_client()
+        barrier.wait()
+        for _ in range(3):
+            response = client.post("/api/bookings", headers=headers, json={"event_id": event_id, "seat_count": 1})
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=book, args=(headers,)) for headers in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(statuses) == THREADS * 3
+    assert set(statuses) <= {201, 400}
+    assert statuses.count(201) == 5
+    with app.app_context():
+        event = db.session.get(Event, event_id)
+        booked = db.session.scalar(select(func.sum(Booking.seat_count)).where(Booking.event_id == event_id))
+        assert event.available_seats == 0
+        assert booked + event.available_seats == event.max_seats
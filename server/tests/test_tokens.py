@@ -0,0 +1,22 @@
+# server/tests/test_tokens.py
+from flask_jwt_extended import decode_token
+from tokens import TokenBlocklist
+
+def test_logout_revokes_token_for_every_worker(app, client):
+    response = client.post("/api/auth/register", json={"email": "ada@test", "password": "secret", "name": "Ada"})
+    token = response.get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    # Another worker starts with an empty process; the revocation is in the database
+    with app.app_context():
+        assert TokenBlocklist().is_revoked(decode_token(token)["jti"])
+
+def test_other_tokens_stay_valid(app, client, make_user):
+    _, first = make_user()
+    _, second = make_user()
+    assert client.post("/api/auth/logout", headers=first).status_code == 200
+    assert client.get("/api/auth/me", headers=second).status_code == 200
@@ -0,0 +1,81 @@
+# server/tokens.py
+from datetime import datetime
+from flask import g
+from flask_jwt_extended import JWTManager, get_jwt, get_jwt_identity
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+# Claims signed into every access token; Identity answers these without a query
+IDENTITY_CLAIMS = ("email", "name", "is_organizer")
+
+class TokenBlocklist:
+    # Revoked token ids until their expiry, in the revoked_tokens table so a
+    # logout handled by one worker holds on every worker. Checked on the
+    # primary on every authenticated request, one primary key lookup, on a
+    # connection of its own so read-only views keep reading from replicas.
+    def revoke(self, jti, expires_at):
+        from extensions import db
+        from models import RevokedToken
+        try:
+            with db.engine.begin() as connection:
+                # Expired tokens are rejected by the signature check anyway
+                connection.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+                connection.execute(insert(RevokedToken).values(
+                    jti=jti, expires_at=datetime.utcfromtimestamp(expires_at)
+                ))
+        except IntegrityError:
+            pass  # revoked concurrently by another request
+
+    def is_revoked(self, jti):
+        from extensions import db
+        from models import RevokedToken
+        with db.engine.connect() as connection:
+            return connection.scalar(select(RevokedToken.jti).where(RevokedToken.jti == jti)) is not None
+
+class RevokingJWTManager(JWTManager):
+    # flask_jwt_extended's manager with POST /api/auth/logout support,
+    # wired through its public token_in_blocklist_loader hook
+    def __init__(self, *args, **kwargs):
+        self.blocklist = TokenBlocklist()
+        super().__init__(*args, **kwargs)
+        self.token_in_blocklist_loader(self._is_revoked)
+
+    def _is_revoked(self, jwt_header, jwt_payload):
+        return "jti" in jwt_payload and self.blocklist.is_revoked(jwt_payload["jti"])
+
+    def revoke(self, jwt_payload):
+        self.blocklist.revoke(jwt_payload["jti"], jwt_payload["exp"])
+
+class Identity:
+    # The caller as described by their token. Fields signed into the claims
+    # are answered directly; anything else loads the User row once.
+    def __init__(self, user_id, claims):
+        self.id = user_id
+        self._claims = claims
+        self._user = None
+
+    @property
+    def user(self):
+        if self._user is None:
+            from extensions import db
+            from models import User
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set in __init__
+        claims = self.__dict__.get("_claims", {})
+        if name in IDENTITY_CLAIMS and name in claims:
+            return claims[name]
+        if name.startswith("_"):
+            raise AttributeError(name)
+        user = self.user
+        if user is None:
+            raise AttributeError(name)
+        return getattr(user, name)
+
+def current_identity():
+    # Per-request Identity for the verified token; call after jwt_required
+    if "_identity" not in g:
+        g._identity = Identity(int(get_jwt_identity()), get_jwt())
+    return g._identity
@@ -0,0 +1,132 @@
+# server/waitlist.py
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import delete, insert, select, func
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import Booking, Event, WaitlistEntry
+from outbox import enqueue_outbox
+from reservations import (
+    EventNotFound, SeatsUnavailable, current_available_seats, reserve_seats, release_seats, run_with_retry
+)
+from stats import record_bookings
+
+PROMOTED_TOPIC = "waitlist.promoted"
+
+class AlreadyWaiting(Exception):
+    pass
+
+def promote_waitlist(event_id):
+    # Books the head of the event's queue into the seats currently free and
+    # queues a notification per promoted user. Call it inside the transaction
+    # that gave the seats back, so a cancellation and the promotions it
+    # allows commit together. The queue is strict FIFO: promotion stops at
+    # the first entry that does not fit, so a large party is never starved
+    # by smaller ones behind it.
+    # Returns ([{user_id, event_id, booking_id, seat_count}], available_seats).
+    available = current_available_seats(event_id)
+    if not available:
+        return [], available
+
+    # Every entry needs at least one seat, so at most `available` can fit
+    candidates = db.session.execute(
+        select(WaitlistEntry.id, WaitlistEntry.seat_count)
+        .where(WaitlistEntry.event_id == event_id)
+        .order_by(WaitlistEntry.id)
+        .limit(available)
+    ).all()
+    chosen, wanted = [], 0
+    for entry_id, seat_count in candidates:
+        if wanted + seat_count > available:
+            break
+        chosen.append(entry_id)
+        wanted += seat_count
+    if not chosen:
+        return [], available
+
+    try:
+        available = reserve_seats(event_id, wanted)
+    except SeatsUnavailable:
+        # A concurrent booking got there first; the next release retries
+        return [], current_available_seats(event_id)
+
+    # Deleting with RETURNING books only entries nobody withdrew meanwhile
+    entries = sorted(db.session.execute(
+        delete(WaitlistEntry)
+        .where(WaitlistEntry.id.in_(chosen))
+        .returning(WaitlistEntry.id, WaitlistEntry.user_id, WaitlistEntry.seat_count)
+        .execution_options(synchronize_session=False)
+    ).all())
+    taken = sum(entry.seat_count for entry in entries)
+    if taken < wanted:
+        available = release_seats(event_id, wanted - taken)
+    if not entries:
+        return [], available
+
+    booked_at = datetime.utcnow()
+    # One multi-row INSERT; ids are matched back by (user, seats) rather than
+    # asking RETURNING for parameter order, which SQLite does row by row
+    inserted = db.session.execute(
+        insert(Booking).returning(Booking.id, Booking.user_id, Booking.seat_count),
+        [{"user_id": entry.user_id, "event_id": event_id, "seat_count": entry.seat_count,
+          "booking_date": booked_at} for entry in entries]
+    ).all()
+    ids_by_entry = defaultdict(list)
+    for booking_id, user_id, seat_count in sorted(inserted, reverse=True):
+        ids_by_entry[(user_id, seat_count)].append(booking_id)
+    booking_ids = [ids_by_entry[(entry.user_id, entry.seat_count)].pop() for entry in entries]
+    record_bookings([(event_id, entry.seat_count, booked_at.date(), 1) for entry in entries])
+
+    promoted = [
+        {"user_id": entry.user_id, "event_id": event_id, "booking_id": booking_id, "seat_count": entry.seat_count}
+        for entry, booking_id in zip(entries, booking_ids)
+    ]
+    enqueue_outbox(PROMOTED_TOPIC, promoted)
+    return promoted, available
+
+def waitlist_position(entry):
+    return db.session.scalar(
+        select(func.count())
+        .select_from(WaitlistEntry)
+        .where(WaitlistEntry.event_id == entry.event_id, WaitlistEntry.id <= entry.id)
+    )
+
+def join_waitlist(user_id, event_id, seat_count):
+    # Queues the user, then runs a promotion pass in the same transaction:
+    # when seats are already free and nobody is ahead, the user is booked
+    # straight away. Returns (entry dict, booking_id or None, position or None).
+    def join():
+        if db.session.scalar(select(Event.id).where(Event.id == event_id)) is None:
+            raise EventNotFound()
+        entry = WaitlistEntry(user_id=user_id, event_id=event_id, seat_count=seat_count)
+        db.session.add(entry)
+        db.session.flush()
+        promoted, _ = promote_waitlist(event_id)
+        booking_id = next((p["booking_id"] for p in promoted if p["user_id"] == user_id), None)
+        position = None if booking_id else waitlist_position(entry)
+        return entry.to_dict(), booking_id, position
+
+    try:
+        return run_with_retry(join, immediate=True)
+    except IntegrityError:
+        raise AlreadyWaiting()
+
+def leave_waitlist(user_id, event_id):
+    # Returns False when the user was not waiting. Leaving may unblock the
+    # entries behind, so it runs a promotion pass too.
+    def leave():
+        removed = db.session.execute(
+            delete(WaitlistEntry)
+            .where(WaitlistEntry.event_id == event_id, WaitlistEntry.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if removed:
+            promote_waitlist(event_id)
+        return bool(removed)
+
+    return run_with_retry(leave, immediate=True)
+
+def clear_event_waitlist(event_id):
+    db.session.execute(
+        delete(WaitlistEntry).where(WaitlistEntry.event_id == event_id).execution_options(synchronize_session=False)
+    )